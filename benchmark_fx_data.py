@@ -0,0 +1,81 @@
+'''
+Benchmarking script for the throughput of each pipeline stage on synthetic
+data, and of full loads against a local mock of the data feed. Runs offline.
+'''
+
+import argparse
+import sys
+
+from benchmarks.end_to_end import run_end_to_end
+from benchmarks.suite import (BASELINES_PATH, DEFAULT_DENSITIES, DEFAULT_REPEAT, DEFAULT_THRESHOLD,
+                              compare_baselines, format_results, load_baselines, peak_rss_mb, run_benchmarks, save_baselines)
+from utils.logger import logger
+from utils.stats import format_summary
+
+LOG = logger()
+
+def main():
+    '''
+    Benchmark the pipeline stages against the baselines, or a full load
+    against a local mock server.
+    '''
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--ticks', help='Comma separated tick counts per synthetic hour.', type=str, default=','.join(map(str, DEFAULT_DENSITIES)))
+    arg_parser.add_argument('--repeat', help='Number of timed runs per stage, the fastest is kept.', type=int, default=DEFAULT_REPEAT)
+    arg_parser.add_argument('--baselines', help='Path to the baselines JSON file.', type=str, default=BASELINES_PATH)
+    arg_parser.add_argument('--threshold', help='Allowed relative drop in ticks per second before failing.', type=float, default=DEFAULT_THRESHOLD)
+    arg_parser.add_argument('--save', help='Store the results as the new baselines.', action='store_true')
+    arg_parser.add_argument('--end_to_end', help='Run the loading script against a local mock server instead.', action='store_true')
+    arg_parser.add_argument('--pair', help='Comma separated currency pairs for the end-to-end run.', type=str, default='EURUSD,GBPUSD')
+    arg_parser.add_argument('--start_date', help='Starting time for the end-to-end run.', type=str, default='2018-10-01')
+    arg_parser.add_argument('--end_date', help='Ending time for the end-to-end run.', type=str, default='2018-10-02')
+    arg_parser.add_argument('--processes', help='Number of loading processes for the end-to-end run.', type=int, default=4)
+    arg_parser.add_argument('--retries', help='Number of retries for throttled requests in the end-to-end run.', type=int, default=3)
+    arg_parser.add_argument('--backoff', help='Initial delay in seconds between retries in the end-to-end run.', type=float, default=0.1)
+    arg_parser.add_argument('--latency', help='Median mock server latency in seconds.', type=float, default=0.05)
+    arg_parser.add_argument('--latency_sigma', help='Spread of the log-normal mock server latency.', type=float, default=0.5)
+    arg_parser.add_argument('--bandwidth', help='Mock server bandwidth cap in bytes per second per response.', type=float)
+    arg_parser.add_argument('--max_concurrent', help='Requests served at once by the mock server before throttling.', type=int)
+    arg_parser.add_argument('--error_rate', help='Fraction of mock server requests failed with a 503.', type=float, default=0.0)
+    arg_parser.add_argument('--empty_rate', help='Fraction of hours served empty by the mock server.', type=float, default=0.0)
+    args = arg_parser.parse_args()
+
+    densities: tuple = tuple(int(ticks) for ticks in args.ticks.split(','))
+    if args.end_to_end:
+        results: dict = run_end_to_end(
+            args.pair, args.start_date, args.end_date, args.processes,
+            load_args=('--retries', str(args.retries), '--backoff', str(args.backoff)),
+            ticks=densities[0], latency=args.latency, latency_sigma=args.latency_sigma, bandwidth=args.bandwidth,
+            max_concurrent=args.max_concurrent, error_rate=args.error_rate, empty_rate=args.empty_rate
+        )
+
+        LOG.info(f'End-to-end run finished in {results["wall_seconds"]:.2f}s')
+        for line in format_summary(results['summary']):
+            LOG.info(line)
+
+        LOG.info('Mock server: ' + ', '.join(f'{key}={value}' for key, value in results['server'].items()))
+        return
+
+    results = run_benchmarks(densities, args.repeat)
+    baselines: dict = load_baselines(args.baselines)
+
+    for line in format_results(results, baselines):
+        LOG.info(line)
+
+    LOG.info(f'Peak RSS of the benchmark process: {peak_rss_mb():.1f} MB')
+
+    if args.save:
+        save_baselines(results, args.baselines)
+        LOG.info(f'Saved baselines to {args.baselines}')
+        return
+
+    regressions: list = compare_baselines(results, baselines, args.threshold)
+    for key, baseline, current in regressions:
+        LOG.error(f'Regression in {key}: {current:,.0f} ticks/s against a baseline of {baseline:,.0f} ticks/s')
+
+    if regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
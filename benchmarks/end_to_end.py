@@ -0,0 +1,64 @@
+'''
+End-to-end benchmark driving the loading script against a local mock of the
+data feed, so scheduling, retry and concurrency changes can be measured
+reproducibly without being throttled by the real feed.
+'''
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.mock_server import FXTickDataMockServer
+
+LOAD_SCRIPT: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'load_fx_data.py')
+
+def run_end_to_end(pairs: str, start_date: str, end_date: str, processes: int,
+                   load_args: tuple = (), **server_options) -> dict:
+    '''
+    Run the loading script end to end against a mock server.
+
+    :params pairs: Comma separated currency pairs.
+    :params start_date: Starting time for data pull.
+    :params end_date: Ending time for data pull.
+    :params processes: Number of loading processes.
+    :params load_args: Additional command line arguments for the loading script.
+    :params server_options: Keyword arguments configuring the mock server.
+    :returns results: Dictionary of wall time, run summary and server counters.
+    '''
+
+    with tempfile.TemporaryDirectory() as tmp, FXTickDataMockServer(**server_options) as server:
+        stats: str = os.path.join(tmp, 'stats.json')
+        command: list = [
+            sys.executable, LOAD_SCRIPT,
+            '--pair', pairs,
+            '--start_date', start_date,
+            '--end_date', end_date,
+            '--opath', tmp,
+            '--processes', str(processes),
+            '--base_url', server.base_url,
+            '--stats', stats,
+            '--log_level', 'WARNING',
+            *load_args
+        ]
+
+        start: float = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True, cwd=os.path.dirname(LOAD_SCRIPT))
+        wall_seconds: float = time.perf_counter() - start
+
+        with open(stats) as ins:
+            summary: dict = json.load(ins)['summary']
+
+        return {
+            'wall_seconds'  : wall_seconds,
+            'summary'       : summary,
+            'server'        : {
+                'requests'          : server.requests,
+                'throttled'         : server.throttled,
+                'errors'            : server.errors,
+                'bytes_served'      : server.bytes_served,
+                'peak_concurrent'   : server.peak_concurrent
+            }
+        }
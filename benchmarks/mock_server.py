@@ -0,0 +1,214 @@
+'''
+Local stand-in for the Dukascopy data feed, serving synthetic hours for
+end-to-end benchmarks and load tests.
+
+Hours are served at the same '/datafeed/{PAIR}/{YYYY}/{MM}/{DD}/{HH}h_ticks.bi5'
+paths the requester builds, where the month is zero based. Latency, bandwidth,
+concurrency and failures can be configured to reproduce the behaviour of the
+real feed under load.
+'''
+
+import random
+import re
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from datetime import datetime
+
+from benchmarks.synthetic import synthetic_bi5
+from utils.instruments import CURRENCY_FACTOR_MAP
+
+DATAFEED_PATH = re.compile(r'^/datafeed/([A-Z]{6})/(\d{4})/(\d{2})/(\d{2})/(\d{2})h_ticks\.bi5$')
+
+# Size of the chunks written when the bandwidth is capped.
+CHUNK_SIZE: int = 16384
+
+class _DatafeedServer(ThreadingHTTPServer):
+    '''
+    Threading server accepting a deep backlog of connections, so bursts of
+    requests are throttled by the mock rather than refused by the socket.
+    '''
+
+    request_queue_size: int = 128
+
+class FXTickDataMockServer():
+    '''
+    Serve synthetic hourly tick data over HTTP from a background thread.
+    '''
+
+    def __init__(self, ticks: int = 5000, latency: float = 0.0, latency_sigma: float = 0.0,
+                 bandwidth: Optional[float] = None, max_concurrent: Optional[int] = None,
+                 error_rate: float = 0.0, empty_rate: float = 0.0, seed: int = 0,
+                 port: int = 0, host: str = '127.0.0.1'):
+        '''
+        :params ticks: Number of ticks in each served hour.
+        :params latency: Median delay in seconds before each response.
+        :params latency_sigma: Spread of the log-normal latency distribution.
+                               Zero gives a constant latency.
+        :params bandwidth: Optional cap in bytes per second for each response.
+        :params max_concurrent: Optional number of requests served at once.
+                                Requests beyond it are throttled with a 503.
+        :params error_rate: Fraction of requests failed at random with a 503.
+        :params empty_rate: Fraction of hours served as empty payloads. The
+                            same hours are always empty.
+        :params seed: Seed of the latency and error draws.
+        :params port: Local port to listen on. Zero picks a free port.
+        :params host: Interface to bind to.
+        '''
+
+        self.ticks: int = ticks
+        self.latency: float = latency
+        self.latency_sigma: float = latency_sigma
+        self.bandwidth: Optional[float] = bandwidth
+        self.max_concurrent: Optional[int] = max_concurrent
+        self.error_rate: float = error_rate
+        self.empty_rate: float = empty_rate
+
+        # Counters describing the traffic served so far.
+        self.requests: int = 0
+        self.throttled: int = 0
+        self.errors: int = 0
+        self.not_found: int = 0
+        self.bytes_served: int = 0
+        self.active: int = 0
+        self.peak_concurrent: int = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        mock = self
+
+        class DatafeedHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                mock._handle(self)
+
+            def log_message(self, *args):
+                # Requests are counted rather than logged.
+                pass
+
+        self.server = _DatafeedServer((host, port), DatafeedHandler)
+        self.port: int = self.server.server_address[1]
+        self.base_url: str = f'http://{host}:{self.port}/datafeed'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _hour(self, path: str) -> Optional[tuple]:
+        '''
+        Parse the pair and hour from a request path.
+
+        :params path: Request path.
+        :returns hour: Tuple of pair and datetime, or None for unknown paths.
+        '''
+
+        match = DATAFEED_PATH.match(path)
+        if match is None or match.group(1) not in CURRENCY_FACTOR_MAP:
+            return None
+
+        pair, year, month, day, hour = match.groups()
+        try:
+            return pair, datetime(int(year), int(month) + 1, int(day), int(hour))
+
+        except ValueError:
+            return None
+
+    def _is_empty(self, pair: str, request_date: datetime) -> bool:
+        '''
+        Decide whether an hour is served empty, consistently across requests.
+
+        :params pair: Currency pair of the hour.
+        :params request_date: Datetime of the hour.
+        :returns empty: Boolean flag indicating an empty hour.
+        '''
+
+        return random.Random(f'{pair}{request_date:%Y%m%dT%H}').random() < self.empty_rate
+
+    def _respond(self, handler: BaseHTTPRequestHandler, status: int, body: bytes = b'') -> None:
+        '''
+        Send a response, throttled to the bandwidth cap.
+
+        :params handler: Request handler of the connection.
+        :params status: HTTP status code.
+        :params body: Response body.
+        '''
+
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/octet-stream')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+
+        chunk_size: int = CHUNK_SIZE if self.bandwidth else max(len(body), 1)
+        for start in range(0, len(body), chunk_size):
+            chunk: bytes = body[start:(start + chunk_size)]
+            handler.wfile.write(chunk)
+            if self.bandwidth:
+                time.sleep(len(chunk) / self.bandwidth)
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        '''
+        Serve a single request.
+
+        :params handler: Request handler of the connection.
+        '''
+
+        with self._lock:
+            self.requests += 1
+            throttled: bool = self.max_concurrent is not None and self.active >= self.max_concurrent
+            failed: bool = not throttled and self._random.random() < self.error_rate
+            delay: float = self.latency * self._random.lognormvariate(0.0, self.latency_sigma) if self.latency else 0.0
+            if throttled:
+                self.throttled += 1
+
+            elif failed:
+                self.errors += 1
+
+            else:
+                self.active += 1
+                self.peak_concurrent = max(self.peak_concurrent, self.active)
+
+        if throttled or failed:
+            self._respond(handler, 503)
+            return
+
+        try:
+            time.sleep(delay)
+            hour: Optional[tuple] = self._hour(handler.path)
+            if hour is None:
+                with self._lock:
+                    self.not_found += 1
+
+                self._respond(handler, 404)
+                return
+
+            body: bytes = b'' if self._is_empty(*hour) else synthetic_bi5(*hour, self.ticks)
+            with self._lock:
+                self.bytes_served += len(body)
+
+            self._respond(handler, 200, body)
+
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def start(self) -> None:
+        '''
+        Start serving in the background.
+        '''
+
+        self.thread.start()
+
+    def stop(self) -> None:
+        '''
+        Stop serving and release the port.
+        '''
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
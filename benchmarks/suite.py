@@ -0,0 +1,256 @@
+'''
+Throughput benchmarks of the individual pipeline stages on synthetic hours.
+
+Each stage is timed on its own, on the output of the previous stage, and the
+best of several repeats is kept. Results are keyed by stage and tick density
+and compared against stored baselines with a relative regression threshold.
+
+Memory is reported per stage as the peak traced allocation of a separate,
+untimed call. The peak RSS only covers the whole process, since it never
+drops between stages.
+'''
+
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from typing import Callable
+
+from datetime import datetime
+
+from benchmarks.synthetic import synthetic_bi5
+from network.parser import FXTickDataParser
+from processors.compact import FXTickDataProcessorCompact
+from processors.ticks import FXTickDataBatchProcessor, FXTickDataProcessor, FXTickDataProcessorSQLite, FXTickDataProcessorTabular
+
+BENCHMARK_STAGES: tuple = ('decompress', 'decode', 'process', 'process_batch', 'write_tsv', 'write_sqlite', 'write_compact', 'read_tsv', 'read_compact')
+
+# Tick densities of a quiet, a typical and a busy hour.
+DEFAULT_DENSITIES: tuple = (1000, 10000, 50000)
+
+DEFAULT_REPEAT: int = 5
+
+# Minimum duration of a timed run, fast stages are looped to reach it.
+MIN_RUN_SECONDS: float = 0.05
+
+# Relative drop in ticks per second reported as a regression.
+DEFAULT_THRESHOLD: float = 0.25
+
+BASELINES_PATH: str = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+def peak_rss_mb() -> float:
+    '''
+    Get the peak resident set size of this process.
+
+    :returns peak: Peak RSS in MB.
+    '''
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _peak_allocation_mb(func: Callable, setup: Callable = None) -> float:
+    '''
+    Trace the allocations of a single call and get their peak. Allocations
+    outside Python and numpy, e.g. by SQLite, are not traced.
+
+    :params func: Function to trace.
+    :params setup: Optional untraced function run before the call.
+    :returns peak: Peak traced allocation of the call in MB.
+    '''
+
+    if setup is not None:
+        setup()
+
+    tracemalloc.start()
+    try:
+        func()
+        peak: int = tracemalloc.get_traced_memory()[1]
+
+    finally:
+        tracemalloc.stop()
+
+    return peak / (1024 * 1024)
+
+def _best_time(func: Callable, repeat: int, setup: Callable = None) -> float:
+    '''
+    Time a function several times and keep the fastest run. Fast functions
+    are looped so each timed run lasts long enough to measure reliably.
+
+    :params func: Function to time.
+    :params repeat: Number of timed runs.
+    :params setup: Optional untimed function run before each timed run.
+    :returns seconds: Fastest time of a single call in seconds.
+    '''
+
+    # Warm up caches and lazy imports, and calibrate the loop count.
+    if setup is not None:
+        setup()
+
+    start: float = time.perf_counter()
+    func()
+    loops: int = max(1, int(MIN_RUN_SECONDS / max(time.perf_counter() - start, 1e-9)))
+
+    best: float = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    return best
+
+def _result(seconds: float, ticks: int, nbytes: int, peak_alloc_mb: float) -> dict:
+    '''
+    Build the result of one stage.
+
+    :params seconds: Fastest run in seconds.
+    :params ticks: Number of ticks handled by the stage.
+    :params nbytes: Number of input bytes handled by the stage.
+    :params peak_alloc_mb: Peak traced allocation of the stage in MB.
+    :returns result: Dictionary of seconds, throughput and peak allocation.
+    '''
+
+    return {
+        'seconds'           : seconds,
+        'ticks_per_second'  : ticks / seconds if seconds else 0.0,
+        'mb_per_second'     : nbytes / 1e6 / seconds if seconds else 0.0,
+        'peak_alloc_mb'     : peak_alloc_mb
+    }
+
+def run_benchmarks(densities: tuple = DEFAULT_DENSITIES, repeat: int = DEFAULT_REPEAT,
+                   currency: str = 'EURUSD') -> dict:
+    '''
+    Benchmark every stage at every tick density.
+
+    :params densities: Tick counts per synthetic hour.
+    :params repeat: Number of timed runs per stage, the fastest is kept.
+    :params currency: String identifying currency pair.
+    :returns results: Map of 'stage@ticks' to stage results.
+    '''
+
+    request_date: datetime = datetime(2018, 10, 1, 12)
+    tick_data_parser = FXTickDataParser()
+
+    results: dict = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db: str = os.path.join(tmp, 'ticks.db')
+
+        def reset_db():
+            if os.path.exists(db):
+                os.remove(db)
+
+        for ticks in densities:
+            payload: bytes = synthetic_bi5(currency, request_date, ticks)
+            data: bytes = tick_data_parser.decompress(payload)
+            parsed_ticks: list = tick_data_parser.decode(data)
+            processed = FXTickDataProcessor(currency, request_date).process(parsed_ticks)
+
+            # The batch stage processes the same ticks spread over a day of
+            # quieter hours, so it compares directly with one large hour.
+            records: np.ndarray = tick_data_parser.decode_array(data)
+            day: list = [(currency, request_date.replace(hour=hour), chunk) for hour, chunk in enumerate(np.array_split(records, 24))]
+
+            # Reads are timed on the files written by the write stages.
+            FXTickDataProcessorTabular(currency, request_date).write(processed, tmp)
+            FXTickDataProcessorCompact(currency, request_date).write(processed, tmp)
+            tsv_path: str = os.path.join(tmp, currency + request_date.strftime('%Y%m%dT%H%M%S') + '.tsv')
+
+            # Writes are measured against the size of the decoded records.
+            stages: dict = {
+                'decompress'    : (lambda: tick_data_parser.decompress(payload), len(payload), None),
+                'decode'        : (lambda: tick_data_parser.decode(data), len(data), None),
+                'process'       : (lambda: FXTickDataProcessor(currency, request_date).process(parsed_ticks), len(data), None),
+                'process_batch' : (lambda: FXTickDataBatchProcessor().process(day), len(data), None),
+                'write_tsv'     : (lambda: FXTickDataProcessorTabular(currency, request_date).write(processed, tmp), len(data), None),
+                'write_sqlite'  : (lambda: FXTickDataProcessorSQLite(currency, request_date).write(processed, db, 'raw_ticks'), len(data), reset_db),
+                'write_compact' : (lambda: FXTickDataProcessorCompact(currency, request_date).write(processed, tmp), len(data), None),
+                'read_tsv'      : (lambda: pd.read_csv(tsv_path, sep='\t', parse_dates=['ts']), len(data), None),
+                'read_compact'  : (lambda: FXTickDataProcessorCompact.read(currency, request_date, tmp), len(data), None)
+            }
+
+            for stage in BENCHMARK_STAGES:
+                func, nbytes, setup = stages[stage]
+                results[f'{stage}@{ticks}'] = _result(_best_time(func, repeat, setup), ticks, nbytes, _peak_allocation_mb(func, setup))
+
+    return results
+
+def load_baselines(path: str = BASELINES_PATH) -> dict:
+    '''
+    Load stored baseline results.
+
+    :params path: Path to the baselines JSON file.
+    :returns baselines: Map of 'stage@ticks' to stage results.
+    '''
+
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as ins:
+        return json.load(ins)
+
+def save_baselines(results: dict, path: str = BASELINES_PATH) -> None:
+    '''
+    Store results as the new baselines.
+
+    :params results: Map of 'stage@ticks' to stage results.
+    :params path: Path to the baselines JSON file.
+    '''
+
+    with open(path, 'w') as outs:
+        json.dump(results, outs, indent=2, sort_keys=True)
+        outs.write('\n')
+
+def compare_baselines(results: dict, baselines: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    '''
+    Find the stages whose throughput dropped below their baseline by more
+    than the threshold.
+
+    :params results: Map of 'stage@ticks' to current stage results.
+    :params baselines: Map of 'stage@ticks' to baseline stage results.
+    :params threshold: Allowed relative drop in ticks per second.
+    :returns regressions: List of (key, baseline, current) ticks per second.
+    '''
+
+    regressions: list = []
+    for key, result in results.items():
+        if key not in baselines:
+            continue
+
+        baseline: float = baselines[key]['ticks_per_second']
+        if result['ticks_per_second'] < baseline * (1.0 - threshold):
+            regressions.append((key, baseline, result['ticks_per_second']))
+
+    return regressions
+
+def format_results(results: dict, baselines: dict) -> list:
+    '''
+    Format results as human readable lines.
+
+    :params results: Map of 'stage@ticks' to stage results.
+    :params baselines: Map of 'stage@ticks' to baseline stage results.
+    :returns lines: List of lines.
+    '''
+
+    lines: list = []
+    for key, result in results.items():
+        line: str = f'{key:<20} {result["ticks_per_second"]:>14,.0f} ticks/s {result["mb_per_second"]:>9.2f} MB/s {result["peak_alloc_mb"]:>8.1f} MB peak alloc'
+        if key in baselines:
+            change: float = result['ticks_per_second'] / baselines[key]['ticks_per_second'] - 1.0
+            line += f' {change:>+8.1%} vs baseline'
+
+        lines.append(line)
+
+    return lines
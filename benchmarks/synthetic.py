@@ -0,0 +1,94 @@
+'''
+Synthetic Dukascopy hourly tick payloads.
+
+Payloads mirror the feed: big endian '>3L2f' records of millisecond offset,
+ask and bid in integer points, and ask and bid volumes in millions, LZMA
+compressed in the legacy '.lzma' container. Prices follow a random walk
+around a realistic level for the pair, so the payloads compress like real
+data.
+'''
+
+import hashlib
+import lzma
+
+import numpy as np
+
+from datetime import datetime
+
+from network.parser import TICK_DTYPE
+from utils.instruments import CURRENCY_FACTOR_MAP
+
+# Approximate value of one unit of each currency or metal in USD, used to
+# derive a realistic price level for any pair.
+USD_VALUES: dict = {
+    'EUR'   : 1.16,
+    'GBP'   : 1.30,
+    'AUD'   : 0.72,
+    'NZD'   : 0.66,
+    'USD'   : 1.0,
+    'CAD'   : 0.77,
+    'CHF'   : 1.01,
+    'JPY'   : 0.0088,
+    'XAU'   : 1200.0,
+    'XAG'   : 14.5
+}
+
+MS_PER_HOUR: int = 3600000
+
+def _seed(currency: str, request_date: datetime) -> int:
+    '''
+    Derive a stable random seed for an hour, so the same hour always has the
+    same payload.
+
+    :params currency: String identifying currency pair.
+    :params request_date: Datetime of the hour.
+    :returns seed: Integer seed, below 2 ** 32 as RandomState requires.
+    '''
+
+    digest: bytes = hashlib.blake2b(f'{currency}{request_date:%Y%m%dT%H%M%S}'.encode(), digest_size=4).digest()
+    return int.from_bytes(digest, 'big')
+
+def synthetic_ticks(currency: str, request_date: datetime, ticks: int) -> bytes:
+    '''
+    Generate the decompressed tick records of one hour.
+
+    :params currency: String identifying currency pair.
+    :params request_date: Datetime of the hour.
+    :params ticks: Number of ticks in the hour.
+    :returns data: Byte representation of the decompressed records.
+    '''
+
+    rng = np.random.RandomState(_seed(currency, request_date))
+    factor: float = CURRENCY_FACTOR_MAP[currency]
+    price: float = USD_VALUES[currency[:3]] / USD_VALUES[currency[3:]] * factor
+
+    records = np.empty(ticks, dtype=TICK_DTYPE)
+    records['ms'] = np.sort(rng.randint(0, MS_PER_HOUR, ticks))
+
+    # Bid follows a random walk of a fraction of a point per tick, with a
+    # spread of one to three points.
+    bid: np.ndarray = np.round(price + np.cumsum(rng.normal(0.0, 0.5, ticks)))
+    records['bid'] = bid
+    records['ask'] = bid + rng.randint(1, 4, ticks)
+
+    # Volumes are quoted in millions with two decimal places.
+    records['ask_volume'] = np.maximum(np.round(rng.gamma(2.0, 0.6, ticks), 2), 0.01)
+    records['bid_volume'] = np.maximum(np.round(rng.gamma(2.0, 0.6, ticks), 2), 0.01)
+
+    return records.tobytes()
+
+def synthetic_bi5(currency: str, request_date: datetime, ticks: int) -> bytes:
+    '''
+    Generate the compressed payload of one hour, as served by the feed.
+
+    :params currency: String identifying currency pair.
+    :params request_date: Datetime of the hour.
+    :params ticks: Number of ticks in the hour. Zero gives an empty payload,
+                   as the feed serves for hours without trading.
+    :returns payload: LZMA compressed byte representation of the records.
+    '''
+
+    if ticks == 0:
+        return b''
+
+    return lzma.compress(synthetic_ticks(currency, request_date, ticks), format=lzma.FORMAT_ALONE)
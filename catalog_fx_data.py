@@ -0,0 +1,52 @@
+'''
+Query script for the coverage, gaps and statistics of cataloged hours.
+'''
+
+import argparse
+import os
+
+from utils import tools
+from utils.catalog import FXTickDataCatalog
+from utils.logger import logger
+
+LOG = logger()
+
+def main():
+    '''
+    Report the coverage and gaps of each pair, and the statistics of their
+    stored hours.
+    '''
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--catalog', help='Path to the catalog written by the loading script.', type=str, required=True)
+    arg_parser.add_argument('--pair', help='Comma separated currency pairs, or a file listing pairs', type=str, required=True)
+    arg_parser.add_argument('--start_date', help='Starting time of the range', type=str, required=True)
+    arg_parser.add_argument('--end_date', help='Ending time of the range, not inclusive', type=str)
+    arg_parser.add_argument('--gaps', help='List every run of missing tradable hours.', action='store_true')
+    args = arg_parser.parse_args()
+
+    if not os.path.exists(args.catalog):
+        raise Exception(f'User specified catalog does not exist: {args.catalog}')
+
+    start_date, end_date = tools.parse_arg_dates(args.start_date, args.end_date)
+    pairs: list = tools.parse_pair_list(args.pair)
+
+    catalog = FXTickDataCatalog(args.catalog)
+    try:
+        for pair in pairs:
+            coverage: dict = catalog.coverage(pair, start_date, end_date)
+            LOG.info(f'{pair}: {coverage["stored"]} hours stored, {coverage["missing"]} of {coverage["tradable"]} tradable hours missing ({coverage["coverage"]:.1%} coverage)')
+
+            if args.gaps:
+                for first_hour, end_hour in catalog.gaps(pair, start_date, end_date):
+                    LOG.info(f'{pair}: missing {first_hour} to {end_hour}')
+
+        summary = catalog.summary(start_date, end_date, pairs)
+        if len(summary):
+            LOG.info('Stored hours:\n%s', summary.to_string(index=False))
+
+    finally:
+        catalog.close()
+
+if __name__ == '__main__':
+    main()
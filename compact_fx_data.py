@@ -0,0 +1,39 @@
+'''
+Compaction script for merging hourly tabular outputs into daily or monthly
+partitions.
+'''
+
+import argparse
+import os
+
+from processors.compaction import PARTITION_FORMATS, compact_tabular
+from utils.logger import logger
+
+LOG = logger()
+
+def main():
+    '''
+    Compact the hourly files of a tabular output directory.
+    '''
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--opath', help='Path to dir of hourly tabular files.', type=str, required=True)
+    arg_parser.add_argument('--ppath', help='Path to dir for partitions. Defaults to opath/compacted.', type=str)
+    arg_parser.add_argument('--granularity', help='Time span of each partition.', type=str, choices=list(PARTITION_FORMATS), default='day')
+    arg_parser.add_argument('--pair', help='Currency pair to compact. Defaults to all pairs.', type=str)
+    arg_parser.add_argument('--remove', help='Remove hourly files once compacted.', action='store_true')
+    args = arg_parser.parse_args()
+
+    if not os.path.exists(args.opath):
+        raise Exception(f'User specified opath does not exist: {args.opath}')
+
+    ppath: str = args.ppath or os.path.join(args.opath, 'compacted')
+    os.makedirs(ppath, exist_ok=True)
+
+    counts: dict = compact_tabular(args.opath, ppath, args.granularity, args.pair, args.remove)
+    LOG.info(f'Compacted {counts["hours"]} hours into {counts["partitions"]} partitions in {ppath}')
+    if counts['kept']:
+        LOG.warning(f'Kept {counts["kept"]} hourly files that differ from their compacted hours')
+
+if __name__ == '__main__':
+    main()
@@ -3,90 +3,375 @@ Loading script for downloading and parsing FX data.
 '''
 
 import argparse
+import logging
 import multiprocessing
 import os
+import sys
 import time
+import tracemalloc
 
+from typing import Optional
+
+from datetime import datetime, timedelta
 from dateutil import parser, utils
 
 from utils import tools
-from utils.logger import logger
-from pipelines.basic_pipeline import *
-
-PIPELINES_MAP: dict = {
-    'tabular'   : FXTickDataTabularPipeline,
-    'sqlite'    : FXTickDataSQLitePipeline
-}
+from utils.instruments import CURRENCY_FACTOR_MAP
+from utils.journal import FXTickDataJournal
+from utils.scheduler import FXTickDataReorderBuffer, FXTickDataScheduler, filter_stored_tasks, interleave_tasks, shard_tasks
+from utils.stats import FXTickDataPipelineStats, FXTickDataRunStats, FXTickDataStatsWriter, format_summary
+from utils.logger import init_worker_logging, logger, start_log_listener
+from utils.market_hours import load_empty_hours, record_empty_hour
+from utils.profiling import FXTickDataProfiledCall, prepare_profile_dir, write_profile_report
+from utils.telemetry import FXTickDataMetricsFile, FXTickDataMetricsServer, FXTickDataTelemetry
+from pipelines.registry import get_pipeline, pipeline_names
 
-MAX_POLL_TIME: int = 3
-MAX_TIMEOUT_TIME: int = 3
+PROGRESS_LOG_TIME: int = 3
 
 LOG = logger()
 
+def build_pipeline(pair: str, query_date: datetime, sinks: tuple, pipelines: dict):
+    '''
+    Build the pipeline for a single hour. Several sinks share one fetch,
+    parse and process pass through a fan out pipeline.
+
+    :params pair: Currency pair for the hour.
+    :params query_date: Datetime of the hour.
+    :params sinks: Names of the pipelines the hour is written to. The hour
+                   is journaled under these names.
+    :params pipelines: Map of pipeline name to resolved pipeline class.
+    :returns pipeline: Callable pipeline object.
+    '''
+
+    if len(sinks) == 1:
+        pipeline = pipelines[sinks[0]](pair, query_date)
+        pipeline.sink = sinks[0]
+        return pipeline
+
+    from pipelines.basic_pipeline import FXTickDataFanOutPipeline
+
+    return FXTickDataFanOutPipeline(pair, query_date, [pipelines[sink] for sink in sinks], list(sinks))
+
+def adopt_shared_frames(results):
+    '''
+    Register the shared memory of each result with this process as it
+    arrives, so it is removed even if the process exits abnormally.
+
+    :params results: Iterable of (task, record, error) tuples.
+    :returns results: Generator of the same tuples.
+    '''
+
+    for completion in results:
+        record = completion[1]
+        if record is not None and record.shared_frame is not None:
+            record.shared_frame.adopt()
+
+        yield completion
+
+def release_shared_frames(records: list) -> None:
+    '''
+    Remove the shared memory of records that were never written.
+
+    :params records: List of records, entries may be None.
+    '''
+
+    for record in records:
+        if record is not None and record.shared_frame is not None:
+            record.shared_frame.unlink()
+            record.shared_frame = None
+
 def main():
     '''
     Load historical data from dukascopy.
     '''
 
     arg_parser = argparse.ArgumentParser()
-    arg_parser.add_argument('--pair', help='Specified currency pair', type=str)
+    arg_parser.add_argument('--pair', help='Comma separated currency pairs, or a file listing pairs', type=str)
     arg_parser.add_argument('--start_date', help='Starting time for data pull', type=str)
     arg_parser.add_argument('--end_date', help='Ending time for data pull', type=str)
     arg_parser.add_argument('--opath', help='Path to dir for ouput writes.', type=str)
     arg_parser.add_argument('--sep', help='Delimiter separating each value in tabular formats', type=str, default='\t')
     arg_parser.add_argument('--db', help='Database path for SQLite pipeline.', type=str)
     arg_parser.add_argument('--table', help='Table name for SQLite pipieline', type=str)
-    arg_parser.add_argument('--processes', help='Number of processes for data collection', type=int)
-    arg_parser.add_argument('--pipeline', help='Specify which pipeline to use.', type=str, default='tabular')
+    arg_parser.add_argument('--bars_table', help='Table name for bars pipeline', type=str, default='minutes')
+    arg_parser.add_argument('--processes', help='Number of processes shared by all pairs for data collection', type=int)
+    arg_parser.add_argument('--max_in_flight', help='Maximum number of hours queued or running at once', type=int)
+    arg_parser.add_argument('--pipeline', help=f'Comma separated pipelines to write each hour to: {", ".join(pipeline_names())}', type=str, default='tabular')
+    arg_parser.add_argument('--retries', help='Number of retries for throttled requests', type=int, default=0)
+    arg_parser.add_argument('--backoff', help='Initial delay in seconds between retries, doubled on each attempt', type=float, default=1.0)
+    arg_parser.add_argument('--base_url', help='Root URL of the data feed, e.g. a local mock server.', type=str)
+    arg_parser.add_argument('--stats', help='Path to write per-hour run statistics as JSON.', type=str)
+    arg_parser.add_argument('--journal', help='Path to journal of completed hours used to resume runs.', type=str)
+    arg_parser.add_argument('--catalog', help='Path to a SQLite catalog of per-hour coverage and statistics of stored hours.', type=str)
+    arg_parser.add_argument('--catch_up', help='Only load hours after the newest hour already stored.', action='store_true')
+    arg_parser.add_argument('--shard_index', help='Index of the slice of hours loaded by this run.', type=int, default=0)
+    arg_parser.add_argument('--shard_count', help='Number of slices the hours are split into across runs.', type=int, default=1)
+    arg_parser.add_argument('--metrics_port', help='Local port serving live metrics in Prometheus text format.', type=int)
+    arg_parser.add_argument('--metrics_file', help='Path to a file periodically rewritten with live metrics.', type=str)
+    arg_parser.add_argument('--metrics_interval', help='Seconds between rewrites of the metrics file.', type=float, default=5.0)
+    arg_parser.add_argument('--empty_hours', help='Path to a file of hours seen to be empty, skipped and extended by each run.', type=str)
+    arg_parser.add_argument('--log_level', help='Minimum level of log records.', type=str.upper, default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    arg_parser.add_argument('--log_every', help='Only log the per-hour progress lines of one in every N hours.', type=int, default=1)
+    arg_parser.add_argument('--log_file', help='Path to write logs to instead of standard error.', type=str)
+    arg_parser.add_argument('--writer', help='Process writing the sinks: each pool worker, or the parent from shared memory.', type=str, choices=['worker', 'parent'], default='worker')
+    arg_parser.add_argument('--features', help='Add mid, spread, log return and rolling volatility columns. Requires the parent writer.', action='store_true')
+    arg_parser.add_argument('--feature_window', help='Rolling volatility window, a number of ticks or a pandas offset such as 5min.', type=str, default='100')
+    arg_parser.add_argument('--profile', help='Directory to write per-worker profiles and a merged report to.', type=str)
+    arg_parser.add_argument('--profile_memory', help='Also record peak allocations per stage while profiling.', action='store_true')
     args = arg_parser.parse_args()
 
+    # Every process logs through a queue to a single writer in this process.
+    log_level: int = getattr(logging, args.log_level)
+    log_queue, log_listener = start_log_listener(log_level, args.log_every, args.log_file)
+    try:
+        load(args, log_queue, log_level)
+
+    finally:
+        log_listener.stop()
+
+def load(args, log_queue, log_level: int):
+    '''
+    Run a load from parsed command line arguments.
+
+    :params args: Parsed command line arguments.
+    :params log_queue: Queue the pool workers send their log records to.
+    :params log_level: Minimum level of log records.
+    '''
+
+    sinks: tuple = tuple(sink.strip() for sink in args.pipeline.split(',') if sink.strip())
+
     # Check that output directory exists.
-    if args.pipeline == 'tabular' and not os.path.exists(args.opath):
+    if ('tabular' in sinks or 'compact' in sinks) and not (args.opath and os.path.exists(args.opath)):
         raise Exception(f'User specified opath does not exist: {args.opath}')
 
     # Check that a table and DB were specified.
-    if args.pipeline == 'sqlite' and not (args.db and args.table):
+    if 'sqlite' in sinks and not (args.db and args.table):
         raise Exception(f'There are no database options specified for ssqlite pipeline')
 
-    # Validate that our pipeline exists.
-    if args.pipeline not in PIPELINES_MAP.keys():
-        raise Exception(f'Non-existant pipeline specified: {args.pipeline}')
+    if 'bars' in sinks and not args.db:
+        raise Exception(f'There is no database specified for bars pipeline')
+
+    if not sinks:
+        raise Exception(f'No pipeline specified: {args.pipeline}')
+
+    # Features carry rolling windows from hour to hour, so the hours of each
+    # pair must pass through a single process in order.
+    if args.features and args.writer != 'parent':
+        raise Exception(f'Features are only computed with the parent writer: --writer={args.writer}')
+
+    # Per-stage allocation peaks rely on tracemalloc.reset_peak.
+    if args.profile_memory and not hasattr(tracemalloc, 'reset_peak'):
+        raise Exception(f'Memory profiling requires Python 3.9 or later: {sys.version.split()[0]}')
+
+    # Check that the shard is valid.
+    if not 0 <= args.shard_index < args.shard_count:
+        raise Exception(f'Shard index must be in [0, {args.shard_count}): {args.shard_index}')
 
     # Set pipeline parameters.
     params: dict = {}
-    for key, value in zip(['opath', 'sep', 'db', 'table'], [args.opath, args.sep, args.db, args.table]):
+    for key, value in zip(['opath', 'sep', 'db', 'table', 'bars_table', 'retries', 'backoff', 'base_url', 'journal', 'catalog', 'writer'], [args.opath, args.sep, args.db, args.table, args.bars_table, args.retries, args.backoff, args.base_url, args.journal, args.catalog, args.writer]):
         if value is None:
             continue
 
         params[key] = value
 
-    # Attempt to convert strings to datetime objects.
-    start_date, end_date = tools.parse_arg_dates(args.start_date, args.end_date)
+    # Attempt to convert strings to datetime objects. When catching up, the
+    # start date is only a fallback for pairs with no stored data and the
+    # range runs up to the current hour.
+    if args.catch_up:
+        start_date = parser.parse(args.start_date) if args.start_date is not None else None
+        end_date = parser.parse(args.end_date) if args.end_date is not None else tools.current_hour()
+
+    else:
+        start_date, end_date = tools.parse_arg_dates(args.start_date, args.end_date)
+
+    # Validate that every pair has a known price scale.
+    pairs: list = tools.parse_pair_list(args.pair)
+    unknown_pairs: list = [pair for pair in pairs if pair not in CURRENCY_FACTOR_MAP]
+    if unknown_pairs:
+        raise Exception(f'Non-existant currency pairs specified: {unknown_pairs}')
+
+    # Validate that our pipelines exist, and can share a single pass when
+    # more than one is selected or hand their data to the parent. Pipeline
+    # modules are only imported once all other arguments are validated.
+    pipelines: dict = {sink: get_pipeline(sink) for sink in sinks}
+    if len(sinks) > 1 or args.writer == 'parent':
+        from pipelines.basic_pipeline import FXTickDataBasicPipeline
+
+        for sink, pipeline in pipelines.items():
+            if not issubclass(pipeline, FXTickDataBasicPipeline):
+                raise Exception(f'Pipeline cannot be combined with other pipelines or written by the parent: {sink}')
+
+    # Start each pair after the newest hour already stored in every sink.
+    latest_hours: dict = {}
+    start_dates: dict = {}
+    if args.catch_up:
+        for pair in pairs:
+            for sink in sinks:
+                latest_hours[(pair, sink)] = pipelines[sink].latest_stored_hour(pair, params)
 
-    # Parse currency pair for easy logging.
-    parsed_pair = tools.parse_currency_pairs(args.pair)
-    LOG.info(f'Loading {parsed_pair} data from {str(start_date)} to {str(end_date)}')
+            if any(latest_hours[(pair, sink)] is None for sink in sinks):
+                if start_date is None:
+                    raise Exception(f'No stored data found for {pair}, a start_date must be specified')
+
+            else:
+                start_dates[pair] = min(latest_hours[(pair, sink)] for sink in sinks) + timedelta(hours=1)
+
+            LOG.info(f'Catching up {tools.parse_currency_pairs(pair)} from {str(start_dates.get(pair, start_date))}')
+
+    # Parse currency pairs for easy logging. The range starts at the earliest
+    # hour scheduled for any pair.
+    parsed_pair: str = ', '.join(tools.parse_currency_pairs(pair) for pair in pairs)
+    range_start: datetime = min(start_dates.get(pair, start_date) for pair in pairs)
+    LOG.info(f'Loading {parsed_pair} data from {str(range_start)} to {str(end_date)}')
+
+    # Skip hours that earlier runs found to be empty inside trading sessions.
+    empty_hours: dict = load_empty_hours(args.empty_hours) if args.empty_hours else {}
 
     # Each file is stored on an hourly basis.
-    # Therefore each iteration must be done on an hourly basis.
-    pprocs: list = []
-    with multiprocessing.Pool(processes=args.processes) as pool:
-        for query_date in tools.valid_date_range(start_date, end_date):
-            pipeline = PIPELINES_MAP[args.pipeline](args.pair, query_date)
-            pprocs.append((pool.apply_async(pipeline, args=(params, ))))
-
-        while not all([proc.ready() for proc in pprocs]):
-            ready_procs: list = [proc for proc in pprocs if proc.ready()]
-            LOG.info(f'{len(ready_procs)} / {len(pprocs)} total processes finished.')
-            LOG.info(f'Waiting {MAX_POLL_TIME}s to poll processes again.')
-            time.sleep(MAX_POLL_TIME)
-
-    procs_responses:list =[]
-    for proc in pprocs:
-        procs_responses.append(proc.get(MAX_TIMEOUT_TIME))
-
-    LOG.info(f'Positive flags emitted: {sum(procs_responses)} / {len(procs_responses)}')
-    LOG.info(f'Processed all data for {parsed_pair} from {str(start_date)} to {str(end_date)}')
+    # Therefore each iteration must be done on an hourly basis. Hours from all
+    # pairs are interleaved in a single pool, so the pool size is the global
+    # limit on concurrent requests.
+    # Every task carries the sinks it still has to be written to.
+    tasks = ((pair, query_date, sinks) for pair, query_date in interleave_tasks(pairs, start_date, end_date, start_dates, empty_hours))
+    if args.shard_count > 1:
+        LOG.info(f'Loading shard {args.shard_index} of {args.shard_count}')
+        tasks = shard_tasks(tasks, args.shard_index, args.shard_count)
+
+    if args.catch_up:
+        tasks = filter_stored_tasks(tasks, latest_hours)
+
+    # Skip hours that a previous run already completed.
+    if args.journal:
+        LOG.info(f'Skipping hours already completed in journal {args.journal}')
+        tasks = FXTickDataJournal(args.journal).filter_tasks(tasks)
+
+    # Pipelines are built lazily as the scheduler pulls tasks, keeping only a
+    # bounded window of hours in flight.
+    calls = (((pair, query_date, task_sinks), build_pipeline(pair, query_date, task_sinks, pipelines), (params, )) for pair, query_date, task_sinks in tasks)
+
+    # Profile each pipeline call in whichever worker runs it.
+    if args.profile:
+        prepare_profile_dir(args.profile)
+        calls = ((task, FXTickDataProfiledCall(pipeline, args.profile, args.profile_memory), call_args) for task, pipeline, call_args in calls)
+
+    # Hand hours to the feature stage of their pair in order.
+    reorder: Optional[FXTickDataReorderBuffer] = None
+    feature_stages: dict = {}
+    if args.features:
+        from processors.features import FXTickDataFeatures
+
+        reorder = FXTickDataReorderBuffer()
+        calls = reorder.track(calls)
+
+        window = int(args.feature_window) if args.feature_window.isdigit() else args.feature_window
+        feature_stages = {pair: FXTickDataFeatures(window) for pair in pairs}
+
+    processes: int = args.processes or os.cpu_count()
+    max_in_flight: int = args.max_in_flight or 2 * processes
+
+    run_stats = FXTickDataRunStats()
+    stats_writer = FXTickDataStatsWriter(args.stats) if args.stats else None
+
+    # Stored hours are cataloged by this process only.
+    catalog = None
+    if args.catalog:
+        from utils.catalog import FXTickDataCatalog
+
+        catalog = FXTickDataCatalog(args.catalog)
+
+    # Export live metrics while the run is in progress.
+    telemetry = FXTickDataTelemetry(processes)
+    exporters: list = []
+    if args.metrics_port is not None:
+        exporters.append(FXTickDataMetricsServer(telemetry, args.metrics_port))
+        LOG.info(f'Serving live metrics on http://127.0.0.1:{exporters[-1].port}/metrics')
+
+    if args.metrics_file:
+        exporters.append(FXTickDataMetricsFile(telemetry, args.metrics_file, args.metrics_interval))
+
+    for exporter in exporters:
+        exporter.start()
+
+    run_start: float = time.perf_counter()
+    last_progress: float = run_start
+    scheduler: Optional[FXTickDataScheduler] = None
+    record: Optional[FXTickDataPipelineStats] = None
+    try:
+        with multiprocessing.Pool(processes=processes, initializer=init_worker_logging, initargs=(log_queue, log_level, args.log_every)) as pool:
+            scheduler = FXTickDataScheduler(pool, max_in_flight, reorder.held if reorder is not None else None)
+            telemetry.track(scheduler)
+            results = adopt_shared_frames(scheduler.run(calls))
+            if reorder is not None:
+                results = reorder.release(results)
+
+            for (pair, query_date, task_sinks), record, error in results:
+                if error is not None:
+                    LOG.error('Pipeline raised for date %s for %s: %s', query_date, pair, error)
+                    record = FXTickDataPipelineStats(pair, query_date)
+                    record.failed_stage = 'pool'
+
+                # Workers hand processed data over through shared memory and this
+                # process writes it to every sink.
+                if record.shared_frame is not None:
+                    record = build_pipeline(pair, query_date, task_sinks, pipelines).write_shared(record, params, feature_stages.get(pair))
+
+                # A failed hour breaks the rolling windows of its pair.
+                if pair in feature_stages and not record.success:
+                    feature_stages[pair].reset()
+
+                if args.empty_hours and record.success and record.rows == 0:
+                    record_empty_hour(args.empty_hours, pair, query_date)
+
+                if catalog is not None and record.success and record.hour_summary is not None:
+                    catalog.record(pair, query_date, record.hour_summary)
+
+                run_stats.add(record)
+                telemetry.observe(record)
+                if stats_writer is not None:
+                    stats_writer.write(record)
+
+                if time.perf_counter() - last_progress >= PROGRESS_LOG_TIME:
+                    last_progress = time.perf_counter()
+                    LOG.info('%d processes finished (%d failed), %d in flight.', scheduler.completed, run_stats.hours - run_stats.succeeded, scheduler.in_flight)
+
+    finally:
+        # Hours returned but not written, e.g. after an exception or Ctrl-C,
+        # still own their shared memory. The pool has terminated, so no more
+        # results arrive.
+        held: list = [record]
+        if reorder is not None:
+            held.extend(completion[1] for completion in reorder.pending.values())
+
+        if scheduler is not None:
+            held.extend(completion[1] for completion in scheduler.drain())
+
+        release_shared_frames(held)
+
+    for exporter in exporters:
+        exporter.stop()
+
+    if catalog is not None:
+        catalog.close()
+        LOG.info(f'Recorded stored hours in catalog {args.catalog}')
+
+    # Aggregate per-hour records into an end of run report.
+    summary: dict = run_stats.summary(time.perf_counter() - run_start)
+    for line in format_summary(summary):
+        LOG.info(line)
+
+    if stats_writer is not None:
+        stats_writer.close(summary)
+
+    # Merge the per-worker profiles into a single sorted report.
+    if args.profile:
+        report: Optional[str] = write_profile_report(args.profile)
+        if report is not None:
+            LOG.info('Merged worker profiles:\n%s', report)
+            LOG.info(f'Wrote merged profile to {args.profile}')
+
+    LOG.info(f'Positive flags emitted: {summary["succeeded"]} / {summary["hours"]}')
+    LOG.info(f'Processed all data for {parsed_pair} from {str(range_start)} to {str(end_date)}')
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,46 @@
+'''
+Merging script for combining the outputs of sharded loading runs.
+'''
+
+import argparse
+import os
+
+from utils.logger import logger
+from utils.merge import merge_sqlite, merge_tabular
+
+LOG = logger()
+
+def main():
+    '''
+    Merge shard outputs into a single dataset.
+    '''
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--format', help='Format of the shard outputs.', type=str, choices=['tabular', 'sqlite'], default='tabular')
+    arg_parser.add_argument('--shards', help='Shard output directories or SQLite database paths.', type=str, nargs='+', required=True)
+    arg_parser.add_argument('--opath', help='Path to dir for merged tabular files.', type=str)
+    arg_parser.add_argument('--db', help='Database path for merged SQLite data.', type=str)
+    arg_parser.add_argument('--table', help='Table name to merge for SQLite data.', type=str)
+    args = arg_parser.parse_args()
+
+    # Check that every shard exists.
+    for shard in args.shards:
+        if not os.path.exists(shard):
+            raise Exception(f'User specified shard does not exist: {shard}')
+
+    if args.format == 'tabular':
+        if not (args.opath and os.path.exists(args.opath)):
+            raise Exception(f'User specified opath does not exist: {args.opath}')
+
+        copied: int = merge_tabular(args.shards, args.opath)
+        LOG.info(f'Merged {copied} files from {len(args.shards)} shards into {args.opath}')
+
+    else:
+        if not (args.db and args.table):
+            raise Exception(f'There are no database options specified for sqlite merge')
+
+        inserted: int = merge_sqlite(args.shards, args.db, args.table)
+        LOG.info(f'Merged {inserted} rows from {len(args.shards)} shards into {args.db}.{args.table}')
+
+if __name__ == '__main__':
+    main()
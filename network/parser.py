@@ -4,8 +4,19 @@ Classes and utilites used in parsing response data from APIs.
 
 import struct
 
+import numpy as np
+
 from lzma import LZMADecompressor, LZMAError, FORMAT_AUTO
 
+# Record layout of a single tick, matching the '>3L2f' struct format.
+TICK_DTYPE = np.dtype([
+    ('ms', '>u4'),
+    ('ask', '>u4'),
+    ('bid', '>u4'),
+    ('ask_volume', '>f4'),
+    ('bid_volume', '>f4')
+])
+
 class FXTickDataParser(object):
     '''
     Parse response data for FX tick data from Dukascopy.
@@ -68,7 +79,26 @@ class FXTickDataParser(object):
         '''
 
         # Decompress byte stream prior to parsing data.
-        data: bytes = self._decompress_lzma(resp)
+        return self.decode(self.decompress(resp))
+
+    def decompress(self, resp: bytes) -> bytes:
+        '''
+        Decompress a raw response, for callers that decode it separately, e.g.
+        to time each step.
+
+        :params resp: Byte representation of LZMA compressed response data.
+        :returns data: Decompressed byte representation of response data.
+        '''
+
+        return self._decompress_lzma(resp)
+
+    def decode(self, data: bytes) -> list:
+        '''
+        Unpack decompressed response data into a list of ticks.
+
+        :params data: Decompressed byte representation of response data.
+        :returns daily_tick_data: List of individual ticks in the market.
+        '''
 
         daily_tick_data: list = []
         for chunk_idx in range(0, len(data), self.row_size):
@@ -76,3 +106,27 @@ class FXTickDataParser(object):
             daily_tick_data.append(chunk)
 
         return daily_tick_data
+
+    def parse_array(self, resp: bytes) -> np.ndarray:
+        '''
+        Parse raw response into a structured array ready for batch processing.
+
+        :params resp: Byte representation of response data. The data is LZMA
+                      compressed, so it must be decompressed prior to unpacking
+                      data.
+        :returns records: Structured array of ticks with the TICK_DTYPE layout.
+        '''
+
+        return self.decode_array(self.decompress(resp))
+
+    def decode_array(self, data: bytes) -> np.ndarray:
+        '''
+        Unpack decompressed response data into a structured array without
+        unpacking ticks one at a time.
+
+        :params data: Decompressed byte representation of response data.
+        :returns records: Structured array of ticks with the TICK_DTYPE layout.
+        '''
+
+        # A truncated trailing record is ignored.
+        return np.frombuffer(data, dtype=TICK_DTYPE, count=len(data) // TICK_DTYPE.itemsize)
@@ -4,31 +4,45 @@ Classes used in requesting data from various sources.
 NOTE: Each requested file includes one hour of tick data.
 '''
 
+import time
+
 import requests
 
 from datetime import datetime
 
+# Root of the Dukascopy data feed.
+DATAFEED_URL: str = 'http://www.dukascopy.com/datafeed'
+
 class FXTickDataRequester(object):
     '''
     Request and parse data from Dukascopy FX APIs.
     '''
 
-    def __init__(self, currency: str, request_date: datetime):
+    def __init__(self, currency: str, request_date: datetime, max_retries: int = 0, backoff: float = 1.0,
+                 base_url: str = DATAFEED_URL):
         '''
         Build out URL in initializer.
 
         :params currency: String identifying currency pair.
         :params request_date: Datetime object containing all relevant date parts.
+        :params max_retries: Number of times a throttled (503) request is retried.
+        :params backoff: Initial delay in seconds between retries, doubled on each attempt.
+        :params base_url: Root of the data feed, e.g. a local server for testing.
         '''
 
         self.request_date: datetime = request_date
         self.currency: str = currency
+        self.max_retries: int = max_retries
+        self.backoff: float = backoff
+
+        # Number of retries made by the most recent request.
+        self.retries: int = 0
 
         # Validate and parse datetime information.
         self.year, self.month, self.day, self.hour = self._parse_input_date(self.request_date)
 
         # Parametrized URL for requests.
-        self.DUKAS_BASE_URL: str = f'http://www.dukascopy.com/datafeed/{self.currency}/{self.year}/{self.month}/{self.day}/{self.hour}h_ticks.bi5'
+        self.DUKAS_BASE_URL: str = f'{base_url}/{self.currency}/{self.year}/{self.month}/{self.day}/{self.hour}h_ticks.bi5'
 
     def _parse_input_date(self, request_date: datetime) -> tuple:
         '''
@@ -57,8 +71,15 @@ class FXTickDataRequester(object):
         :returns resp: Raw reponse containing tick data in bytes.
         '''
 
-        # Request tick data and validate appropriate response code.
+        # Request tick data, backing off and retrying while the server is
+        # throttling us. Then validate appropriate response code.
+        self.retries = 0
         resp = requests.get(self.DUKAS_BASE_URL)
+        while resp.status_code == requests.codes.service_unavailable and self.retries < self.max_retries:
+            time.sleep(self.backoff * 2 ** self.retries)
+            self.retries += 1
+            resp = requests.get(self.DUKAS_BASE_URL)
+
         if not resp.status_code == requests.codes.ok:
             resp.raise_for_status()
             return b''
@@ -1,33 +1,57 @@
 '''
 Basic pipelines that do not include any additional resampling or transformations.
 
-NOTE: Each pipeline is expected to emit a flag at the end indicating success or
-      failure.
+NOTE: Each pipeline is expected to emit a FXTickDataPipelineStats record at the
+      end. The record's success flag indicates success or failure.
 '''
 
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import numpy as np
 import pandas as pd
 
 from datetime import datetime
 
+from utils.journal import FXTickDataJournal
 from utils.logger import logger
-from network.requester import FXTickDataRequester
+from utils.stats import FXTickDataPipelineStats
+from network.requester import DATAFEED_URL, FXTickDataRequester
 from network.parser import FXTickDataParser
-from processors.ticks import FXTickDataProcessorSQLite, FXTickDataProcessorTabular
+from processors.ticks import FXTickDataProcessor, FXTickDataProcessorSQLite, FXTickDataProcessorTabular
+
+# Optional stages are imported where they are used, so workers only load
+# what the run needs.
+if TYPE_CHECKING:
+    from processors.features import FXTickDataFeatures
 
 LOG = logger()
 
 class FXTickDataBasicPipeline():
     '''
     Basic pipeline to data from API, transform, and load to disk.
+
+    Subclasses select a processor and the parameters passed to its writer.
     '''
 
+    # Processor used to process and write the parsed data.
+    PROCESSOR: type = FXTickDataProcessor
+
+    # Parameter keys passed, in order, to the processor's write method.
+    WRITE_KEYS: list = []
+
+    # Format string describing the write target for logging.
+    TARGET_FORMAT: str = ''
+
+    # Default name of the sink recorded in the completion journal.
+    SINK: str = ''
+
     def __init__(self, currency: str, request_date: datetime):
         self.currency: str = currency
         self.request_date: datetime = request_date
 
+        # Hours are journaled under the name they were scheduled under, which
+        # the loading script sets to the pipeline's registered name.
+        self.sink: str = self.SINK
+
     def _get_params(self, params: dict, keys: list) -> tuple:
         '''
         Search the dictionary of parameters to find the specified keys, and
@@ -39,100 +63,228 @@ class FXTickDataBasicPipeline():
 
         return (params[key] for key in keys)
 
-class FXTickDataTabularPipeline(FXTickDataBasicPipeline):
-    '''
-    Run data pipeline with a tabular processor.
-    '''
+    @classmethod
+    def latest_stored_hour(cls, currency: str, params: dict) -> Optional[datetime]:
+        '''
+        Find the newest hour already stored in this pipeline's sink.
+
+        :params currency: String identifying currency pair.
+        :params params: Parameter dictionary containing pipeline args.
+        :returns latest: Datetime of the newest stored hour, or None.
+        '''
+
+        return cls.PROCESSOR.latest_hour(currency, *(params[key] for key in cls.WRITE_KEYS))
+
+    def _describe_target(self, params: dict) -> str:
+        '''
+        Describe the write target for logging.
+
+        :params params: Parameter dictionary containing pipeline args.
+        :returns target: String describing where data is written.
+        '''
+
+        return self.TARGET_FORMAT.format(**params)
+
+    def _write(self, data: pd.DataFrame, params: dict) -> None:
+        '''
+        Write processed data with this pipeline's processor, then record the
+        hour in the journal if one is given.
 
-    def __call__(self, params: dict) -> bool:
+        :params data: DataFrame containing processed tick data.
+        :params params: Parameter dictionary containing pipeline args.
         '''
-        Full data processing pipeline. Emit a flag if the pipeline succeeded.
 
-        :params opath: Path to output directory for writes.
-        :params sep: Optionally specify how the data is delimited.
-        :returns flag: Boolean flag indicating success of failure.
+        tick_data_processor = self.PROCESSOR(self.currency, self.request_date)
+        tick_data_processor.write(data, *self._get_params(params, self.WRITE_KEYS))
+
+        if params.get('journal'):
+            FXTickDataJournal(params['journal']).record(self.currency, self.request_date, self.sink)
+
+    def __call__(self, params: dict) -> FXTickDataPipelineStats:
         '''
+        Full data processing pipeline. Emit a record describing the run.
+
+        :params params: Parameter dictionary containing pipeline args. If a
+                        journal path is given, the hour is recorded there
+                        once it has been written. If a catalog path is given,
+                        the hour is summarized on the record for the catalog. If the writer is 'parent',
+                        the processed frame is handed over in shared memory
+                        on the record instead, for write_shared.
+        :returns stats: Record of timings and volumes including a success flag.
+        '''
+
+        stats = FXTickDataPipelineStats(self.currency, self.request_date)
+        target: str = self._describe_target(params)
 
-        opath, sep = self._get_params(params, ['opath', 'sep'])
+        # Per-hour records carry the hour so they can be sampled together.
+        extra: dict = {'hour': self.request_date}
 
+        data_requester: Optional[FXTickDataRequester] = None
         try:
-            LOG.info(f'Sending API requests for date {str(self.request_date)} to {opath}')
-            data_requester = FXTickDataRequester(self.currency, self.request_date)
-            raw_ticks = data_requester.request()
+            LOG.info('Sending API requests for date %s to %s', self.request_date, target, extra=extra)
+            data_requester = FXTickDataRequester(self.currency, self.request_date, max_retries=params.get('retries', 0),
+                                                 backoff=params.get('backoff', 1.0), base_url=params.get('base_url', DATAFEED_URL))
+            with stats.timer('http'):
+                raw_ticks = data_requester.request()
+
+            stats.bytes_downloaded = len(raw_ticks)
 
         except Exception as e:
-            LOG.error(f'Error requesting data on {self.request_date} for {self.currency}')
-            LOG.error(f'Error string: {str(e)}')
-            return False
+            stats.failed_stage = 'http'
+            LOG.error('Error requesting data on %s for %s: %s', self.request_date, self.currency, e, extra=extra)
+            return stats
+
+        finally:
+            if data_requester is not None:
+                stats.retries = data_requester.retries
 
         try:
-            LOG.info(f'Parsing API response for date {str(self.request_date)} to {opath}')
+            LOG.info('Parsing API response for date %s to %s', self.request_date, target, extra=extra)
             tick_data_parser = FXTickDataParser()
-            parsed_ticks = tick_data_parser.parse(raw_ticks)
+            with stats.timer('decompress'):
+                data = tick_data_parser.decompress(raw_ticks)
+
+            with stats.timer('parse'):
+                parsed_ticks = tick_data_parser.decode(data)
+
+        except Exception as e:
+            stats.failed_stage = 'parse'
+            LOG.error('Error parsing response data on %s for %s: %s', self.request_date, self.currency, e, extra=extra)
+            return stats
+
+        try:
+            LOG.info('Processing and writing parsed response for date %s to %s', self.request_date, target, extra=extra)
+            with stats.timer('process'):
+                processed_tick_data = self.PROCESSOR(self.currency, self.request_date).process(parsed_ticks)
+
+            stats.rows = len(processed_tick_data)
+            if params.get('catalog'):
+                from utils.catalog import summarize_hour
+
+                stats.hour_summary = summarize_hour(processed_tick_data, raw_ticks)
+
+            # Hand the processed frame to the parent to write instead.
+            if params.get('writer') == 'parent':
+                from utils.shared_frames import FXTickDataSharedFrame
+
+                stats.shared_frame = FXTickDataSharedFrame.create(processed_tick_data, self.currency, self.request_date)
+                return stats
+
+            with stats.timer('write'):
+                self._write(processed_tick_data, params)
 
         except Exception as e:
-            LOG.error(f'Error parsing response data on {self.request_date} for {self.currency}')
-            LOG.error(f'Error string: {str(e)}')
-            return False
+            stats.failed_stage = 'write'
+            LOG.error('Error in the process/write stage for date %s for %s: %s', self.request_date, self.currency, e, extra=extra)
+            return stats
+
+        stats.success = True
+        return stats
+
+    def write_shared(self, stats: FXTickDataPipelineStats, params: dict,
+                     features: Optional['FXTickDataFeatures'] = None) -> FXTickDataPipelineStats:
+        '''
+        Write a frame handed over through shared memory by a worker, then
+        release its blocks.
 
+        :params stats: Record emitted by the worker, holding the shared frame.
+        :params params: Parameter dictionary containing pipeline args.
+        :params features: Optional feature stage of the pair, applied before
+                          the write. Hours must be passed in order.
+        :returns stats: The record, updated with the write timing and success.
+        '''
+
+        extra: dict = {'hour': self.request_date}
+        stage: str = 'process'
         try:
-            LOG.info(f'Processing and writing parsed response for date {str(self.request_date)} to {opath}')
-            tick_data_processor = FXTickDataProcessorTabular(self.currency, self.request_date)
-            processed_tick_data = tick_data_processor.process(parsed_ticks)
-            tick_data_processor.write(processed_tick_data, opath)
+            with stats.shared_frame.attach() as processed_tick_data:
+                if features is not None:
+                    with stats.timer('process'):
+                        processed_tick_data = features.compute(processed_tick_data)
+
+                stage = 'write'
+                with stats.timer('write'):
+                    self._write(processed_tick_data, params)
 
         except Exception as e:
-            LOG.error(f'Error in the process/write stage for date {self.request_date} for {self.currency}')
-            LOG.error(f'Error string: {str(e)}')
-            return False
+            stats.failed_stage = stage
+            LOG.error('Error in the %s stage for date %s for %s: %s', stage, self.request_date, self.currency, e, extra=extra)
+            return stats
 
-        return True
+        finally:
+            stats.shared_frame.unlink()
+            stats.shared_frame = None
+
+        stats.success = True
+        return stats
+
+class FXTickDataTabularPipeline(FXTickDataBasicPipeline):
+    '''
+    Run data pipeline with a tabular processor.
+
+    :params opath: Path to output directory for writes.
+    :params sep: Optionally specify how the data is delimited.
+    '''
+
+    PROCESSOR: type = FXTickDataProcessorTabular
+    WRITE_KEYS: list = ['opath', 'sep']
+    TARGET_FORMAT: str = '{opath}'
+    SINK: str = 'tabular'
 
 class FXTickDataSQLitePipeline(FXTickDataBasicPipeline):
     '''
     Run data pipeline with a SQLite processor.
+
+    :params db: Local DB name.
+    :params table: Table where data will be stored.
     '''
 
-    def __call__(self, params: dict) -> bool:
-        '''
-        Full data processing pipeline. Emit a flag if the pipeline succeeded.
+    PROCESSOR: type = FXTickDataProcessorSQLite
+    WRITE_KEYS: list = ['db', 'table']
+    TARGET_FORMAT: str = '{db}.{table}'
+    SINK: str = 'sqlite'
+
+class FXTickDataFanOutPipeline(FXTickDataBasicPipeline):
+    '''
+    Run data pipeline once and write the processed data to several sinks.
+
+    Each sink is a pipeline class whose writer consumes the same processed
+    frame, so extra sinks only add write cost.
+    '''
 
-        :params db: Local DB name.
-        :params table: Table where data will be stored.
-        :returns flag: Boolean flag indicating success of failure.
+    def __init__(self, currency: str, request_date: datetime, sinks: list, names: Optional[list] = None):
+        '''
+        :params currency: String identifying currency pair.
+        :params request_date: Datetime of the requested hour.
+        :params sinks: List of FXTickDataBasicPipeline subclasses to write to.
+        :params names: Optional list of the names each sink is journaled
+                       under, defaulting to their SINK.
         '''
 
-        db, table = self._get_params(params, ['db', 'table'])
+        super().__init__(currency, request_date)
+        self.sinks: list = [sink(currency, request_date) for sink in sinks]
 
-        try:
-            LOG.info(f'Sending API requests for date {str(self.request_date)} to {db}.{table}')
-            data_requester = FXTickDataRequester(self.currency, self.request_date)
-            raw_ticks = data_requester.request()
+        for sink, name in zip(self.sinks, names or []):
+            sink.sink = name
 
-        except Exception as e:
-            LOG.error(f'Error requesting data on {self.request_date} for {self.currency}')
-            LOG.error(f'Error string: {str(e)}')
-            return False
+    def _describe_target(self, params: dict) -> str:
+        '''
+        Describe all write targets for logging.
 
-        try:
-            LOG.info(f'Parsing API response for date {str(self.request_date)} to {db}/{table}')
-            tick_data_parser = FXTickDataParser()
-            parsed_ticks = tick_data_parser.parse(raw_ticks)
+        :params params: Parameter dictionary containing pipeline args.
+        :returns target: String describing where data is written.
+        '''
 
-        except Exception as e:
-            LOG.error(f'Error parsing response data on {self.request_date} for {self.currency}')
-            LOG.error(f'Error string: {str(e)}')
-            return False
+        return ', '.join(sink._describe_target(params) for sink in self.sinks)
 
-        try:
-            LOG.info(f'Processing and writing parsed response for date {str(self.request_date)} to {db}.{table}')
-            tick_data_processor = FXTickDataProcessorSQLite(self.currency, self.request_date)
-            processed_tick_data = tick_data_processor.process(parsed_ticks)
-            tick_data_processor.write(processed_tick_data, db, table)
+    def _write(self, data: pd.DataFrame, params: dict) -> None:
+        '''
+        Write processed data to each sink in turn. Sinks that finished before a
+        failure stay recorded in the journal.
 
-        except Exception as e:
-            LOG.error(f'Error in the process/write stage for date {self.request_date} for {self.currency}')
-            LOG.error(f'Error string: {str(e)}')
-            return False
+        :params data: DataFrame containing processed tick data.
+        :params params: Parameter dictionary containing pipeline args.
+        '''
 
-        return True
+        for sink in self.sinks:
+            sink._write(data, params)
@@ -0,0 +1,18 @@
+'''
+Pipelines that load tick data into the compact binary format.
+'''
+
+from pipelines.basic_pipeline import FXTickDataBasicPipeline
+from processors.compact import FXTickDataProcessorCompact
+
+class FXTickDataCompactPipeline(FXTickDataBasicPipeline):
+    '''
+    Run data pipeline with a compact binary processor.
+
+    :params opath: Path to output directory for writes.
+    '''
+
+    PROCESSOR: type = FXTickDataProcessorCompact
+    WRITE_KEYS: list = ['opath']
+    TARGET_FORMAT: str = '{opath}'
+    SINK: str = 'compact'
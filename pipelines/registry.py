@@ -0,0 +1,70 @@
+'''
+Registry of pipelines resolved lazily by name.
+
+Pipelines are referenced by 'module:attribute' strings and only imported once
+they are requested, so the heavy numerical and network dependencies are only
+loaded for the pipelines a run actually uses.
+
+Third party packages can add pipelines by declaring an entry point in the
+'fx_data_loader.pipelines' group, e.g. in pyproject.toml:
+
+    [project.entry-points."fx_data_loader.pipelines"]
+    parquet = "my_package.pipelines:FXTickDataParquetPipeline"
+'''
+
+import importlib
+
+ENTRY_POINT_GROUP: str = 'fx_data_loader.pipelines'
+
+# Built in pipelines. These take precedence over entry points of the same name.
+PIPELINES_MAP: dict = {
+    'tabular'   : 'pipelines.basic_pipeline:FXTickDataTabularPipeline',
+    'sqlite'    : 'pipelines.basic_pipeline:FXTickDataSQLitePipeline',
+    'compact'   : 'pipelines.compact_pipeline:FXTickDataCompactPipeline',
+    'bars'      : 'pipelines.resampled_pipeline:FXTickDataBarsPipeline'
+}
+
+def _entry_points() -> dict:
+    '''
+    Collect pipeline entry points declared by installed packages.
+
+    :returns entry_points: Map of pipeline name to entry point.
+    '''
+
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        group = entry_points.select(group=ENTRY_POINT_GROUP)
+
+    else:
+        group = entry_points.get(ENTRY_POINT_GROUP, [])
+
+    return {entry_point.name: entry_point for entry_point in group}
+
+def pipeline_names() -> list:
+    '''
+    List the names of all built in and third party pipelines.
+
+    :returns names: Sorted list of pipeline names.
+    '''
+
+    return sorted(set(PIPELINES_MAP) | set(_entry_points()))
+
+def get_pipeline(name: str) -> type:
+    '''
+    Resolve a pipeline class by name, importing its module on first use.
+
+    :params name: Registered name of the pipeline.
+    :returns pipeline: Pipeline class.
+    '''
+
+    if name in PIPELINES_MAP:
+        module_name, attribute = PIPELINES_MAP[name].split(':')
+        return getattr(importlib.import_module(module_name), attribute)
+
+    entry_points: dict = _entry_points()
+    if name in entry_points:
+        return entry_points[name].load()
+
+    raise Exception(f'Non-existant pipeline specified: {name}')
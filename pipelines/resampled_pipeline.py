@@ -0,0 +1,19 @@
+'''
+Pipelines that resample tick data into lower resolution bars before loading.
+'''
+
+from pipelines.basic_pipeline import FXTickDataBasicPipeline
+from processors.resampler import FXTickDataProcessorBars
+
+class FXTickDataBarsPipeline(FXTickDataBasicPipeline):
+    '''
+    Run data pipeline with a one minute bar processor.
+
+    :params db: Local DB name.
+    :params bars_table: Table where bars will be stored.
+    '''
+
+    PROCESSOR: type = FXTickDataProcessorBars
+    WRITE_KEYS: list = ['db', 'bars_table']
+    TARGET_FORMAT: str = '{db}.{bars_table}'
+    SINK: str = 'bars'
@@ -0,0 +1,181 @@
+'''
+Compact binary storage of processed tick data.
+
+Each hour is stored as one block: a fixed header followed by the zlib
+compressed columns. Timestamps are stored as millisecond deltas from the
+previous tick, prices as integer point deltas from the previous tick, and
+volumes as integers, each in the narrowest integer type that holds them.
+Decoding rebuilds the columns with cumulative sums.
+'''
+
+import os
+import re
+import struct
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from typing import Optional
+
+from datetime import datetime
+
+from processors.ticks import FXTickDataProcessor
+
+MAGIC: bytes = b'FXTC'
+VERSION: int = 1
+
+# Magic, version, column dtype codes, hour as epoch milliseconds, price
+# factor, tick count and compressed payload length.
+HEADER = struct.Struct('<4sB5sqdII')
+
+# Stored columns, in order. Columns marked as deltas are stored as differences
+# from the previous tick.
+COLUMNS: tuple = (('ms', True), ('ask', True), ('bid', True), ('ask_volume', False), ('bid_volume', False))
+
+# Candidate integer types, narrowest first.
+INTEGER_TYPES: tuple = ('<i1', '<i2', '<i4', '<i8')
+
+COMPACT_EXTENSION: str = '.fxtc'
+
+def _narrowest(values: np.ndarray) -> str:
+    '''
+    Find the narrowest integer type holding every value.
+
+    :params values: Array of int64 values.
+    :returns dtype: Little endian dtype string.
+    '''
+
+    if not len(values):
+        return INTEGER_TYPES[0]
+
+    low, high = values.min(), values.max()
+    for dtype in INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+
+    return INTEGER_TYPES[-1]
+
+def encode_block(data: pd.DataFrame, request_date: datetime, factor: float, level: int = 6) -> bytes:
+    '''
+    Encode an hour of processed tick data into a compact block.
+
+    :params data: DataFrame containing processed tick data.
+    :params request_date: Datetime of the hour.
+    :params factor: Price factor of the currency pair.
+    :params level: zlib compression level.
+    :returns block: Encoded block.
+    '''
+
+    hour = pd.Timestamp(request_date)
+    columns: dict = {
+        'ms'            : ((data['ts'] - hour) // pd.Timedelta(milliseconds=1)).to_numpy(dtype='int64'),
+        'ask'           : np.rint(data['ask'].to_numpy(dtype='float64') * factor).astype('int64'),
+        'bid'           : np.rint(data['bid'].to_numpy(dtype='float64') * factor).astype('int64'),
+        'ask_volume'    : np.rint(data['ask_volume'].to_numpy(dtype='float64')).astype('int64'),
+        'bid_volume'    : np.rint(data['bid_volume'].to_numpy(dtype='float64')).astype('int64')
+    }
+
+    codes: bytes = b''
+    payload: list = []
+    for column, delta in COLUMNS:
+        values: np.ndarray = np.diff(columns[column], prepend=0) if delta else columns[column]
+        dtype: str = _narrowest(values)
+        codes += np.dtype(dtype).char.encode()
+        payload.append(values.astype(dtype).tobytes())
+
+    compressed: bytes = zlib.compress(b''.join(payload), level)
+    header: bytes = HEADER.pack(MAGIC, VERSION, codes, hour.value // 1000000, factor, len(data), len(compressed))
+
+    return header + compressed
+
+def decode_block(block: bytes) -> pd.DataFrame:
+    '''
+    Decode a compact block into processed tick data.
+
+    :params block: Encoded block.
+    :returns data: DataFrame with the columns of processed tick data.
+    '''
+
+    magic, version, codes, hour_ms, factor, count, length = HEADER.unpack_from(block)
+    if magic != MAGIC or version != VERSION:
+        raise Exception(f'Unsupported compact block: magic {magic}, version {version}')
+
+    payload: bytes = zlib.decompress(block[HEADER.size:HEADER.size + length])
+
+    columns: dict = {}
+    offset: int = 0
+    for (column, delta), code in zip(COLUMNS, codes.decode()):
+        dtype = np.dtype(code).newbyteorder('<')
+        values: np.ndarray = np.frombuffer(payload, dtype=dtype, count=count, offset=offset)
+        offset += count * dtype.itemsize
+        columns[column] = np.cumsum(values, dtype='int64') if delta else values.astype('int64')
+
+    data: pd.DataFrame = pd.DataFrame({
+        'ts'            : pd.Timestamp(hour_ms, unit='ms').to_pydatetime() + pd.to_timedelta(columns['ms'], unit='ms'),
+        'ask'           : columns['ask'] / factor,
+        'bid'           : columns['bid'] / factor,
+        'ask_volume'    : columns['ask_volume'].astype('float64'),
+        'bid_volume'    : columns['bid_volume'].astype('float64')
+    })
+
+    return data
+
+class FXTickDataProcessorCompact(FXTickDataProcessor):
+    '''
+    Write data after processing into compact, delta encoded binary blocks,
+    one file per hour.
+    '''
+
+    def write(self, data: pd.DataFrame, opath: str) -> None:
+        '''
+        For the given output path, write data as a compact block.
+
+        :params data: DataFrame containing processed tick data.
+        :params opath: Output path for writes.
+        '''
+
+        outs: str = os.path.join(opath, self.currency + self.request_date.strftime('%Y%m%dT%H%M%S'))
+        with open(outs + COMPACT_EXTENSION, 'wb') as outf:
+            outf.write(encode_block(data, self.request_date, self.CURRENCY_FACTOR_MAP[self.currency]))
+
+    @classmethod
+    def read(cls, currency: str, request_date: datetime, opath: str) -> pd.DataFrame:
+        '''
+        Read an hour written by this processor.
+
+        :params currency: String identifying currency pair.
+        :params request_date: Datetime of the hour.
+        :params opath: Output path the hour was written to.
+        :returns data: DataFrame containing processed tick data.
+        '''
+
+        path: str = os.path.join(opath, currency + request_date.strftime('%Y%m%dT%H%M%S') + COMPACT_EXTENSION)
+        with open(path, 'rb') as ins:
+            return decode_block(ins.read())
+
+    @classmethod
+    def latest_hour(cls, currency: str, opath: str) -> Optional[datetime]:
+        '''
+        Find the newest hour already written for a pair from the file names in
+        the output path.
+
+        :params currency: String identifying currency pair.
+        :params opath: Output path for writes.
+        :returns latest: Datetime of the newest stored hour, or None.
+        '''
+
+        pattern = re.compile(re.escape(currency) + r'(\d{8}T\d{6})' + re.escape(COMPACT_EXTENSION) + '$')
+
+        latest: Optional[datetime] = None
+        for entry in os.scandir(opath):
+            match = pattern.match(entry.name)
+            if match is None:
+                continue
+
+            request_date: datetime = datetime.strptime(match.group(1), '%Y%m%dT%H%M%S')
+            if latest is None or request_date > latest:
+                latest = request_date
+
+        return latest
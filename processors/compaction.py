@@ -0,0 +1,240 @@
+'''
+Compact hourly tabular outputs into daily or monthly partitions.
+
+A partition is a single delimited file holding the hours of one pair for one
+day or month in time order, next to an index mapping each hour to the byte
+offset and length of its rows. Hours are copied as raw bytes, so compaction
+never parses the data, and readers fetch any run of hours with one seek and
+one sequential read.
+'''
+
+import json
+import os
+import re
+
+from typing import Optional
+
+from datetime import datetime
+
+from utils.logger import logger
+
+LOG = logger()
+
+# Hourly files written by FXTickDataProcessorTabular.
+HOURLY_FILE_PATTERN = re.compile(r'^([A-Z]{6})(\d{8}T\d{6})\.tsv$')
+
+# Partition key formats per granularity.
+PARTITION_FORMATS: dict = {
+    'day'   : '%Y%m%d',
+    'month' : '%Y%m'
+}
+
+INDEX_SUFFIX: str = '.idx.json'
+
+def partition_name(currency: str, hour: datetime, granularity: str) -> str:
+    '''
+    Name the partition holding an hour.
+
+    :params currency: String identifying currency pair.
+    :params hour: Datetime of the hour.
+    :params granularity: Partition granularity, 'day' or 'month'.
+    :returns name: File name of the partition.
+    '''
+
+    if granularity not in PARTITION_FORMATS:
+        raise Exception(f'Non-existant partition granularity specified: {granularity}')
+
+    return currency + hour.strftime(PARTITION_FORMATS[granularity]) + '.tsv'
+
+def _scan_partition(path: str) -> dict:
+    '''
+    Rebuild the index of a partition from its rows, for partitions whose index
+    is missing or does not match the file.
+
+    :params path: Path to the partition.
+    :returns index: Index of the partition.
+    '''
+
+    hours: dict = {}
+    with open(path, 'rb') as ins:
+        header: bytes = ins.readline()
+        offset: int = len(header)
+        for line in ins:
+            # Rows start with a timestamp, whose first 13 characters give the
+            # hour, e.g. '2018-10-01 03'.
+            key: str = datetime.strptime(line[:13].decode(), '%Y-%m-%d %H').isoformat()
+            start, length = hours.get(key, (offset, 0))
+            hours[key] = (start, length + len(line))
+            offset += len(line)
+
+    return {'header': header.decode(), 'size': offset, 'hours': hours}
+
+def load_partition_index(path: str) -> Optional[dict]:
+    '''
+    Load the index of a partition.
+
+    :params path: Path to the partition.
+    :returns index: Index with the header, file size and a map of ISO hour to
+                    (offset, length), or None if the partition does not exist.
+    '''
+
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path + INDEX_SUFFIX) as ins:
+            index: dict = json.load(ins)
+
+    except (FileNotFoundError, ValueError):
+        index = None
+
+    # A compaction interrupted between replacing the partition and its index
+    # leaves an index that does not match the file.
+    if index is None or index['size'] != os.path.getsize(path):
+        index = _scan_partition(path)
+
+    index['hours'] = {hour: tuple(span) for hour, span in index['hours'].items()}
+    return index
+
+def _write_partition(path: str, index: Optional[dict], new_hours: dict) -> int:
+    '''
+    Rewrite a partition with new hours merged in hour order, replacing the
+    partition and its index atomically.
+
+    :params path: Path to the partition.
+    :params index: Current index of the partition, or None for a new one.
+    :params new_hours: Map of hour to the hourly file to add.
+    :returns added: Number of hours added.
+    '''
+
+    spans: dict = dict(index['hours']) if index is not None else {}
+    header: Optional[str] = index['header'] if index is not None else None
+
+    # Every hour in a partition must share the same columns.
+    for hourly_file in new_hours.values():
+        with open(hourly_file) as ins:
+            file_header: str = ins.readline()
+
+        if header is None:
+            header = file_header
+
+        elif file_header != header:
+            raise Exception(f'Columns of {hourly_file} do not match partition {path}')
+
+    sources: dict = {hour.isoformat(): hourly_file for hour, hourly_file in new_hours.items()}
+
+    hours: dict = {}
+    partition = open(path, 'rb') if index is not None else None
+    try:
+        with open(path + '.tmp', 'wb') as outs:
+            outs.write(header.encode())
+            for hour in sorted(set(spans) | set(sources)):
+                if hour in spans:
+                    offset, length = spans[hour]
+                    partition.seek(offset)
+                    body: bytes = partition.read(length)
+
+                else:
+                    with open(sources[hour], 'rb') as ins:
+                        ins.readline()
+                        body = ins.read()
+
+                if body and not body.endswith(b'\n'):
+                    body += b'\n'
+
+                hours[hour] = (outs.tell(), len(body))
+                outs.write(body)
+
+            size: int = outs.tell()
+
+    finally:
+        if partition is not None:
+            partition.close()
+
+    with open(path + INDEX_SUFFIX + '.tmp', 'w') as outs:
+        json.dump({'header': header, 'size': size, 'hours': hours}, outs)
+
+    os.replace(path + '.tmp', path)
+    os.replace(path + INDEX_SUFFIX + '.tmp', path + INDEX_SUFFIX)
+
+    return len(hours) - len(spans)
+
+def _matches_partition(path: str, index: dict, hour: datetime, hourly_file: str) -> bool:
+    '''
+    Check that an hourly file holds the same rows as the copy of its hour in a
+    partition.
+
+    :params path: Path to the partition.
+    :params index: Index of the partition.
+    :params hour: Datetime of the hour.
+    :params hourly_file: Path to the hourly file.
+    :returns matches: True if the header and rows are identical.
+    '''
+
+    with open(hourly_file, 'rb') as ins:
+        file_header: bytes = ins.readline()
+        body: bytes = ins.read()
+
+    # Bodies are stored ending in a newline.
+    if body and not body.endswith(b'\n'):
+        body += b'\n'
+
+    offset, length = index['hours'][hour.isoformat()]
+    with open(path, 'rb') as ins:
+        ins.seek(offset)
+        stored: bytes = ins.read(length)
+
+    return file_header.decode() == index['header'] and body == stored
+
+def compact_tabular(opath: str, ppath: str, granularity: str = 'day', currency: Optional[str] = None,
+                    remove: bool = False) -> dict:
+    '''
+    Merge hourly files into partitions. Only hours missing from a partition
+    are added, and partitions without new hours are left untouched, so the
+    compaction can run repeatedly as new hours arrive.
+
+    :params opath: Output path the tabular processor wrote the hourly files to.
+    :params ppath: Output path for the partitions.
+    :params granularity: Partition granularity, 'day' or 'month'.
+    :params currency: Optional currency pair to compact. Defaults to all pairs.
+    :params remove: Remove hourly files once their hour is in the partition.
+                    Files of hours compacted by an earlier run are only
+                    removed if they match the partitioned copy.
+    :returns counts: Dictionary of partitions written, hours added and hourly
+                     files kept because they differ from their partitioned hour.
+    '''
+
+    # Group the hourly files by partition.
+    partitions: dict = {}
+    for entry in os.scandir(opath):
+        match = HOURLY_FILE_PATTERN.match(entry.name)
+        if match is None or (currency is not None and match.group(1) != currency):
+            continue
+
+        hour: datetime = datetime.strptime(match.group(2), '%Y%m%dT%H%M%S')
+        partitions.setdefault(partition_name(match.group(1), hour, granularity), {})[hour] = entry.path
+
+    counts: dict = {'partitions': 0, 'hours': 0, 'kept': 0}
+    for name, hourly_files in sorted(partitions.items()):
+        path: str = os.path.join(ppath, name)
+        index: Optional[dict] = load_partition_index(path)
+
+        # Hours already in the partition are never added twice.
+        new_hours: dict = {hour: hourly_file for hour, hourly_file in hourly_files.items() if index is None or hour.isoformat() not in index['hours']}
+        if new_hours:
+            counts['hours'] += _write_partition(path, index, new_hours)
+            counts['partitions'] += 1
+
+        if remove:
+            # An hour downloaded again after it was compacted is kept unless
+            # the partition already holds the same rows.
+            index = load_partition_index(path)
+            for hour, hourly_file in hourly_files.items():
+                if hour not in new_hours and not _matches_partition(path, index, hour, hourly_file):
+                    LOG.warning(f'Keeping {hourly_file}, it differs from the compacted hour in {path}')
+                    counts['kept'] += 1
+                    continue
+
+                os.remove(hourly_file)
+
+    return counts
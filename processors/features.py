@@ -0,0 +1,84 @@
+'''
+Derived per-tick features computed from processed tick data.
+
+Features are computed one hour at a time with the state of the rolling
+window carried from the previous hour of the same pair, so hours processed in
+order give the same features as the whole range processed at once.
+'''
+
+import numpy as np
+import pandas as pd
+
+from typing import Union
+
+# Columns added to processed tick data.
+FEATURE_COLUMNS: list = ['mid', 'spread', 'log_return', 'volatility']
+
+class FXTickDataFeatures():
+    '''
+    Stateful feature stage for the consecutive hours of a single pair.
+
+    Adds the mid price, the spread, the log return of the mid price since the
+    previous tick and the rolling standard deviation of log returns.
+    '''
+
+    def __init__(self, window: Union[int, str] = 100):
+        '''
+        :params window: Rolling volatility window, either a number of ticks or
+                        a pandas offset alias such as '5min'.
+        '''
+
+        self.window: Union[int, str] = window
+        self.reset()
+
+    def reset(self) -> None:
+        '''
+        Forget the carried state, e.g. after an hour of the pair is missing.
+        '''
+
+        self.last_log_mid: float = np.nan
+        self.tail_ts: np.ndarray = np.empty(0, dtype='datetime64[ns]')
+        self.tail_returns: np.ndarray = np.empty(0)
+
+    def compute(self, data: pd.DataFrame) -> pd.DataFrame:
+        '''
+        Compute the features of the next hour of the pair.
+
+        :params data: DataFrame containing processed tick data.
+        :returns data: Copy of the data with the feature columns added.
+        '''
+
+        ask: np.ndarray = data['ask'].to_numpy(dtype='float64')
+        bid: np.ndarray = data['bid'].to_numpy(dtype='float64')
+        ts: np.ndarray = data['ts'].to_numpy().astype('datetime64[ns]')
+
+        mid: np.ndarray = (ask + bid) / 2
+        log_mid: np.ndarray = np.log(mid)
+        log_return: np.ndarray = np.diff(log_mid, prepend=self.last_log_mid)
+
+        # Roll over the carried tail of the previous hour followed by this
+        # hour, then drop the tail again.
+        returns: np.ndarray = np.concatenate([self.tail_returns, log_return])
+        returns_ts: np.ndarray = np.concatenate([self.tail_ts, ts])
+        if isinstance(self.window, str):
+            rolling = pd.Series(returns, index=pd.DatetimeIndex(returns_ts)).rolling(self.window)
+
+        else:
+            rolling = pd.Series(returns).rolling(self.window)
+
+        volatility: np.ndarray = rolling.std().to_numpy()[len(self.tail_returns):]
+
+        # Keep only what the windows of the next hour can reach.
+        if len(returns):
+            if isinstance(self.window, str):
+                keep: int = np.searchsorted(returns_ts, returns_ts[-1] - pd.Timedelta(self.window).to_timedelta64(), side='right')
+
+            else:
+                keep = max(len(returns) - self.window + 1, 0)
+
+            self.tail_ts, self.tail_returns = returns_ts[keep:], returns[keep:]
+
+        if len(log_mid):
+            self.last_log_mid = log_mid[-1]
+
+        return data.assign(mid=mid, spread=ask - bid, log_return=log_return, volatility=volatility)
@@ -0,0 +1,223 @@
+'''
+Align the ticks of several pairs on one clock with as-of joins.
+'''
+
+import numpy as np
+import pandas as pd
+
+from typing import Generator, Optional
+
+from datetime import datetime, timedelta
+
+from processors.readers import FXTickDataTabularReader
+
+# Bounds of nanosecond timestamps, used before a stream is read and once
+# every stream is exhausted.
+_START_OF_TIME: int = np.iinfo(np.int64).min
+_END_OF_TIME: int = np.iinfo(np.int64).max
+
+class FXTickDataPanelBuilder():
+    '''
+    Build a panel holding, at each point of a clock, the last quote of every
+    pair at or before that point. The clock is either every tick of any pair,
+    or a fixed interval.
+
+    Streams are consumed chunk by chunk. A point is only emitted once every
+    pair has been read past it, and a pair only keeps the ticks not emitted yet
+    plus its last known quote, so memory is bounded by the chunk sizes rather
+    than by the length of the range.
+    '''
+
+    def __init__(self, streams: dict, columns: Optional[list] = None, freq: Optional[str] = None,
+                 start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, chunk_size: int = 100000):
+        '''
+        :params streams: Map of currency pair to an iterable of time ordered
+                         DataFrames with a timestamp column.
+        :params columns: Columns aligned per pair. Defaults to bid and ask.
+        :params freq: Optional pandas offset alias of a fixed interval clock.
+                      Defaults to a clock of every tick.
+        :params start_date: Optional first point of the clock. Earlier ticks
+                            only provide the quotes carried into it.
+        :params end_date: Optional end of the clock, not inclusive.
+        :params chunk_size: Maximum number of points per emitted panel chunk.
+        '''
+
+        self.columns: list = list(columns) if columns is not None else ['bid', 'ask']
+        self.step: Optional[int] = pd.Timedelta(freq).value if freq is not None else None
+        self.start: Optional[int] = pd.Timestamp(start_date).value if start_date is not None else None
+        self.end: Optional[int] = pd.Timestamp(end_date).value if end_date is not None else None
+        self.chunk_size: int = chunk_size
+
+        self.pairs: list = list(streams)
+        self.streams: dict = {pair: iter(stream) for pair, stream in streams.items()}
+
+    @classmethod
+    def from_reader(cls, reader: FXTickDataTabularReader, pairs: list, start_date: datetime, end_date: datetime,
+                    columns: Optional[list] = None, lookback: timedelta = timedelta(0), **kwargs) -> 'FXTickDataPanelBuilder':
+        '''
+        Build a panel over a time range of tabular outputs.
+
+        :params reader: Reader of the tabular outputs.
+        :params pairs: Currency pairs of the panel.
+        :params start_date: First point of the clock.
+        :params end_date: End of the clock, not inclusive.
+        :params columns: Columns aligned per pair. Defaults to bid and ask.
+        :params lookback: How far before the range to read quotes carried into
+                          its first points.
+        :returns builder: Panel builder over the range.
+        '''
+
+        columns = list(columns) if columns is not None else ['bid', 'ask']
+        streams: dict = {pair: reader.iter_chunks(pair, start_date - lookback, end_date, columns) for pair in pairs}
+
+        return cls(streams, columns, start_date=start_date, end_date=end_date, **kwargs)
+
+    def _pull(self, pair: str, state: dict) -> None:
+        '''
+        Append the next chunk of a pair to its buffer, or mark it exhausted.
+
+        :params pair: Currency pair to read.
+        :params state: Buffer, carried quote and exhaustion of the pair.
+        '''
+
+        try:
+            chunk: pd.DataFrame = next(self.streams[pair])
+
+        except StopIteration:
+            state['done'] = True
+            return
+
+        ts: np.ndarray = chunk['ts'].to_numpy().astype('datetime64[ns]').view('int64')
+        state['ts'] = np.concatenate([state['ts'], ts])
+        state['values'] = np.concatenate([state['values'], chunk[self.columns].to_numpy(dtype='float64')])
+
+    def _points(self, lo: Optional[int], hi: int, states: dict) -> Generator[np.ndarray, None, None]:
+        '''
+        Generate the clock points in [lo, hi) in slices of at most chunk_size.
+
+        :params lo: First time that may be emitted, or None before the first
+                    emission.
+        :params hi: Horizon, not inclusive.
+        :params states: Buffers of every pair.
+        :returns points: Generator of arrays of nanosecond timestamps.
+        '''
+
+        if self.step is None:
+            points: np.ndarray = np.unique(np.concatenate([state['ts'] for state in states.values()]))
+            points = points[points < hi]
+            if lo is not None:
+                points = points[points >= lo]
+
+            for offset in range(0, len(points), self.chunk_size):
+                yield points[offset:offset + self.chunk_size]
+
+            return
+
+        # The fixed clock starts from the first tick of any pair unless a start
+        # is given.
+        if lo is None:
+            firsts: list = [state['ts'][0] for state in states.values() if len(state['ts'])]
+            if not firsts:
+                return
+
+            lo = min(firsts) // self.step * self.step
+
+        while lo < hi:
+            count: int = min(self.chunk_size, -(-(hi - lo) // self.step))
+            yield lo + self.step * np.arange(count, dtype='int64')
+            lo += self.step * count
+
+    def _align(self, points: np.ndarray, states: dict) -> pd.DataFrame:
+        '''
+        Look up the last quote of every pair at or before each point.
+
+        :params points: Array of nanosecond timestamps.
+        :params states: Buffers and carried quotes of every pair.
+        :returns panel: DataFrame of the points and the quotes of every pair.
+        '''
+
+        panel: dict = {'ts': pd.to_datetime(points.view('datetime64[ns]'))}
+        for pair in self.pairs:
+            state: dict = states[pair]
+            if len(state['ts']):
+                index: np.ndarray = np.searchsorted(state['ts'], points, side='right') - 1
+
+                # Points before the first buffered tick take the carried quote.
+                values: np.ndarray = np.where((index >= 0)[:, None], state['values'][np.maximum(index, 0)], state['carry'])
+
+            else:
+                values = np.broadcast_to(state['carry'], (len(points), len(self.columns)))
+
+            for position, column in enumerate(self.columns):
+                panel[f'{pair}_{column}'] = values[:, position]
+
+        return pd.DataFrame(panel)
+
+    def iter_chunks(self) -> Generator[pd.DataFrame, None, None]:
+        '''
+        Lazily build the panel as DataFrames of at most chunk_size points.
+
+        :returns chunks: Generator of DataFrames with a timestamp column and a
+                         column per pair and aligned column.
+        '''
+
+        width: int = len(self.columns)
+        states: dict = {pair: {
+            'ts'        : np.empty(0, dtype='int64'),
+            'values'    : np.empty((0, width)),
+            'carry'     : np.full(width, np.nan),
+            'done'      : False
+        } for pair in self.pairs}
+
+        lo: Optional[int] = self.start
+        while True:
+            # Read from the pair whose buffer ends first, as it bounds how far
+            # the panel can be emitted.
+            active: list = [pair for pair in self.pairs if not states[pair]['done']]
+            if active:
+                limiting: str = min(active, key=lambda pair: states[pair]['ts'][-1] if len(states[pair]['ts']) else _START_OF_TIME)
+                self._pull(limiting, states[limiting])
+                active = [pair for pair in self.pairs if not states[pair]['done']]
+
+            if any(not len(states[pair]['ts']) for pair in active):
+                continue
+
+            # Later ticks of an active pair may share the time of its last
+            # buffered tick, so the horizon itself is never emitted.
+            hi: int = min((states[pair]['ts'][-1] for pair in active), default=_END_OF_TIME)
+            if not active and self.step is not None and self.end is None:
+                hi = max((state['ts'][-1] + 1 for state in states.values() if len(state['ts'])), default=lo or 0)
+
+            if self.end is not None:
+                hi = min(hi, self.end)
+
+            for points in self._points(lo, hi, states):
+                yield self._align(points, states)
+                lo = int(points[-1]) + (self.step or 1)
+
+            # Keep only the ticks after the emitted points, carrying the last
+            # quote of each pair forward.
+            if lo is not None:
+                for state in states.values():
+                    keep: int = np.searchsorted(state['ts'], lo, side='left')
+                    if keep:
+                        state['carry'] = state['values'][keep - 1]
+                        state['ts'] = state['ts'][keep:]
+                        state['values'] = state['values'][keep:]
+
+            if not active or (self.end is not None and lo is not None and lo >= self.end):
+                return
+
+    def build(self) -> pd.DataFrame:
+        '''
+        Build the whole panel into a single DataFrame.
+
+        :returns panel: DataFrame with a timestamp column and a column per pair
+                        and aligned column.
+        '''
+
+        chunks: list = list(self.iter_chunks())
+        if not chunks:
+            return pd.DataFrame(columns=['ts'] + [f'{pair}_{column}' for pair in self.pairs for column in self.columns])
+
+        return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,231 @@
+'''
+Read tick level data back from the outputs written by the processors.
+'''
+
+import io
+import os
+
+import pandas as pd
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, Optional
+
+from datetime import datetime, timedelta
+
+from processors.compaction import PARTITION_FORMATS, load_partition_index, partition_name
+from processors.features import FEATURE_COLUMNS
+
+# Columns of the hourly files written by FXTickDataProcessorTabular.
+TABULAR_COLUMNS: list = ['ts', 'ask', 'bid', 'ask_volume', 'bid_volume']
+
+class FXTickDataTabularReader():
+    '''
+    Read a time range of one pair from the hourly files in a tabular output
+    directory.
+
+    Files are found from the hour encoded in their names, so only the files
+    overlapping the range are touched and the cost of a read grows with the
+    range rather than with the size of the directory.
+
+    Hours compacted into daily or monthly partitions are read from the
+    partitions, one seek and one read per run of consecutive hours. Hours with
+    an hourly file are always read from the file.
+    '''
+
+    def __init__(self, opath: str, sep: str = '\t', max_workers: int = 4, partition_path: Optional[str] = None):
+        '''
+        :params opath: Output path the tabular processor wrote to.
+        :params sep: Delimiter between each item.
+        :params max_workers: Number of files read concurrently.
+        :params partition_path: Optional output path of the compaction.
+        '''
+
+        self.opath: str = opath
+        self.sep: str = sep
+        self.max_workers: int = max_workers
+        self.partition_path: Optional[str] = partition_path
+
+    def hourly_files(self, currency: str, start_date: datetime, end_date: datetime) -> list:
+        '''
+        Find the hourly files overlapping a time range.
+
+        :params currency: String identifying currency pair.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :returns files: Ordered list of (hour, path) tuples.
+        '''
+
+        files: list = []
+        hour: datetime = start_date.replace(minute=0, second=0, microsecond=0)
+        while hour < end_date:
+            path: str = os.path.join(self.opath, currency + hour.strftime('%Y%m%dT%H%M%S') + '.tsv')
+            if os.path.exists(path):
+                files.append((hour, path))
+
+            hour += timedelta(hours=1)
+
+        return files
+
+    def partitions(self, currency: str, start_date: datetime, end_date: datetime) -> list:
+        '''
+        Find the partitions overlapping a time range.
+
+        :params currency: String identifying currency pair.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :returns partitions: List of (path, index) tuples.
+        '''
+
+        if self.partition_path is None:
+            return []
+
+        names: list = []
+        hour: datetime = start_date.replace(minute=0, second=0, microsecond=0)
+        while hour < end_date:
+            for granularity in PARTITION_FORMATS:
+                name: str = partition_name(currency, hour, granularity)
+                if name not in names:
+                    names.append(name)
+
+            hour += timedelta(hours=1)
+
+        partitions: list = []
+        for name in names:
+            path: str = os.path.join(self.partition_path, name)
+            index: Optional[dict] = load_partition_index(path)
+            if index is not None:
+                partitions.append((path, index))
+
+        return partitions
+
+    def sources(self, currency: str, start_date: datetime, end_date: datetime) -> list:
+        '''
+        Plan the reads of a time range from hourly files and partitions.
+        Consecutive partitioned hours stored next to each other are merged into
+        a single read.
+
+        :params currency: String identifying currency pair.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :returns sources: Ordered list of (first hour, last hour, path, header,
+                          offset, length) tuples. Hourly files have no header
+                          and are read whole.
+        '''
+
+        hours: dict = {hour: (path, None, None, None) for hour, path in self.hourly_files(currency, start_date, end_date)}
+
+        first_hour: datetime = start_date.replace(minute=0, second=0, microsecond=0)
+        for path, index in self.partitions(currency, start_date, end_date):
+            for key, (offset, length) in index['hours'].items():
+                hour: datetime = datetime.fromisoformat(key)
+                if first_hour <= hour < end_date and hour not in hours:
+                    hours[hour] = (path, index['header'], offset, length)
+
+        sources: list = []
+        for hour, (path, header, offset, length) in sorted(hours.items()):
+            if sources and header is not None:
+                last: tuple = sources[-1]
+                if last[2] == path and last[4] + last[5] == offset:
+                    sources[-1] = (last[0], hour, path, header, last[4], last[5] + length)
+                    continue
+
+            sources.append((hour, hour, path, header, offset, length))
+
+        return sources
+
+    def _read_source(self, source: tuple, start_date: datetime, end_date: datetime, columns: list) -> pd.DataFrame:
+        '''
+        Read the requested columns of an hourly file or a run of partitioned
+        hours.
+
+        :params source: Source tuple planned by sources.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :params columns: Columns to read. The timestamp is always read.
+        :returns data: DataFrame of the ticks in the range.
+        '''
+
+        first_hour, last_hour, path, header, offset, length = source
+        if header is None:
+            data: pd.DataFrame = pd.read_csv(path, sep=self.sep, usecols=columns)[columns]
+
+        else:
+            with open(path, 'rb') as ins:
+                ins.seek(offset)
+                body: bytes = ins.read(length)
+
+            data = pd.read_csv(io.BytesIO(header.encode() + body), sep=self.sep, usecols=columns)[columns]
+
+        data['ts'] = pd.to_datetime(data['ts'])
+
+        # Only the sources at either end of the range need to be trimmed.
+        if first_hour < start_date or last_hour + timedelta(hours=1) > end_date:
+            data = data[(data['ts'] >= start_date) & (data['ts'] < end_date)]
+
+        return data
+
+    def _columns(self, columns: Optional[list]) -> list:
+        '''
+        Validate the requested columns.
+
+        :params columns: Requested columns, or None for every tick column.
+                         Feature columns must be requested explicitly.
+        :returns columns: Columns to read, starting with the timestamp.
+        '''
+
+        if columns is None:
+            return list(TABULAR_COLUMNS)
+
+        unknown: list = [column for column in columns if column not in TABULAR_COLUMNS + FEATURE_COLUMNS]
+        if unknown:
+            raise Exception(f'Non-existant columns specified: {unknown}')
+
+        return ['ts'] + [column for column in columns if column != 'ts']
+
+    def iter_chunks(self, currency: str, start_date: datetime, end_date: datetime,
+                    columns: Optional[list] = None) -> Generator[pd.DataFrame, None, None]:
+        '''
+        Lazily read a time range as one DataFrame per hourly file or run of
+        partitioned hours, in order. Sources are read concurrently a bounded
+        number of reads ahead.
+
+        :params currency: String identifying currency pair.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :params columns: Optional list of columns to read. The timestamp is
+                         always included.
+        :returns chunks: Generator of DataFrames.
+        '''
+
+        columns = self._columns(columns)
+        sources: list = self.sources(currency, start_date, end_date)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: deque = deque()
+            for source in sources:
+                pending.append(executor.submit(self._read_source, source, start_date, end_date, columns))
+                if len(pending) >= 2 * self.max_workers:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+    def read(self, currency: str, start_date: datetime, end_date: datetime,
+             columns: Optional[list] = None) -> pd.DataFrame:
+        '''
+        Read a time range into a single DataFrame.
+
+        :params currency: String identifying currency pair.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :params columns: Optional list of columns to read. The timestamp is
+                         always included.
+        :returns data: DataFrame of the ticks in the range, ordered by time.
+        '''
+
+        chunks: list = list(self.iter_chunks(currency, start_date, end_date, columns))
+        if not chunks:
+            return pd.DataFrame(columns=self._columns(columns))
+
+        return pd.concat(chunks, ignore_index=True)
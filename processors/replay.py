@@ -0,0 +1,353 @@
+'''
+Replay the ticks of many pairs as one time ordered stream.
+
+Each pair is read from its own time ordered source, one chunk at a time, and
+the sources are combined with a lazy k-way merge over a heap keyed by the
+next timestamp of every source. Rows are copied out in runs: the source with
+the earliest timestamp emits every row up to the next timestamp of any other
+source, so the merge never sorts and only holds one chunk per source plus a
+bounded read-ahead.
+'''
+
+import heapq
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from queue import Empty, Full, Queue
+from typing import Generator, Iterable, Optional
+
+from datetime import datetime, timedelta
+
+from network.parser import FXTickDataParser
+from processors.readers import FXTickDataTabularReader
+from processors.ticks import FXTickDataBatchProcessor
+
+# Seconds between checks for a stopped replay while a queue is full or empty.
+_POLL_SECONDS: float = 0.1
+
+def bi5_path(root: str, currency: str, hour: datetime) -> str:
+    '''
+    Path of a raw hour in a local mirror of the data feed, which uses the
+    feed's layout with zero based months.
+
+    :params root: Root directory of the mirror.
+    :params currency: String identifying currency pair.
+    :params hour: Datetime of the hour.
+    :returns path: Path to the hour's bi5 file.
+    '''
+
+    return os.path.join(root, currency, str(hour.year), f'{hour.month - 1:02d}', f'{hour.day:02d}', f'{hour.hour:02d}h_ticks.bi5')
+
+def bi5_chunks(root: str, currency: str, start_date: datetime, end_date: datetime) -> Generator[pd.DataFrame, None, None]:
+    '''
+    Read a time range of raw hours from a local mirror, one processed day
+    at a time. The hours of a day are processed in a single batch and missing
+    hours are skipped.
+
+    :params root: Root directory of the mirror.
+    :params currency: String identifying currency pair.
+    :params start_date: Starting time of the range.
+    :params end_date: Ending time of the range, not inclusive.
+    :returns chunks: Generator of DataFrames containing processed tick data.
+    '''
+
+    tick_data_parser = FXTickDataParser()
+    tick_data_processor = FXTickDataBatchProcessor()
+    hour: datetime = start_date.replace(minute=0, second=0, microsecond=0)
+    while hour < end_date:
+        day_end: datetime = min(hour.replace(hour=0) + timedelta(days=1), end_date)
+
+        hours: list = []
+        while hour < day_end:
+            path: str = bi5_path(root, currency, hour)
+            if os.path.exists(path):
+                with open(path, 'rb') as ins:
+                    hours.append((currency, hour, tick_data_parser.parse_array(ins.read())))
+
+            hour += timedelta(hours=1)
+
+        if hours:
+            data, _ = tick_data_processor.process(hours)
+            yield data[(data['ts'] >= start_date) & (data['ts'] < end_date)]
+
+def sqlite_chunks(db: str, table: str, currency: str, start_date: datetime, end_date: datetime,
+                  chunk_size: int = 100000) -> Generator[pd.DataFrame, None, None]:
+    '''
+    Read a time range of one pair from a SQLite table written by the sqlite
+    pipeline, in chunks ordered by time.
+
+    :params db: Local DB name.
+    :params table: Table where data is stored.
+    :params currency: String identifying currency pair.
+    :params start_date: Starting time of the range.
+    :params end_date: Ending time of the range, not inclusive.
+    :params chunk_size: Number of rows per chunk.
+    :returns chunks: Generator of DataFrames containing processed tick data.
+    '''
+
+    # Timestamps are stored as ISO text, which sorts and compares in time order.
+    query: str = f'SELECT ts, ask, bid, ask_volume, bid_volume FROM {table} WHERE pair = ? AND ts >= ? AND ts < ? ORDER BY ts'
+    conn = sqlite3.connect(db)
+    try:
+        params: tuple = (currency, start_date.strftime('%Y-%m-%d %H:%M:%S'), end_date.strftime('%Y-%m-%d %H:%M:%S'))
+        for data in pd.read_sql_query(query, conn, params=params, chunksize=chunk_size):
+            # Whole seconds are stored without a fraction, so pad them to a
+            # single exact format.
+            ts: pd.Series = data['ts'].where(data['ts'].str.len() > 19, data['ts'] + '.000000')
+            data['ts'] = pd.to_datetime(ts, format='%Y-%m-%d %H:%M:%S.%f')
+            yield data
+
+    finally:
+        conn.close()
+
+def read_ahead(chunks: Iterable, depth: int) -> Generator[pd.DataFrame, None, None]:
+    '''
+    Read chunks in a background thread, holding at most depth chunks that
+    have not been consumed yet.
+
+    :params chunks: Iterable of chunks.
+    :params depth: Maximum number of chunks read ahead.
+    :returns chunks: Generator of the same chunks, in order.
+    '''
+
+    queue: Queue = Queue(maxsize=depth)
+    stopped = threading.Event()
+    finished = object()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=_POLL_SECONDS)
+                return True
+
+            except Full:
+                continue
+
+        return False
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+
+        except Exception as e:
+            put(e)
+            return
+
+        put(finished)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                item = queue.get(timeout=_POLL_SECONDS)
+
+            except Empty:
+                if not thread.is_alive() and queue.empty():
+                    return
+
+                continue
+
+            if item is finished:
+                return
+
+            if isinstance(item, Exception):
+                raise item
+
+            yield item
+
+    finally:
+        # Release the producer if the replay is abandoned early.
+        stopped.set()
+
+class FXTickDataReplay():
+    '''
+    Merge time ordered sources of several pairs into batches of ticks in
+    global time order.
+
+    Ticks sharing a timestamp are ordered by the order the pairs were given.
+    '''
+
+    def __init__(self, sources: dict, columns: Optional[list] = None, batch_size: int = 100000, depth: int = 2):
+        '''
+        :params sources: Map of currency pair to an iterable of time ordered
+                         DataFrames with a timestamp column.
+        :params columns: Columns replayed per tick. Defaults to bid and ask
+                         prices and volumes.
+        :params batch_size: Number of ticks per batch.
+        :params depth: Chunks read ahead per source in a background thread.
+                       Zero reads each source in the consuming thread.
+        '''
+
+        self.sources: dict = sources
+        self.columns: list = list(columns) if columns is not None else ['ask', 'bid', 'ask_volume', 'bid_volume']
+        self.batch_size: int = batch_size
+        self.depth: int = depth
+
+    @classmethod
+    def from_tabular(cls, reader: FXTickDataTabularReader, pairs: list, start_date: datetime, end_date: datetime,
+                     columns: Optional[list] = None, **kwargs) -> 'FXTickDataReplay':
+        '''
+        Replay a time range of tabular outputs.
+
+        :params reader: Reader of the tabular outputs.
+        :params pairs: Currency pairs to replay.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :params columns: Columns replayed per tick.
+        :returns replay: Replay over the range.
+        '''
+
+        sources: dict = {pair: reader.iter_chunks(pair, start_date, end_date, columns) for pair in pairs}
+        return cls(sources, [column for column in columns if column != 'ts'] if columns else None, **kwargs)
+
+    @classmethod
+    def from_sqlite(cls, db: str, table: str, pairs: list, start_date: datetime, end_date: datetime,
+                    **kwargs) -> 'FXTickDataReplay':
+        '''
+        Replay a time range of a SQLite table written by the sqlite pipeline.
+
+        :params db: Local DB name.
+        :params table: Table where data is stored.
+        :params pairs: Currency pairs to replay.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :returns replay: Replay over the range.
+        '''
+
+        return cls({pair: sqlite_chunks(db, table, pair, start_date, end_date) for pair in pairs}, **kwargs)
+
+    @classmethod
+    def from_bi5(cls, root: str, pairs: list, start_date: datetime, end_date: datetime, **kwargs) -> 'FXTickDataReplay':
+        '''
+        Replay a time range of raw hours from a local mirror of the data feed.
+
+        :params root: Root directory of the mirror.
+        :params pairs: Currency pairs to replay.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :returns replay: Replay over the range.
+        '''
+
+        return cls({pair: bi5_chunks(root, pair, start_date, end_date) for pair in pairs}, **kwargs)
+
+    def _next_chunk(self, chunks: Iterable) -> Optional[tuple]:
+        '''
+        Read the next non-empty chunk of a source.
+
+        :params chunks: Iterator of a source's chunks.
+        :returns chunk: Tuple of nanosecond timestamps and values, or None
+                        once the source is exhausted.
+        '''
+
+        for data in chunks:
+            if len(data):
+                ts: np.ndarray = data['ts'].to_numpy().astype('datetime64[ns]').view('int64')
+                return ts, data[self.columns].to_numpy(dtype='float64')
+
+        return None
+
+    def _batch(self, sources: list, lengths: list, segments: list, pairs: list) -> pd.DataFrame:
+        '''
+        Build a batch from the runs copied out of the sources. Each source's
+        rows are consumed in order, so they fill the positions of its runs in
+        the batch in order.
+
+        :params sources: Source index of every run.
+        :params lengths: Number of rows of every run.
+        :params segments: Per source list of (timestamps, values, start, stop)
+                          slices consumed for the batch.
+        :params pairs: Currency pairs, by source index.
+        :returns batch: DataFrame of the ticks in time order.
+        '''
+
+        codes: np.ndarray = np.repeat(np.array(sources, dtype='int32'), lengths)
+        ts: np.ndarray = np.empty(len(codes), dtype='int64')
+        values: np.ndarray = np.empty((len(codes), len(self.columns)))
+        for index, slices in enumerate(segments):
+            if slices:
+                rows: np.ndarray = codes == index
+                ts[rows] = np.concatenate([chunk_ts[start:stop] for chunk_ts, chunk_values, start, stop in slices])
+                values[rows] = np.concatenate([chunk_values[start:stop] for chunk_ts, chunk_values, start, stop in slices])
+
+        batch: dict = {'ts': pd.to_datetime(ts.view('datetime64[ns]')), 'pair': pd.Categorical.from_codes(codes, categories=pairs)}
+        for position, column in enumerate(self.columns):
+            batch[column] = values[:, position]
+
+        return pd.DataFrame(batch)
+
+    def __iter__(self) -> Generator[pd.DataFrame, None, None]:
+        '''
+        Lazily replay the sources as batches of at most batch_size ticks.
+
+        :returns batches: Generator of DataFrames with a timestamp, a pair and
+                          the replayed columns, in time order.
+        '''
+
+        pairs: list = list(self.sources)
+        iterators: list = [iter(read_ahead(self.sources[pair], self.depth) if self.depth else self.sources[pair]) for pair in pairs]
+
+        # Current chunk and read position of every source, and a heap of the
+        # next timestamp of every source that is not exhausted.
+        chunks: list = [self._next_chunk(chunks) for chunks in iterators]
+        positions: list = [0] * len(pairs)
+        heap: list = [(chunk[0][0], index) for index, chunk in enumerate(chunks) if chunk is not None]
+        heapq.heapify(heap)
+
+        # Runs of the current batch, and the rows each source consumed for it
+        # starting from marks in the current chunks.
+        sources: list = []
+        lengths: list = []
+        segments: list = [[] for pair in pairs]
+        marks: list = [0] * len(pairs)
+        pending: int = 0
+        try:
+            while heap:
+                head, index = heapq.heappop(heap)
+                ts, values = chunks[index]
+                position: int = positions[index]
+
+                # Copy out every row before the next timestamp of any other
+                # source. Rows tied with it are copied too if this source
+                # comes first. Earlier rows of the chunk are never past the
+                # bound, so the whole chunk can be searched.
+                if heap:
+                    bound, other = heap[0]
+                    stop: int = int(ts.searchsorted(bound, 'right' if index < other else 'left'))
+
+                else:
+                    stop = len(ts)
+
+                stop = min(stop, position + self.batch_size - pending)
+                sources.append(index)
+                lengths.append(stop - position)
+                pending += stop - position
+
+                if stop == len(ts):
+                    segments[index].append((ts, values, marks[index], stop))
+                    chunks[index] = self._next_chunk(iterators[index])
+                    marks[index] = stop = 0
+
+                positions[index] = stop
+                if chunks[index] is not None:
+                    heapq.heappush(heap, (chunks[index][0][stop], index))
+
+                if pending >= self.batch_size or not heap:
+                    for source, chunk in enumerate(chunks):
+                        if chunk is not None and positions[source] > marks[source]:
+                            segments[source].append((chunk[0], chunk[1], marks[source], positions[source]))
+                            marks[source] = positions[source]
+
+                    yield self._batch(sources, lengths, segments, pairs)
+                    sources, lengths, segments, pending = [], [], [[] for pair in pairs], 0
+
+        finally:
+            for iterator in iterators:
+                if hasattr(iterator, 'close'):
+                    iterator.close()
@@ -5,6 +5,8 @@ Tools used to resample data from tick level to lower resolution data.
 import numpy as np
 import pandas as pd
 
+from processors.ticks import FXTickDataProcessorSQLite
+
 class FXTickDataResampler():
     '''
     Basic toolbox for resampling tick data.
@@ -12,3 +14,43 @@ class FXTickDataResampler():
 
     def __init__(self, data: pd.DataFrame):
         self.data = data
+
+    def resample(self, rule: str = '1min') -> pd.DataFrame:
+        '''
+        Resample tick data into bars holding the last quote and the total
+        volume of each interval. Intervals without ticks are dropped.
+
+        :params rule: Pandas offset alias for the bar interval.
+        :returns bars: DataFrame with the same columns as the tick data.
+        '''
+
+        bars: pd.DataFrame = self.data.set_index('ts').resample(rule).agg({
+            'ask'           : 'last',
+            'bid'           : 'last',
+            'ask_volume'    : 'sum',
+            'bid_volume'    : 'sum'
+        })
+
+        return bars.dropna(subset=['ask', 'bid']).reset_index()
+
+class FXTickDataProcessorBars(FXTickDataProcessorSQLite):
+    '''
+    Resample processed tick data into one minute bars and write them into a
+    SQLite database.
+
+    NOTE: This presupposes the existing of local SQLite DB.
+    '''
+
+    # Bar interval written to the database.
+    BAR_RULE: str = '1min'
+
+    def write(self, data: pd.DataFrame, db: str, table: str) -> None:
+        '''
+        Resample data and write the bars into specified DB and table.
+
+        :params data: DataFrame containing processed tick data.
+        :params db: Local DB name.
+        :params table: Table where bars will be stored.
+        '''
+
+        super().write(FXTickDataResampler(data).resample(self.BAR_RULE), db, table)
@@ -3,13 +3,18 @@ Process and write tick level data from parsed API response data.
 '''
 
 import os
+import re
 import sqlite3
 
 import numpy as np
 import pandas as pd
 
+from typing import Optional
+
 from datetime import datetime
 
+from utils.instruments import CURRENCY_FACTOR_MAP
+
 
 class FXTickDataProcessor():
     '''
@@ -25,10 +30,7 @@ class FXTickDataProcessor():
         self.request_date: datetime = request_date
 
         # This map provides a lookup of known values.
-        self.CURRENCY_FACTOR_MAP: dict = {
-            'GBPUSD'    : 1e5,
-            'EURUSD'    : 1e5
-        }
+        self.CURRENCY_FACTOR_MAP: dict = CURRENCY_FACTOR_MAP
         self.VOLUME_FACTOR: int = 1000000
 
     def process(self, daily_tick_data: list) -> pd.DataFrame:
@@ -59,6 +61,62 @@ class FXTickDataProcessor():
         # Reorder columns.
         return data[['ts', 'ask', 'bid', 'ask_volume', 'bid_volume']]
 
+class FXTickDataBatchProcessor():
+    '''
+    Process the ticks of many hours, of one or several pairs, in a single
+    vectorized call, so the fixed cost of building a DataFrame is paid once
+    per batch instead of once per hour.
+    '''
+
+    def __init__(self):
+        '''
+        Set scaling factors for the data returned from the API.
+        '''
+
+        self.CURRENCY_FACTOR_MAP: dict = CURRENCY_FACTOR_MAP
+        self.VOLUME_FACTOR: int = 1000000
+
+    def process(self, hours: list) -> tuple:
+        '''
+        Process decoded hours into one DataFrame with the same columns and
+        values as FXTickDataProcessor gives for each hour.
+
+        :params hours: List of (currency, request_date, records) tuples, where
+                       records is a structured array from
+                       FXTickDataParser.parse_array.
+        :returns data: Post-processed tick data of every hour, concatenated in
+                       the order given.
+        :returns boundaries: Array of len(hours) + 1 row offsets. The rows of
+                             hour i are data.iloc[boundaries[i]:boundaries[i + 1]].
+        '''
+
+        currencies: list = [currency for currency, _, _ in hours]
+        counts: np.ndarray = np.array([len(records) for _, _, records in hours], dtype='int64')
+        boundaries: np.ndarray = np.concatenate([[0], np.cumsum(counts)])
+
+        records: np.ndarray = np.concatenate([records for _, _, records in hours]) if hours else np.empty(0)
+        if not len(records):
+            return pd.DataFrame(columns=['ts', 'ask', 'bid', 'ask_volume', 'bid_volume']), boundaries
+
+        # Repeat the base of each hour across its rows and add the offsets.
+        bases: np.ndarray = np.array([request_date for _, request_date, _ in hours], dtype='datetime64[ms]')
+        ts: np.ndarray = np.repeat(bases, counts) + records['ms'].astype('timedelta64[ms]')
+
+        # Look up the factor of each pair once, then index it per row.
+        pairs, codes = np.unique(currencies, return_inverse=True)
+        factors: np.ndarray = np.array([self.CURRENCY_FACTOR_MAP[pair] for pair in pairs])
+        row_factors: np.ndarray = np.repeat(factors[codes], counts)
+
+        data: pd.DataFrame = pd.DataFrame({
+            'ts'            : ts.astype('datetime64[ns]'),
+            'ask'           : records['ask'].astype('float64') / row_factors,
+            'bid'           : records['bid'].astype('float64') / row_factors,
+            'ask_volume'    : np.round(records['ask_volume'].astype('float64') * self.VOLUME_FACTOR),
+            'bid_volume'    : np.round(records['bid_volume'].astype('float64') * self.VOLUME_FACTOR)
+        })
+
+        return data, boundaries
+
 class FXTickDataProcessorTabular(FXTickDataProcessor):
     '''
     Write data after processing into delimited, tabular format.
@@ -76,6 +134,32 @@ class FXTickDataProcessorTabular(FXTickDataProcessor):
         outs: str = os.path.join(opath, self.currency + self.request_date.strftime('%Y%m%dT%H%M%S'))
         data.to_csv(outs + '.tsv', sep=sep, index=False)
 
+    @classmethod
+    def latest_hour(cls, currency: str, opath: str, sep='\t') -> Optional[datetime]:
+        '''
+        Find the newest hour already written for a pair from the file names in
+        the output path.
+
+        :params currency: String identifying currency pair.
+        :params opath: Output path for writes.
+        :params sep: Delimiter between each item. Unused, accepted to mirror write.
+        :returns latest: Datetime of the newest stored hour, or None.
+        '''
+
+        pattern = re.compile(re.escape(currency) + r'(\d{8}T\d{6})\.tsv$')
+
+        latest: Optional[datetime] = None
+        for entry in os.scandir(opath):
+            match = pattern.match(entry.name)
+            if match is None:
+                continue
+
+            request_date: datetime = datetime.strptime(match.group(1), '%Y%m%dT%H%M%S')
+            if latest is None or request_date > latest:
+                latest = request_date
+
+        return latest
+
 class FXTickDataProcessorSQLite(FXTickDataProcessor):
     '''
     Write data after processing into a SQLite database.
@@ -91,11 +175,34 @@ class FXTickDataProcessorSQLite(FXTickDataProcessor):
         :returns outs: DataFrame with an additional column indiciating the pair.
         '''
 
-        data['pair'] = self.currency
-        data: pd.DataFrame = data[['ts', 'pair', 'ask', 'bid', 'ask_volume', 'bid_volume']]
+        # Assign to a copy so the caller's frame can be shared between writers.
+        # Columns added by later stages, such as features, follow the ticks.
+        data: pd.DataFrame = data.assign(pair=self.currency)
+        columns: list = ['ts', 'pair', 'ask', 'bid', 'ask_volume', 'bid_volume']
+        data = data[columns + [column for column in data.columns if column not in columns]]
 
         return data
 
+    def _add_missing_columns(self, conn: sqlite3.Connection, data: pd.DataFrame, table: str) -> None:
+        '''
+        Add columns of the data that an existing table lacks, such as the
+        feature columns, so tables created from make_tables.sql accept them.
+
+        :params conn: Open connection to the DB.
+        :params data: DataFrame about to be written.
+        :params table: Table where data will be stored.
+        '''
+
+        existing: set = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+        # Missing tables are created with every column by to_sql.
+        if not existing:
+            return
+
+        for column in data.columns:
+            if column not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} REAL')
+
     def write(self, data: pd.DataFrame, db: str, table: str) -> None:
         '''
         Write data into specified DB and table.
@@ -117,6 +224,10 @@ class FXTickDataProcessorSQLite(FXTickDataProcessor):
             raise e
 
         else:
+            # Take the write lock before looking at the table, so workers
+            # writing to a new DB at once do not all try to create it.
+            conn.execute('BEGIN IMMEDIATE')
+            self._add_missing_columns(conn, full_data, table)
             full_data.to_sql(table, conn, if_exists='append', index=False, index_label='')
 
         finally:
@@ -125,3 +236,34 @@ class FXTickDataProcessorSQLite(FXTickDataProcessor):
             if conn:
                 conn.commit()
                 conn.close()
+
+    @classmethod
+    def latest_hour(cls, currency: str, db: str, table: str) -> Optional[datetime]:
+        '''
+        Find the newest hour already stored for a pair in the table.
+
+        :params currency: String identifying currency pair.
+        :params db: Local DB name.
+        :params table: Table where data is stored.
+        :returns latest: Datetime of the newest stored hour, or None when the
+                         DB, the table or the pair has no data yet.
+        '''
+
+        if not os.path.exists(db):
+            return None
+
+        conn = sqlite3.connect(db)
+        try:
+            exists: bool = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (table, )).fetchone()[0] > 0
+            if not exists:
+                return None
+
+            latest_ts, = conn.execute(f'SELECT MAX(ts) FROM {table} WHERE pair = ?', (currency, )).fetchone()
+
+        finally:
+            conn.close()
+
+        if latest_ts is None:
+            return None
+
+        return datetime.fromisoformat(latest_ts).replace(minute=0, second=0, microsecond=0)
@@ -1,7 +1,29 @@
 time python -m unittest --verbose \
     tests/test_network/test_network_requester.py \
     tests/test_network/test_network_requester_parser.py \
+    tests/test_network/test_mock_server.py \
     tests/test_processors/test_base_processor.py \
+    tests/test_processors/test_batch_processor.py \
     tests/test_processors/test_tabular_processor.py \
     tests/test_processors/test_sqlite_processor.py \
+    tests/test_processors/test_compact_processor.py \
+    tests/test_processors/test_latest_hour.py \
+    tests/test_processors/test_tabular_reader.py \
+    tests/test_processors/test_compaction.py \
+    tests/test_processors/test_panel.py \
+    tests/test_processors/test_replay.py \
+    tests/test_processors/test_features.py \
+    tests/test_pipelines/test_fanout_pipeline.py \
+    tests/test_pipelines/test_registry.py \
     tests/test_utils/test_tools_functions.py \
+    tests/test_utils/test_stats.py \
+    tests/test_utils/test_scheduler.py \
+    tests/test_utils/test_journal.py \
+    tests/test_utils/test_catalog.py \
+    tests/test_utils/test_merge.py \
+    tests/test_utils/test_telemetry.py \
+    tests/test_utils/test_market_hours.py \
+    tests/test_utils/test_logger.py \
+    tests/test_utils/test_profiling.py \
+    tests/test_utils/test_shared_frames.py \
+    tests/test_benchmarks/test_synthetic.py \
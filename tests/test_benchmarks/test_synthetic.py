@@ -0,0 +1,69 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from datetime import datetime
+
+from benchmarks.suite import BENCHMARK_STAGES, _peak_allocation_mb, compare_baselines, run_benchmarks
+from benchmarks.synthetic import synthetic_bi5
+from network.parser import FXTickDataParser
+
+class TestSyntheticBenchmarks(unittest.TestCase):
+    '''
+    Test fixture for the synthetic payload generator and benchmark suite.
+    '''
+
+    def setUp(self):
+        self.request_date: datetime = datetime(2018, 10, 1, 12)
+        self.parser = FXTickDataParser()
+
+    def test_payload_round_trip(self):
+        '''
+        Validate that payloads parse into ordered ticks at a realistic price.
+        '''
+
+        ticks: list = self.parser.parse(synthetic_bi5('EURUSD', self.request_date, 5000))
+
+        self.assertEqual(len(ticks), 5000)
+        self.assertEqual([tick[0] for tick in ticks], sorted(tick[0] for tick in ticks))
+        self.assertTrue(all(0 <= tick[0] < 3600000 for tick in ticks))
+        self.assertTrue(all(tick[1] > tick[2] for tick in ticks))
+        self.assertAlmostEqual(ticks[0][2] / 1e5, 1.16, places=2)
+
+        jpy_ticks: list = self.parser.parse(synthetic_bi5('USDJPY', self.request_date, 10))
+        self.assertAlmostEqual(jpy_ticks[0][2] / 1e3, 113.6, delta=1.0)
+
+    def test_payload_is_deterministic(self):
+        '''
+        Validate that an hour always has the same payload and empty hours are
+        empty.
+        '''
+
+        self.assertEqual(synthetic_bi5('EURUSD', self.request_date, 100), synthetic_bi5('EURUSD', self.request_date, 100))
+        self.assertNotEqual(synthetic_bi5('EURUSD', self.request_date, 100), synthetic_bi5('GBPUSD', self.request_date, 100))
+        self.assertEqual(self.parser.parse(synthetic_bi5('EURUSD', self.request_date, 0)), [])
+
+    def test_run_and_compare(self):
+        '''
+        Validate that every stage is measured and regressions are reported.
+        '''
+
+        results: dict = run_benchmarks((200, ), repeat=1)
+        self.assertEqual(list(results), [f'{stage}@200' for stage in BENCHMARK_STAGES])
+        self.assertTrue(all(result['ticks_per_second'] > 0 for result in results.values()))
+        self.assertTrue(all(result['peak_alloc_mb'] > 0 for result in results.values()))
+
+        baselines: dict = {key: dict(result, ticks_per_second=result['ticks_per_second'] * 2) for key, result in results.items()}
+        self.assertEqual(len(compare_baselines(results, baselines, 0.25)), len(BENCHMARK_STAGES))
+        self.assertEqual(compare_baselines(results, results, 0.25), [])
+
+    def test_peak_allocation_per_stage(self):
+        '''
+        Validate that the peak allocation covers only the traced call, so a
+        small stage after a large one reports its own peak.
+        '''
+
+        self.assertGreater(_peak_allocation_mb(lambda: np.ones(1024 * 1024)), 7.5)
+        self.assertLess(_peak_allocation_mb(lambda: np.ones(1024)), 1.0)
+        self.assertFalse(tracemalloc.is_tracing())
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from datetime import datetime
+
+from requests import HTTPError
+
+from benchmarks.end_to_end import run_end_to_end
+from benchmarks.mock_server import FXTickDataMockServer
+from network.parser import FXTickDataParser
+from network.requester import FXTickDataRequester
+
+class TestMockServer(unittest.TestCase):
+    '''
+    Testing fixture for requests against the local mock data feed.
+    '''
+
+    def setUp(self):
+        self.currency: str = 'EURUSD'
+        self.request_date: datetime = datetime(2018, 10, 1, 3)
+
+    def test_serves_synthetic_hours(self):
+        '''
+        Validate that hours are served at the paths the requester builds.
+        '''
+
+        with FXTickDataMockServer(ticks=100) as server:
+            requester = FXTickDataRequester(self.currency, self.request_date, base_url=server.base_url)
+            ticks: list = FXTickDataParser().parse(requester.request())
+
+        self.assertEqual(len(ticks), 100)
+        self.assertEqual(server.requests, 1)
+        self.assertGreater(server.bytes_served, 0)
+
+    def test_injected_failures(self):
+        '''
+        Validate that injected errors raise and empty hours are empty.
+        '''
+
+        with FXTickDataMockServer(error_rate=1.0) as server:
+            with self.assertRaises(HTTPError):
+                FXTickDataRequester(self.currency, self.request_date, base_url=server.base_url).request()
+
+        with FXTickDataMockServer(empty_rate=1.0) as server:
+            self.assertEqual(FXTickDataRequester(self.currency, self.request_date, base_url=server.base_url).request(), b'')
+
+    def test_concurrency_limit(self):
+        '''
+        Validate that requests beyond the concurrency limit are throttled and
+        succeed once retried.
+        '''
+
+        responses: list = []
+        retries: list = []
+
+        def request(hour: int):
+            requester = FXTickDataRequester(self.currency, self.request_date.replace(hour=hour), max_retries=10,
+                                            backoff=0.05, base_url=server.base_url)
+            responses.append(requester.request())
+            retries.append(requester.retries)
+
+        with FXTickDataMockServer(ticks=100, latency=0.2, max_concurrent=1) as server:
+            threads: list = [threading.Thread(target=request, args=(hour, )) for hour in range(3)]
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(responses), 3)
+        self.assertTrue(all(responses))
+        self.assertEqual(server.peak_concurrent, 1)
+        self.assertGreater(server.throttled, 0)
+        self.assertEqual(sum(retries), server.throttled)
+
+    def test_end_to_end_load(self):
+        '''
+        Validate a full run of the loading script against the mock server.
+        '''
+
+        results: dict = run_end_to_end('EURUSD,XAUUSD', '2018-10-01', '2018-10-01T06', 2, ticks=200, empty_rate=0.2)
+
+        self.assertEqual(results['summary']['hours'], 12)
+        self.assertEqual(results['summary']['succeeded'], 12)
+        self.assertEqual(results['server']['requests'], 12)
+        self.assertLess(results['summary']['rows'], 12 * 200)
+
+    def test_end_to_end_catch_up(self):
+        '''
+        Validate that catching up into a new DB falls back to the start date,
+        and that a rerun only loads hours after the newest stored hour.
+        '''
+
+        with tempfile.TemporaryDirectory() as tmp:
+            load_args: tuple = ('--pipeline', 'sqlite', '--db', os.path.join(tmp, 'ticks.db'), '--table', 'raw_ticks', '--catch_up')
+
+            results: dict = run_end_to_end(self.currency, '2018-10-01', '2018-10-01T03', 2, load_args=load_args, ticks=10)
+            self.assertEqual(results['summary']['succeeded'], 3)
+
+            results = run_end_to_end(self.currency, '2018-10-01', '2018-10-01T05', 2, load_args=load_args, ticks=10)
+            self.assertEqual(results['summary']['succeeded'], 2)
@@ -0,0 +1,139 @@
+import lzma
+import os
+import pickle
+import sqlite3
+import struct
+import tempfile
+import unittest
+
+from datetime import datetime
+from multiprocessing import shared_memory
+from unittest import mock
+
+import pandas as pd
+
+from load_fx_data import build_pipeline
+from pipelines.basic_pipeline import FXTickDataFanOutPipeline, FXTickDataSQLitePipeline, FXTickDataTabularPipeline
+from pipelines.resampled_pipeline import FXTickDataBarsPipeline
+from utils.journal import FXTickDataJournal
+
+class _UnnamedTabularPipeline(FXTickDataTabularPipeline):
+    '''
+    Third party style pipeline which leaves SINK unset.
+    '''
+
+    SINK: str = ''
+
+class TestFanOutPipeline(unittest.TestCase):
+    '''
+    Testing fixture for writing one processed hour to several sinks.
+    '''
+
+    def setUp(self):
+        self.currency: str = 'EURUSD'
+        self.request_date: datetime = datetime(2018, 10, 1, 3)
+        self.tmp = tempfile.TemporaryDirectory()
+
+        # One tick every 30 seconds over the hour.
+        ticks: bytes = b''.join(struct.pack('>3L2f', ms, 116055 + i % 3, 116052, 1.0, 1.5) for i, ms in enumerate(range(0, 3600000, 30000)))
+        self.response: bytes = lzma.compress(ticks, format=lzma.FORMAT_ALONE)
+
+        self.params: dict = {
+            'opath'         : self.tmp.name,
+            'sep'           : '\t',
+            'db'            : os.path.join(self.tmp.name, 'ticks.db'),
+            'table'         : 'raw_ticks',
+            'bars_table'    : 'minutes',
+            'journal'       : os.path.join(self.tmp.name, 'journal.tsv')
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fan_out_sinks(self):
+        '''
+        Validate that a single request is written to every sink.
+        '''
+
+        sinks: list = [FXTickDataTabularPipeline, FXTickDataSQLitePipeline, FXTickDataBarsPipeline]
+        pipeline = FXTickDataFanOutPipeline(self.currency, self.request_date, sinks)
+
+        with mock.patch('pipelines.basic_pipeline.FXTickDataRequester.request', return_value=self.response) as request:
+            stats = pipeline(self.params)
+
+        self.assertTrue(stats.success)
+        self.assertEqual(request.call_count, 1)
+        self.assertEqual(stats.rows, 120)
+
+        # Tabular output keeps the tick columns only.
+        tabular: pd.DataFrame = pd.read_csv(os.path.join(self.tmp.name, 'EURUSD20181001T030000.tsv'), sep='\t')
+        self.assertEqual(list(tabular.columns), ['ts', 'ask', 'bid', 'ask_volume', 'bid_volume'])
+
+        with sqlite3.connect(self.params['db']) as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM raw_ticks').fetchone()[0], 120)
+            self.assertEqual(conn.execute('SELECT COUNT(*), SUM(bid_volume) FROM minutes').fetchone(), (60, 120 * 1.5e6))
+
+        completed: set = FXTickDataJournal(self.params['journal']).completed()
+        self.assertEqual({sink for pair, request_date, sink in completed}, {'tabular', 'sqlite', 'bars'})
+
+    def test_fan_out_partial_failure(self):
+        '''
+        Validate that sinks written before a failure stay journaled.
+        '''
+
+        sinks: list = [FXTickDataTabularPipeline, FXTickDataSQLitePipeline]
+        pipeline = FXTickDataFanOutPipeline(self.currency, self.request_date, sinks)
+        params: dict = dict(self.params, db=os.path.join(self.tmp.name, 'missing', 'ticks.db'))
+
+        with mock.patch('pipelines.basic_pipeline.FXTickDataRequester.request', return_value=self.response):
+            stats = pipeline(params)
+
+        self.assertFalse(stats.success)
+        completed: set = FXTickDataJournal(self.params['journal']).completed()
+        self.assertEqual(completed, {(self.currency, self.request_date, 'tabular')})
+
+    def test_parent_writer(self):
+        '''
+        Validate that a processed hour handed over in shared memory is written
+        to every sink by the parent and its blocks are released.
+        '''
+
+        sinks: list = [FXTickDataTabularPipeline, FXTickDataSQLitePipeline]
+        params: dict = dict(self.params, writer='parent')
+        pipeline = FXTickDataFanOutPipeline(self.currency, self.request_date, sinks)
+
+        with mock.patch('pipelines.basic_pipeline.FXTickDataRequester.request', return_value=self.response):
+            stats = pickle.loads(pickle.dumps(pipeline(params)))
+
+        self.assertFalse(stats.success)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'EURUSD20181001T030000.tsv')))
+
+        shared_frame = stats.shared_frame
+        stats = FXTickDataFanOutPipeline(self.currency, self.request_date, sinks).write_shared(stats, params)
+
+        self.assertTrue(stats.success)
+        self.assertIsNone(stats.shared_frame)
+        self.assertEqual(len(pd.read_csv(os.path.join(self.tmp.name, 'EURUSD20181001T030000.tsv'), sep='\t')), 120)
+        with sqlite3.connect(self.params['db']) as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM raw_ticks').fetchone()[0], 120)
+
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shared_frame.columns[0][1])
+
+    def test_journal_registered_names(self):
+        '''
+        Validate that hours are journaled under the names they were scheduled
+        under, so pipelines without a SINK are skipped on resume.
+        '''
+
+        pipelines: dict = {'custom': _UnnamedTabularPipeline, 'sqlite': FXTickDataSQLitePipeline}
+        for sinks in [('custom', ), ('custom', 'sqlite')]:
+            with mock.patch('pipelines.basic_pipeline.FXTickDataRequester.request', return_value=self.response):
+                stats = build_pipeline(self.currency, self.request_date, sinks, pipelines)(self.params)
+
+            self.assertTrue(stats.success)
+
+            journal = FXTickDataJournal(self.params['journal'])
+            self.assertEqual({sink for pair, request_date, sink in journal.completed()}, set(sinks))
+            self.assertEqual(list(journal.filter_tasks([(self.currency, self.request_date, sinks)])), [])
+            os.remove(self.params['journal'])
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+import unittest
+
+from pipelines.registry import PIPELINES_MAP, get_pipeline, pipeline_names
+
+class TestPipelineRegistry(unittest.TestCase):
+    '''
+    Testing fixture for the lazy pipeline registry.
+    '''
+
+    def test_resolve_builtin_pipelines(self):
+        '''
+        Validate that every built in pipeline resolves to a class.
+        '''
+
+        for name in PIPELINES_MAP:
+            pipeline = get_pipeline(name)
+            self.assertEqual(pipeline.SINK, name)
+
+        self.assertTrue(set(PIPELINES_MAP).issubset(pipeline_names()))
+
+    def test_unknown_pipeline(self):
+        '''
+        Validate that unknown pipelines raise.
+        '''
+
+        with self.assertRaises(Exception):
+            get_pipeline('non_existant_pipeline')
+
+    def test_lazy_imports(self):
+        '''
+        Validate that the loading script does not import pandas before a
+        pipeline is resolved.
+        '''
+
+        code: str = 'import sys, load_fx_data; print("pandas" in sys.modules)'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+        self.assertEqual(result.stdout.strip(), 'False')
+
+        # Optional stages are only imported by the runs that use them.
+        modules: list = ['processors.compact', 'processors.features', 'utils.catalog', 'utils.shared_frames']
+        code = f'import sys, pipelines.basic_pipeline; print([m for m in {modules} if m in sys.modules])'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+        self.assertEqual(result.stdout.strip(), '[]')
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import synthetic_bi5, synthetic_ticks
+from network.parser import FXTickDataParser
+from processors.ticks import FXTickDataBatchProcessor, FXTickDataProcessor
+
+class TestTickDataBatchProcessor(unittest.TestCase):
+    '''
+    Testing fixture for processing many hours in one call.
+    '''
+
+    def setUp(self):
+        self.start_date: datetime = datetime(2018, 10, 1)
+        self.parser = FXTickDataParser()
+
+    def test_decode_array(self):
+        '''
+        Validate that array decoding matches the struct decoder.
+        '''
+
+        data: bytes = synthetic_ticks('USDJPY', self.start_date, 200)
+        records: np.ndarray = self.parser.decode_array(data)
+
+        self.assertEqual(records.tolist(), self.parser.decode(data))
+        self.assertEqual(len(self.parser.decode_array(data[:-3])), 199)
+        self.assertEqual(len(self.parser.parse_array(synthetic_bi5('USDJPY', self.start_date, 0))), 0)
+
+    def test_process(self):
+        '''
+        Validate that a batch of hours of several pairs, including an empty
+        hour, matches processing each hour on its own.
+        '''
+
+        batch: list = []
+        expected: list = []
+        for hours, (pair, ticks) in enumerate([('EURUSD', 300), ('USDJPY', 0), ('XAUUSD', 50), ('EURUSD', 1000), ('USDJPY', 20)]):
+            hour: datetime = self.start_date + timedelta(hours=hours)
+            payload: bytes = synthetic_bi5(pair, hour, ticks)
+
+            batch.append((pair, hour, self.parser.parse_array(payload)))
+            expected.append(FXTickDataProcessor(pair, hour).process(self.parser.parse(payload)))
+
+        data, boundaries = FXTickDataBatchProcessor().process(batch)
+
+        self.assertEqual(list(data.columns), ['ts', 'ask', 'bid', 'ask_volume', 'bid_volume'])
+        self.assertEqual(boundaries.tolist(), [0, 300, 300, 350, 1350, 1370])
+        for index, hour_data in enumerate(expected):
+            hour_slice: pd.DataFrame = data.iloc[boundaries[index]:boundaries[index + 1]].reset_index(drop=True)
+            self.assertEqual(len(hour_slice), len(hour_data))
+            if len(hour_data):
+                pd.testing.assert_frame_equal(hour_slice, hour_data.astype({'ts': 'datetime64[ns]'}))
+
+    def test_process_empty(self):
+        '''
+        Validate a batch without ticks.
+        '''
+
+        data, boundaries = FXTickDataBatchProcessor().process([])
+        self.assertEqual((len(data), boundaries.tolist()), (0, [0]))
+
+        empty: np.ndarray = self.parser.parse_array(synthetic_bi5('EURUSD', self.start_date, 0))
+        data, boundaries = FXTickDataBatchProcessor().process([('EURUSD', self.start_date, empty)])
+        self.assertEqual((len(data), boundaries.tolist()), (0, [0, 0]))
+
+if __name__ == '__main__':
+    unittest.main()
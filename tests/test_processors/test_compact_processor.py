@@ -0,0 +1,83 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import synthetic_bi5
+from network.parser import FXTickDataParser
+from processors.compact import HEADER, FXTickDataProcessorCompact, decode_block, encode_block
+from processors.ticks import FXTickDataProcessor
+
+class TestTickDataCompactProcessor(unittest.TestCase):
+    '''
+    Testing fixture for the compact binary data processor.
+    '''
+
+    def setUp(self):
+        self.request_date: datetime = datetime(2018, 10, 1, 12)
+        self.parser = FXTickDataParser()
+        self.temp_dir: str = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def processed(self, currency: str, ticks: int) -> pd.DataFrame:
+        parsed: list = self.parser.parse(synthetic_bi5(currency, self.request_date, ticks))
+        return FXTickDataProcessor(currency, self.request_date).process(parsed)
+
+    def test_round_trip(self):
+        '''
+        Validate that decoding restores the processed data exactly.
+        '''
+
+        for currency in ['EURUSD', 'USDJPY', 'XAUUSD']:
+            data: pd.DataFrame = self.processed(currency, 5000)
+            processor = FXTickDataProcessorCompact(currency, self.request_date)
+            processor.write(data, self.temp_dir)
+
+            pd.testing.assert_frame_equal(FXTickDataProcessorCompact.read(currency, self.request_date, self.temp_dir), data)
+
+        empty: pd.DataFrame = self.processed('EURUSD', 0)
+        self.assertEqual(len(decode_block(encode_block(empty, self.request_date, 1e5))), 0)
+
+    def test_compact_size(self):
+        '''
+        Validate that blocks are an order of magnitude smaller than TSV, and
+        that small deltas are stored in narrow types.
+        '''
+
+        data: pd.DataFrame = self.processed('EURUSD', 20000)
+        block: bytes = encode_block(data, self.request_date, 1e5)
+        tsv_size: int = len(data.to_csv(sep='\t', index=False).encode())
+
+        self.assertLess(len(block) * 8, tsv_size)
+
+        magic, version, codes, hour_ms, factor, count, length = HEADER.unpack_from(block)
+        self.assertEqual((magic, count, factor), (b'FXTC', 20000, 1e5))
+        self.assertEqual(len(block), HEADER.size + length)
+        self.assertTrue(all(struct.calcsize(code) <= 4 for code in codes.decode()[:3]))
+
+        with self.assertRaises(Exception):
+            decode_block(b'XXXX' + block[4:])
+
+    def test_latest_hour(self):
+        '''
+        Validate that the newest written hour is found from the file names.
+        '''
+
+        self.assertIsNone(FXTickDataProcessorCompact.latest_hour('EURUSD', self.temp_dir))
+
+        for hours in [0, 5, 2]:
+            request_date: datetime = self.request_date + timedelta(hours=hours)
+            FXTickDataProcessorCompact('EURUSD', request_date).write(self.processed('EURUSD', 10), self.temp_dir)
+
+        open(os.path.join(self.temp_dir, 'EURUSD20181002T000000.tsv'), 'w').close()
+        self.assertEqual(FXTickDataProcessorCompact.latest_hour('EURUSD', self.temp_dir), self.request_date + timedelta(hours=5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from datetime import datetime
+
+from processors.compaction import INDEX_SUFFIX, compact_tabular, load_partition_index, partition_name
+from processors.readers import FXTickDataTabularReader
+
+class TestTickDataCompaction(unittest.TestCase):
+    '''
+    Testing fixture for compacting hourly tabular outputs into partitions.
+    '''
+
+    def setUp(self):
+        self.currency: str = 'EURUSD'
+        self.data_path: str = 'tests/data/'
+        self.files: list = sorted(os.listdir(self.data_path))
+
+        self.temp_dir: str = tempfile.mkdtemp()
+        self.opath: str = os.path.join(self.temp_dir, 'raw')
+        self.ppath: str = os.path.join(self.temp_dir, 'compacted')
+        os.makedirs(self.opath)
+        os.makedirs(self.ppath)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def copy_hours(self, files: list) -> None:
+        for name in files:
+            shutil.copy(os.path.join(self.data_path, name), self.opath)
+
+    def test_partition_name(self):
+        '''
+        Validate partition names per granularity.
+        '''
+
+        hour: datetime = datetime(2018, 10, 1, 5)
+        self.assertEqual(partition_name(self.currency, hour, 'day'), 'EURUSD20181001.tsv')
+        self.assertEqual(partition_name(self.currency, hour, 'month'), 'EURUSD201810.tsv')
+
+        with self.assertRaises(Exception):
+            partition_name(self.currency, hour, 'year')
+
+    def test_incremental_compaction(self):
+        '''
+        Validate that repeated runs only add new hours, never duplicate them,
+        and keep the index pointing at each hour's rows.
+        '''
+
+        self.copy_hours(self.files[:3])
+        self.assertEqual(compact_tabular(self.opath, self.ppath, 'month'), {'partitions': 1, 'hours': 3, 'kept': 0})
+        self.assertEqual(compact_tabular(self.opath, self.ppath, 'month'), {'partitions': 0, 'hours': 0, 'kept': 0})
+
+        self.copy_hours(self.files[3:])
+        self.assertEqual(compact_tabular(self.opath, self.ppath, 'month'), {'partitions': 1, 'hours': 2, 'kept': 0})
+        self.assertEqual(sorted(os.listdir(self.ppath)), ['EURUSD201810.tsv', 'EURUSD201810.tsv' + INDEX_SUFFIX])
+
+        path: str = os.path.join(self.ppath, 'EURUSD201810.tsv')
+        data: pd.DataFrame = pd.read_csv(path, sep='\t')
+        expected: pd.DataFrame = pd.concat([pd.read_csv(os.path.join(self.data_path, name), sep='\t') for name in self.files], ignore_index=True)
+        self.assertTrue(data.equals(expected))
+
+        index: dict = load_partition_index(path)
+        self.assertEqual(list(index['hours']), [datetime(2018, 10, day).isoformat() for day in range(1, 6)])
+        with open(path, 'rb') as ins:
+            offset, length = index['hours'][datetime(2018, 10, 3).isoformat()]
+            ins.seek(offset)
+            rows: list = ins.read(length).decode().splitlines()
+
+        with open(os.path.join(self.data_path, 'EURUSD20181003T000000.tsv')) as ins:
+            self.assertEqual(rows, ins.read().splitlines()[1:])
+
+    def test_remove_keeps_changed_hours(self):
+        '''
+        Validate that removing hourly files keeps an hour downloaded again with
+        different rows after it was compacted.
+        '''
+
+        self.copy_hours(self.files[:2])
+        compact_tabular(self.opath, self.ppath, 'month')
+
+        # One hour is unchanged and one was downloaded again with other rows.
+        changed: str = os.path.join(self.opath, self.files[1])
+        with open(changed) as ins:
+            lines: list = ins.read().splitlines(keepends=True)
+
+        with open(changed, 'w') as outs:
+            outs.writelines(lines[:-1])
+
+        self.assertEqual(compact_tabular(self.opath, self.ppath, 'month', remove=True), {'partitions': 0, 'hours': 0, 'kept': 1})
+        self.assertEqual(os.listdir(self.opath), [self.files[1]])
+
+    def test_rebuilds_stale_index(self):
+        '''
+        Validate that a missing index is rebuilt from the partition rows.
+        '''
+
+        self.copy_hours(self.files)
+        compact_tabular(self.opath, self.ppath, 'day', remove=True)
+        self.assertEqual(os.listdir(self.opath), [])
+
+        path: str = os.path.join(self.ppath, 'EURUSD20181002.tsv')
+        with open(path + INDEX_SUFFIX) as ins:
+            index: dict = json.load(ins)
+
+        os.remove(path + INDEX_SUFFIX)
+        rebuilt: dict = load_partition_index(path)
+        self.assertEqual(rebuilt['hours'], {hour: tuple(span) for hour, span in index['hours'].items()})
+
+    def test_reader_over_partitions(self):
+        '''
+        Validate that the reader merges partitioned hours and hourly files
+        without duplicates, reading consecutive partitioned hours at once.
+        '''
+
+        self.copy_hours(self.files)
+        compact_tabular(self.opath, self.ppath, 'month')
+        os.remove(os.path.join(self.opath, self.files[1]))
+
+        start_date, end_date = datetime(2018, 10, 1), datetime(2018, 10, 6)
+        expected: pd.DataFrame = FXTickDataTabularReader(self.data_path).read(self.currency, start_date, end_date)
+
+        reader = FXTickDataTabularReader(self.opath, partition_path=self.ppath)
+        self.assertTrue(reader.read(self.currency, start_date, end_date).equals(expected))
+
+        # Only the hour without an hourly file is read from the partition.
+        self.assertEqual([source[:2] for source in reader.sources(self.currency, start_date, end_date) if source[3] is not None],
+                         [(datetime(2018, 10, 2), datetime(2018, 10, 2))])
+
+        for name in self.files:
+            if os.path.exists(os.path.join(self.opath, name)):
+                os.remove(os.path.join(self.opath, name))
+
+        self.assertEqual(len(reader.sources(self.currency, start_date, end_date)), 1)
+        self.assertTrue(reader.read(self.currency, start_date, end_date).equals(expected))
+
+        data: pd.DataFrame = reader.read(self.currency, datetime(2018, 10, 2, 0, 30), datetime(2018, 10, 4), columns=['bid'])
+        self.assertEqual(list(data.columns), ['ts', 'bid'])
+        self.assertGreaterEqual(data['ts'].min(), datetime(2018, 10, 2, 0, 30))
+        self.assertLess(data['ts'].max(), datetime(2018, 10, 4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from benchmarks.end_to_end import run_end_to_end
+from benchmarks.synthetic import synthetic_bi5
+from network.parser import FXTickDataParser
+from processors.features import FEATURE_COLUMNS, FXTickDataFeatures
+from processors.ticks import FXTickDataProcessor
+
+class TestTickDataFeatures(unittest.TestCase):
+    '''
+    Testing fixture for the derived feature stage.
+    '''
+
+    def setUp(self):
+        self.start_date: datetime = datetime(2018, 10, 1)
+        parser = FXTickDataParser()
+
+        self.hours: list = []
+        for hours, ticks in enumerate([400, 0, 30, 500]):
+            hour: datetime = self.start_date + timedelta(hours=hours)
+            self.hours.append(FXTickDataProcessor('EURUSD', hour).process(parser.parse(synthetic_bi5('EURUSD', hour, ticks))))
+
+        self.data: pd.DataFrame = pd.concat(self.hours, ignore_index=True)
+
+    def test_features(self):
+        '''
+        Validate the feature values over a single frame.
+        '''
+
+        data: pd.DataFrame = FXTickDataFeatures(window=20).compute(self.data)
+        ask, bid = self.data['ask'].to_numpy(dtype='float64'), self.data['bid'].to_numpy(dtype='float64')
+        mid: np.ndarray = (ask + bid) / 2
+
+        self.assertEqual(list(data.columns), list(self.data.columns) + FEATURE_COLUMNS)
+        np.testing.assert_allclose(data['mid'], mid)
+        np.testing.assert_allclose(data['spread'], ask - bid)
+        np.testing.assert_allclose(data['log_return'].iloc[1:], np.diff(np.log(mid)))
+        np.testing.assert_allclose(data['volatility'], pd.Series(np.log(mid)).diff().rolling(20).std(), equal_nan=True)
+        self.assertTrue(np.isnan(data['log_return'].iloc[0]))
+
+    def test_windows_across_hours(self):
+        '''
+        Validate that hours computed in order match the whole range, for tick
+        and time windows, including an empty hour.
+        '''
+
+        for window in [20, 200, '5min']:
+            expected: pd.DataFrame = FXTickDataFeatures(window).compute(self.data)
+
+            features = FXTickDataFeatures(window)
+            data: pd.DataFrame = pd.concat([features.compute(hour) for hour in self.hours], ignore_index=True)
+
+            for column in FEATURE_COLUMNS:
+                np.testing.assert_allclose(data[column], expected[column], rtol=1e-9, equal_nan=True)
+
+        # After a reset the next hour starts without history.
+        features = FXTickDataFeatures(20)
+        features.compute(self.hours[0])
+        features.reset()
+        self.assertTrue(np.isnan(features.compute(self.hours[2])['log_return'].iloc[0]))
+
+    def test_load_with_features(self):
+        '''
+        Validate that a run of the loading script writes features computed
+        across hour boundaries, both to a new table and to a table created
+        from make_tables.sql.
+        '''
+
+        for make_tables in [False, True]:
+            with tempfile.TemporaryDirectory() as tmp:
+                db: str = os.path.join(tmp, 'ticks.db')
+                if make_tables:
+                    with open('utils/sql/queries/make_tables.sql') as ins, sqlite3.connect(db) as conn:
+                        conn.executescript(ins.read())
+
+                load_args: tuple = ('--pipeline', 'sqlite', '--db', db, '--table', 'raw_ticks', '--writer', 'parent', '--features', '--feature_window', '50')
+                results: dict = run_end_to_end('EURUSD,GBPUSD', '2018-10-01', '2018-10-01T06', 3, load_args=load_args, ticks=100)
+
+                with sqlite3.connect(db) as conn:
+                    stored: pd.DataFrame = pd.read_sql_query('SELECT * FROM raw_ticks', conn)
+
+            self.assertEqual(results['summary']['succeeded'], 12)
+            self.assertEqual(list(stored.columns), ['ts', 'pair', 'ask', 'bid', 'ask_volume', 'bid_volume'] + FEATURE_COLUMNS)
+
+            for pair, data in stored.groupby('pair'):
+                data = data.sort_values('ts', kind='stable', ignore_index=True)
+                expected: pd.DataFrame = FXTickDataFeatures(50).compute(data[['ts', 'ask', 'bid']].assign(ts=pd.to_datetime(data['ts'])))
+                self.assertEqual(len(data), 600)
+                np.testing.assert_allclose(data['volatility'], expected['volatility'], rtol=1e-9, equal_nan=True)
+
+if __name__ == '__main__':
+    unittest.main()
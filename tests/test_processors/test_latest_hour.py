@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from pipelines.basic_pipeline import FXTickDataSQLitePipeline, FXTickDataTabularPipeline
+from processors.ticks import FXTickDataProcessorSQLite, FXTickDataProcessorTabular
+from utils.scheduler import filter_stored_tasks
+
+class TestTickDataLatestHour(unittest.TestCase):
+    '''
+    Testing fixture for finding the newest stored hour in each sink.
+    '''
+
+    def setUp(self):
+        self.currency: str = 'EURUSD'
+        self.data_path: str = 'tests/data/'
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_tabular_latest_hour(self):
+        '''
+        Validate the newest hour is found from the tabular file names.
+        '''
+
+        latest: datetime = FXTickDataProcessorTabular.latest_hour(self.currency, self.data_path)
+        self.assertEqual(latest, datetime(2018, 10, 5))
+
+        # Other pairs and an empty directory have no stored hours.
+        self.assertIsNone(FXTickDataProcessorTabular.latest_hour('GBPUSD', self.data_path))
+        self.assertIsNone(FXTickDataProcessorTabular.latest_hour(self.currency, self.tmp.name))
+
+    def test_sqlite_latest_hour(self):
+        '''
+        Validate the newest hour is found from the maximum stored timestamp.
+        '''
+
+        db: str = os.path.join(self.tmp.name, 'ticks.db')
+        data = pd.DataFrame({
+            'ts'            : pd.to_datetime(['2018-10-01 03:59:59.123', '2018-10-01 05:12:00.001', '2018-10-02 01:00:00.000']),
+            'pair'          : ['EURUSD', 'EURUSD', 'GBPUSD'],
+            'ask'           : [1.1, 1.2, 1.3],
+            'bid'           : [1.0, 1.1, 1.2],
+            'ask_volume'    : [1.0, 1.0, 1.0],
+            'bid_volume'    : [1.0, 1.0, 1.0]
+        })
+
+        with sqlite3.connect(db) as conn:
+            data.to_sql('raw_ticks', conn, index=False)
+
+        self.assertEqual(FXTickDataProcessorSQLite.latest_hour(self.currency, db, 'raw_ticks'), datetime(2018, 10, 1, 5))
+        self.assertIsNone(FXTickDataProcessorSQLite.latest_hour('USDJPY', db, 'raw_ticks'))
+
+        # A missing table or DB has no stored hours.
+        self.assertIsNone(FXTickDataProcessorSQLite.latest_hour(self.currency, db, 'minutes'))
+        self.assertIsNone(FXTickDataProcessorSQLite.latest_hour(self.currency, os.path.join(self.tmp.name, 'missing.db'), 'raw_ticks'))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'missing.db')))
+
+    def test_catch_up_first_run(self):
+        '''
+        Validate that catching up into new sinks keeps every hour, and that
+        once hours are stored only the later hours are kept per sink.
+        '''
+
+        db: str = os.path.join(self.tmp.name, 'ticks.db')
+        params: dict = {'db': db, 'table': 'raw_ticks', 'opath': self.tmp.name, 'sep': '\t'}
+        pipelines: dict = {'sqlite': FXTickDataSQLitePipeline, 'tabular': FXTickDataTabularPipeline}
+        hours: list = [datetime(2018, 10, 1) + timedelta(hours=hour) for hour in range(5)]
+
+        def stored_tasks() -> list:
+            latest_hours: dict = {(self.currency, sink): pipeline.latest_stored_hour(self.currency, params) for sink, pipeline in pipelines.items()}
+            return list(filter_stored_tasks(((self.currency, hour, ('sqlite', 'tabular')) for hour in hours), latest_hours))
+
+        # Nothing is stored yet, and looking does not create the DB.
+        self.assertEqual(stored_tasks(), [(self.currency, hour, ('sqlite', 'tabular')) for hour in hours])
+        self.assertFalse(os.path.exists(db))
+
+        # Only the SQLite sink stores the first three hours.
+        for hour in hours[:3]:
+            data = pd.DataFrame({
+                'ts'            : [hour + timedelta(minutes=30)],
+                'ask'           : [1.1],
+                'bid'           : [1.0],
+                'ask_volume'    : [1.0],
+                'bid_volume'    : [1.0]
+            })
+            FXTickDataProcessorSQLite(self.currency, hour).write(data, db, 'raw_ticks')
+
+        self.assertEqual(FXTickDataSQLitePipeline.latest_stored_hour(self.currency, params), hours[2])
+        self.assertEqual(stored_tasks(), [(self.currency, hour, ('tabular', )) for hour in hours[:3]] + [(self.currency, hour, ('sqlite', 'tabular')) for hour in hours[3:]])
+
+        # Once the tabular sink catches up too, only later hours remain.
+        for hour in hours[:3]:
+            FXTickDataProcessorTabular(self.currency, hour).write(pd.DataFrame({'ts': [hour]}), self.tmp.name)
+
+        self.assertEqual(stored_tasks(), [(self.currency, hour, ('sqlite', 'tabular')) for hour in hours[3:]])
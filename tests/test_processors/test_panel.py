@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from processors.panel import FXTickDataPanelBuilder
+from processors.readers import FXTickDataTabularReader
+
+class TestTickDataPanelBuilder(unittest.TestCase):
+    '''
+    Testing fixture for aligning several pairs with as-of joins.
+    '''
+
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.start_date: datetime = datetime(2018, 10, 1)
+        self.ticks: dict = {}
+        for pair, count in [('EURUSD', 5000), ('GBPUSD', 3000), ('USDJPY', 200)]:
+            offsets: np.ndarray = np.sort(rng.randint(0, 3600 * 1000, count))
+            self.ticks[pair] = pd.DataFrame({
+                'ts'    : pd.Timestamp(self.start_date) + pd.to_timedelta(offsets, unit='ms'),
+                'bid'   : rng.random_sample(count),
+                'ask'   : rng.random_sample(count)
+            })
+
+    def streams(self, size: int) -> dict:
+        return {pair: [data.iloc[offset:offset + size] for offset in range(0, len(data), size)] for pair, data in self.ticks.items()}
+
+    def expected(self, clock: pd.Series) -> pd.DataFrame:
+        '''
+        Align every pair on the clock with pandas as-of merges.
+        '''
+
+        panel: pd.DataFrame = pd.DataFrame({'ts': clock.astype('datetime64[ns]')})
+        for pair, data in self.ticks.items():
+            data = data.drop_duplicates('ts', keep='last').rename(columns={'bid': f'{pair}_bid', 'ask': f'{pair}_ask'})
+            data['ts'] = data['ts'].astype('datetime64[ns]')
+            panel = pd.merge_asof(panel, data, on='ts')
+
+        return panel
+
+    def test_event_clock(self):
+        '''
+        Validate the tick clock against as-of merges, for any chunking.
+        '''
+
+        clock: pd.Series = pd.Series(np.unique(pd.concat([data['ts'] for data in self.ticks.values()])))
+        expected: pd.DataFrame = self.expected(clock)
+
+        for size, chunk_size in [(10000, 100000), (97, 100000), (500, 333)]:
+            chunks: list = list(FXTickDataPanelBuilder(self.streams(size), chunk_size=chunk_size).iter_chunks())
+            self.assertTrue(all(len(chunk) <= chunk_size for chunk in chunks))
+            pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected, check_dtype=False)
+
+    def test_fixed_clock(self):
+        '''
+        Validate a fixed interval clock within a range, carrying quotes from
+        before the range into its first point.
+        '''
+
+        start_date: datetime = self.start_date + timedelta(minutes=10)
+        end_date: datetime = self.start_date + timedelta(minutes=40)
+        clock: pd.Series = pd.Series(pd.date_range(start_date, end_date, freq='1s', inclusive='left'))
+
+        builder = FXTickDataPanelBuilder(self.streams(250), freq='1s', start_date=start_date, end_date=end_date, chunk_size=700)
+        panel: pd.DataFrame = builder.build()
+
+        self.assertEqual(len(panel), 30 * 60)
+        self.assertFalse(panel.isna().any().any())
+        pd.testing.assert_frame_equal(panel, self.expected(clock), check_dtype=False)
+
+    def test_from_reader(self):
+        '''
+        Validate a panel over tabular outputs, with quotes missing until a
+        pair first ticks.
+        '''
+
+        temp_dir: str = tempfile.mkdtemp()
+        try:
+            for name in os.listdir('tests/data'):
+                shutil.copy(os.path.join('tests/data', name), temp_dir)
+                if name.startswith('EURUSD20181002'):
+                    shutil.copy(os.path.join('tests/data', name), os.path.join(temp_dir, name.replace('EURUSD', 'GBPUSD')))
+
+            reader = FXTickDataTabularReader(temp_dir)
+            start_date, end_date = datetime(2018, 10, 1), datetime(2018, 10, 3)
+            panel: pd.DataFrame = FXTickDataPanelBuilder.from_reader(reader, ['EURUSD', 'GBPUSD'], start_date, end_date, freq='1min').build()
+
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertEqual(len(panel), 2 * 24 * 60)
+        self.assertEqual(list(panel.columns), ['ts', 'EURUSD_bid', 'EURUSD_ask', 'GBPUSD_bid', 'GBPUSD_ask'])
+        self.assertTrue(panel.loc[panel['ts'] < datetime(2018, 10, 2), 'GBPUSD_bid'].isna().all())
+        self.assertTrue((panel.loc[panel['ts'] >= datetime(2018, 10, 2, 1), 'GBPUSD_bid'] == panel.loc[panel['ts'] >= datetime(2018, 10, 2, 1), 'EURUSD_bid']).all())
+
+if __name__ == '__main__':
+    unittest.main()
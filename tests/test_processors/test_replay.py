@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import synthetic_bi5
+from network.parser import FXTickDataParser
+from processors.readers import FXTickDataTabularReader
+from processors.replay import FXTickDataReplay, bi5_path
+from processors.ticks import FXTickDataProcessor, FXTickDataProcessorSQLite
+
+class TestTickDataReplay(unittest.TestCase):
+    '''
+    Testing fixture for the time ordered replay of several pairs.
+    '''
+
+    def setUp(self):
+        self.start_date: datetime = datetime(2018, 10, 1)
+        self.temp_dir: str = tempfile.mkdtemp()
+
+        # Second resolution timestamps, so pairs often tick at the same time.
+        rng = np.random.RandomState(11)
+        self.ticks: dict = {}
+        for pair, count in [('EURUSD', 4000), ('GBPUSD', 2500), ('USDJPY', 300)]:
+            seconds: np.ndarray = np.sort(rng.randint(0, 7200, count))
+            self.ticks[pair] = pd.DataFrame({
+                'ts'            : pd.Timestamp(self.start_date) + pd.to_timedelta(seconds, unit='s'),
+                'ask'           : rng.random_sample(count),
+                'bid'           : rng.random_sample(count),
+                'ask_volume'    : rng.random_sample(count),
+                'bid_volume'    : rng.random_sample(count)
+            })
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def expected(self, ticks: dict) -> pd.DataFrame:
+        '''
+        Order every tick by time, then by the order of the pairs.
+        '''
+
+        data: pd.DataFrame = pd.concat([frame.assign(pair=pair) for pair, frame in ticks.items()], ignore_index=True)
+        data = data.sort_values('ts', kind='stable', ignore_index=True)
+        data['ts'] = data['ts'].astype('datetime64[ns]')
+        data['pair'] = pd.Categorical(data['pair'], categories=list(ticks))
+
+        return data[['ts', 'pair', 'ask', 'bid', 'ask_volume', 'bid_volume']]
+
+    def test_merge_order(self):
+        '''
+        Validate the global order and batch sizes for any chunking.
+        '''
+
+        expected: pd.DataFrame = self.expected(self.ticks)
+        for size, batch_size, depth in [(10000, 100000, 0), (97, 1000, 2), (500, 333, 1)]:
+            sources: dict = {pair: [data.iloc[offset:offset + size] for offset in range(0, len(data), size)] for pair, data in self.ticks.items()}
+            batches: list = list(FXTickDataReplay(sources, batch_size=batch_size, depth=depth))
+
+            self.assertTrue(all(len(batch) <= batch_size for batch in batches))
+            self.assertTrue(all(len(batch) == batch_size for batch in batches[:-1]))
+            pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), expected)
+
+    def test_abandoned_replay(self):
+        '''
+        Validate that a replay stopped early releases its read-ahead threads,
+        and that source errors reach the consumer.
+        '''
+
+        def failing():
+            yield self.ticks['EURUSD']
+            raise Exception('Source failed')
+
+        replay = iter(FXTickDataReplay({'EURUSD': iter([self.ticks['EURUSD']] * 50)}, batch_size=100, depth=1))
+        next(replay)
+        replay.close()
+
+        with self.assertRaises(Exception):
+            list(FXTickDataReplay({'EURUSD': failing(), 'GBPUSD': [self.ticks['GBPUSD']]}, depth=1))
+
+    def test_sources(self):
+        '''
+        Validate that tabular, SQLite and raw bi5 sources replay the same
+        ticks.
+        '''
+
+        parser = FXTickDataParser()
+        processed: dict = {}
+        db: str = os.path.join(self.temp_dir, 'ticks.db')
+        for pair in ['EURUSD', 'USDJPY']:
+            frames: list = []
+            for hours in range(3):
+                hour: datetime = self.start_date + timedelta(hours=hours)
+                payload: bytes = synthetic_bi5(pair, hour, 500)
+
+                path: str = bi5_path(self.temp_dir, pair, hour)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as outs:
+                    outs.write(payload)
+
+                data: pd.DataFrame = FXTickDataProcessor(pair, hour).process(parser.parse(payload))
+                data.to_csv(os.path.join(self.temp_dir, pair + hour.strftime('%Y%m%dT%H%M%S') + '.tsv'), sep='\t', index=False)
+                FXTickDataProcessorSQLite(pair, hour).write(data, db, 'raw_ticks')
+                frames.append(data)
+
+            processed[pair] = pd.concat(frames, ignore_index=True)
+
+        start_date, end_date = self.start_date + timedelta(minutes=30), self.start_date + timedelta(hours=2, minutes=30)
+        trimmed: dict = {pair: data[(data['ts'] >= start_date) & (data['ts'] < end_date)] for pair, data in processed.items()}
+        expected: pd.DataFrame = self.expected(trimmed)
+
+        replays: list = [
+            FXTickDataReplay.from_tabular(FXTickDataTabularReader(self.temp_dir), list(processed), start_date, end_date),
+            FXTickDataReplay.from_sqlite(db, 'raw_ticks', list(processed), start_date, end_date),
+            FXTickDataReplay.from_bi5(self.temp_dir, list(processed), start_date, end_date)
+        ]
+
+        for replay in replays:
+            pd.testing.assert_frame_equal(pd.concat(list(replay), ignore_index=True), expected, check_exact=False)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
+import multiprocessing
 import os
 import subprocess
+import tempfile
 import unittest
 
 import sqlite3
@@ -7,7 +9,7 @@ import sqlite3
 import numpy as np
 import pandas as pd
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from pandas.util.testing import assert_frame_equal
@@ -17,6 +19,17 @@ from network.requester import FXTickDataRequester
 from processors.ticks import FXTickDataProcessorSQLite
 from tests.test_processors.test_base_processor import TestTickDataBaseUtils
 
+def _write_hour(path: str, db: str) -> int:
+    '''
+    Write a stored hour into the DB from a worker process.
+    '''
+
+    data: pd.DataFrame = pd.read_csv(path, sep='\t', parse_dates=['ts'])
+    request_date: datetime = datetime.strptime(os.path.basename(path)[6:21], '%Y%m%dT%H%M%S')
+    FXTickDataProcessorSQLite('EURUSD', request_date).write(data, db, 'raw_ticks')
+
+    return len(data)
+
 class TestTickDataSQLiteProcessor(TestTickDataBaseUtils, unittest.TestCase):
     '''
     Testing fixture for SQLite processing scripts.
@@ -141,4 +154,20 @@ class TestTickDataSQLiteProcessor(TestTickDataBaseUtils, unittest.TestCase):
             assert_frame_equal(proc_data, data)
 
         # Cleanup the testing DB.
-        self._delete_test_database()
\ No newline at end of file
+        self._delete_test_database()
+
+    def test_sqlite_concurrent_writers(self):
+        '''
+        Validate that workers writing to a new DB at once all succeed, and do
+        not race to create the table.
+        '''
+
+        paths: list = [os.path.join(self.data_path, file) for file in sorted(os.listdir(self.data_path)) if 'tsv' in file]
+        with tempfile.TemporaryDirectory() as tmp:
+            db: str = os.path.join(tmp, 'ticks.db')
+            with multiprocessing.Pool(len(paths)) as pool:
+                rows: list = pool.starmap(_write_hour, [(path, db) for path in paths])
+
+            with sqlite3.connect(db) as conn:
+                self.assertEqual(conn.execute('SELECT COUNT(*) FROM raw_ticks').fetchone()[0], sum(rows))
+
@@ -0,0 +1,69 @@
+import os
+import unittest
+
+import pandas as pd
+
+from datetime import datetime
+
+from processors.readers import FXTickDataTabularReader
+
+class TestTickDataTabularReader(unittest.TestCase):
+    '''
+    Testing fixture for reading time ranges from tabular outputs.
+    '''
+
+    def setUp(self):
+        self.currency: str = 'EURUSD'
+        self.data_path: str = 'tests/data/'
+        self.reader = FXTickDataTabularReader(self.data_path, max_workers=2)
+
+    def test_prunes_files_by_hour(self):
+        '''
+        Validate that only files overlapping the range are selected.
+        '''
+
+        files: list = self.reader.hourly_files(self.currency, datetime(2018, 10, 1, 12), datetime(2018, 10, 4))
+        self.assertEqual([hour for hour, path in files], [datetime(2018, 10, 2), datetime(2018, 10, 3)])
+
+        self.assertEqual(self.reader.hourly_files('GBPUSD', datetime(2018, 10, 1), datetime(2018, 10, 6)), [])
+
+    def test_read_range(self):
+        '''
+        Validate that a range is read in order and trimmed at its ends.
+        '''
+
+        data: pd.DataFrame = self.reader.read(self.currency, datetime(2018, 10, 1, 0, 30), datetime(2018, 10, 5))
+        full: pd.DataFrame = pd.read_csv(os.path.join(self.data_path, 'EURUSD20181001T000000.tsv'), sep='\t')
+
+        self.assertEqual(list(data.columns), ['ts', 'ask', 'bid', 'ask_volume', 'bid_volume'])
+        self.assertTrue(data['ts'].is_monotonic_increasing)
+        self.assertGreaterEqual(data['ts'].min(), datetime(2018, 10, 1, 0, 30))
+        self.assertLess(data['ts'].max(), datetime(2018, 10, 4, 1))
+        self.assertLess(len(data), 2001 + 2393 + 3071 + len(full) - 1)
+        self.assertEqual(len(data[data['ts'] >= datetime(2018, 10, 2)]), 2001 + 2393 + 3071)
+
+    def test_read_columns_and_chunks(self):
+        '''
+        Validate that only the requested columns are read, and that chunks
+        match the single frame.
+        '''
+
+        start_date, end_date = datetime(2018, 10, 1), datetime(2018, 10, 6)
+        data: pd.DataFrame = self.reader.read(self.currency, start_date, end_date, columns=['bid'])
+        self.assertEqual(list(data.columns), ['ts', 'bid'])
+
+        chunks: list = list(self.reader.iter_chunks(self.currency, start_date, end_date, columns=['bid']))
+        self.assertEqual(len(chunks), 5)
+        self.assertTrue(pd.concat(chunks, ignore_index=True).equals(data))
+
+        with self.assertRaises(Exception):
+            self.reader.read(self.currency, start_date, end_date, columns=['mid'])
+
+    def test_empty_range(self):
+        '''
+        Validate that a range with no files gives an empty frame.
+        '''
+
+        data: pd.DataFrame = self.reader.read(self.currency, datetime(2019, 1, 1), datetime(2019, 1, 2), columns=['ask'])
+        self.assertTrue(data.empty)
+        self.assertEqual(list(data.columns), ['ts', 'ask'])
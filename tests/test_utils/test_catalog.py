@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+import zlib
+
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from benchmarks.end_to_end import run_end_to_end
+from benchmarks.synthetic import synthetic_bi5
+from network.parser import FXTickDataParser
+from processors.ticks import FXTickDataProcessor
+from utils.catalog import FXTickDataCatalog, summarize_hour
+
+class TestTickDataCatalog(unittest.TestCase):
+    '''
+    Testing fixture for the catalog of stored hours.
+    '''
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.tmp.name, 'catalog.db')
+        self.monday: datetime = datetime(2018, 10, 1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def summary(self, pair: str, hour: datetime, ticks: int) -> dict:
+        raw_ticks: bytes = synthetic_bi5(pair, hour, ticks)
+        data: pd.DataFrame = FXTickDataProcessor(pair, hour).process(FXTickDataParser().parse(raw_ticks))
+
+        return summarize_hour(data, raw_ticks)
+
+    def test_summarize_hour(self):
+        '''
+        Validate the summary of an hour and of an empty hour.
+        '''
+
+        raw_ticks: bytes = synthetic_bi5('EURUSD', self.monday, 300)
+        data: pd.DataFrame = FXTickDataProcessor('EURUSD', self.monday).process(FXTickDataParser().parse(raw_ticks))
+        summary: dict = summarize_hour(data, raw_ticks)
+
+        self.assertEqual(summary['rows'], 300)
+        self.assertEqual(summary['first_ts'], data['ts'].min().isoformat())
+        self.assertEqual(summary['last_ts'], data['ts'].max().isoformat())
+        self.assertEqual((summary['min_bid'], summary['max_ask']), (data['bid'].min(), data['ask'].max()))
+        self.assertEqual((summary['raw_bytes'], summary['checksum']), (len(raw_ticks), zlib.crc32(raw_ticks)))
+
+        empty: dict = self.summary('EURUSD', self.monday, 0)
+        self.assertEqual((empty['rows'], empty['first_ts'], empty['min_bid']), (0, None, None))
+
+    def test_coverage_and_gaps(self):
+        '''
+        Validate stored hours, gaps between them and per pair aggregates.
+        '''
+
+        catalog = FXTickDataCatalog(self.path, commit_every=5)
+        missing: set = {self.monday + timedelta(hours=hours) for hours in [3, 4, 5, 20]}
+        for hours in range(24):
+            hour: datetime = self.monday + timedelta(hours=hours)
+            if hour not in missing:
+                catalog.record('EURUSD', hour, self.summary('EURUSD', hour, 0 if hours == 10 else 50))
+
+        catalog.record('GBPUSD', self.monday, self.summary('GBPUSD', self.monday, 20))
+
+        # Recording an hour again replaces it.
+        catalog.record('GBPUSD', self.monday, self.summary('GBPUSD', self.monday, 30))
+        catalog.close()
+
+        catalog = FXTickDataCatalog(self.path)
+        start_date, end_date = self.monday, self.monday + timedelta(days=1)
+        self.assertEqual(len(catalog.hours('EURUSD', start_date, end_date)), 20)
+        self.assertEqual(catalog.missing_hours('EURUSD', start_date, end_date), sorted(missing))
+        self.assertEqual(catalog.gaps('EURUSD', start_date, end_date), [
+            (self.monday + timedelta(hours=3), self.monday + timedelta(hours=6)),
+            (self.monday + timedelta(hours=20), self.monday + timedelta(hours=21))
+        ])
+        self.assertEqual(catalog.coverage('EURUSD', start_date, end_date), {'tradable': 24, 'stored': 20, 'missing': 4, 'coverage': 20 / 24})
+        self.assertEqual(catalog.entry('GBPUSD', self.monday)['rows'], 30)
+        self.assertIsNone(catalog.entry('GBPUSD', self.monday + timedelta(hours=1)))
+
+        summary: pd.DataFrame = catalog.summary(start_date, end_date)
+        self.assertEqual(list(summary['pair']), ['EURUSD', 'GBPUSD'])
+        self.assertEqual(list(summary['hours']), [20, 1])
+        self.assertEqual(list(summary['empty_hours']), [1, 0])
+        self.assertEqual(list(summary['rows']), [19 * 50, 30])
+        self.assertEqual(list(catalog.summary(pairs=['GBPUSD'])['pair']), ['GBPUSD'])
+        catalog.close()
+
+    def test_load_records_catalog(self):
+        '''
+        Validate that a run of the loading script catalogs every stored hour.
+        '''
+
+        run_end_to_end('EURUSD', '2018-10-01', '2018-10-01T04', 2, load_args=('--catalog', self.path), ticks=100)
+
+        catalog = FXTickDataCatalog(self.path)
+        start_date, end_date = self.monday, self.monday + timedelta(hours=4)
+        self.assertEqual(catalog.hours('EURUSD', start_date, end_date), [self.monday + timedelta(hours=hours) for hours in range(4)])
+        self.assertEqual(catalog.entry('EURUSD', self.monday)['rows'], 100)
+        self.assertEqual(catalog.gaps('EURUSD', start_date, end_date), [])
+        catalog.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from datetime import datetime, timedelta
+
+from utils.journal import FXTickDataJournal
+
+class TestUtilityJournal(unittest.TestCase):
+    '''
+    Test fixture for the completion journal.
+    '''
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = FXTickDataJournal(os.path.join(self.tmp.name, 'journal.tsv'))
+        self.start_date: datetime = datetime(2018, 10, 1)
+        self.tasks: list = [('EURUSD', self.start_date + timedelta(hours=i), ('tabular', 'sqlite')) for i in range(10)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_empty_journal(self):
+        '''
+        Validate that a missing journal filters nothing.
+        '''
+
+        self.assertEqual(self.journal.completed(), set())
+        self.assertEqual(list(self.journal.filter_tasks(self.tasks)), self.tasks)
+
+    def test_filter_completed_tasks(self):
+        '''
+        Validate that recorded hours are removed for the same sink only.
+        '''
+
+        for pair, request_date, sinks in self.tasks[:9]:
+            self.journal.record(pair, request_date, 'tabular')
+
+        for pair, request_date, sinks in self.tasks[:5]:
+            self.journal.record(pair, request_date, 'sqlite')
+
+        filtered: list = list(self.journal.filter_tasks(self.tasks))
+
+        self.assertEqual(len(filtered), 5)
+        self.assertEqual([sinks for pair, request_date, sinks in filtered], [('sqlite', )] * 4 + [('tabular', 'sqlite')])
+
+    def test_ignore_partial_entry(self):
+        '''
+        Validate that a torn line is ignored, whether it is the final line or
+        the next run appends after it.
+        '''
+
+        self.journal.record('EURUSD', self.start_date, 'tabular')
+        with open(self.journal.path, 'a') as outs:
+            outs.write('EURUSD\t2018-10-01T01:00:00\ttab')
+
+        self.assertEqual(self.journal.completed(), {('EURUSD', self.start_date, 'tabular')})
+
+        # The next run's first entry is not joined onto the torn line.
+        self.journal.record('EURUSD', self.start_date + timedelta(hours=2), 'tabular')
+        self.assertEqual(self.journal.completed(), {('EURUSD', self.start_date, 'tabular'), ('EURUSD', self.start_date + timedelta(hours=2), 'tabular')})
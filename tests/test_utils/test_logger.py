@@ -0,0 +1,84 @@
+import io
+import logging
+import multiprocessing
+import unittest
+
+from datetime import datetime, timedelta
+
+from utils.logger import FXTickDataLogSampler, init_worker_logging, start_log_listener
+
+START_HOUR: datetime = datetime(2018, 10, 1)
+
+def _log_hour(index: int) -> int:
+    '''
+    Log a sampled progress line and an error for one hour.
+    '''
+
+    hour: datetime = START_HOUR + timedelta(hours=index)
+    logging.getLogger().info('Progress for hour %s', hour, extra={'hour': hour})
+    logging.getLogger().debug('Debug for hour %s', hour, extra={'hour': hour})
+    if index == 3:
+        logging.getLogger().error('Error for hour %s', hour, extra={'hour': hour})
+
+    return index
+
+class TestUtilityLogger(unittest.TestCase):
+    '''
+    Test fixture for queue based multiprocess logging.
+    '''
+
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.handlers: list = self.root.handlers[:]
+        self.level: int = self.root.level
+
+    def tearDown(self):
+        for handler in self.root.handlers[:]:
+            self.root.removeHandler(handler)
+
+        for handler in self.handlers:
+            self.root.addHandler(handler)
+
+        self.root.setLevel(self.level)
+
+    def test_sampler(self):
+        '''
+        Validate that per-hour records are sampled and others always pass.
+        '''
+
+        sampler = FXTickDataLogSampler(2)
+        record = logging.LogRecord('test', logging.INFO, __file__, 0, 'message', None, None)
+        self.assertTrue(sampler.filter(record))
+
+        record.hour = START_HOUR + timedelta(hours=1)
+        self.assertFalse(sampler.filter(record))
+
+        record.hour = START_HOUR + timedelta(hours=2)
+        self.assertTrue(sampler.filter(record))
+
+        record.hour = START_HOUR + timedelta(hours=1)
+        record.levelno = logging.ERROR
+        self.assertTrue(sampler.filter(record))
+
+    def test_workers_log_through_listener(self):
+        '''
+        Validate that worker records reach the parent's single writer whole,
+        filtered by level and sampled by hour.
+        '''
+
+        stream = io.StringIO()
+        log_queue, listener = start_log_listener(logging.INFO, 2, stream=stream)
+        try:
+            with multiprocessing.Pool(2, initializer=init_worker_logging, initargs=(log_queue, logging.INFO, 2)) as pool:
+                self.assertEqual(sorted(pool.map(_log_hour, range(6))), list(range(6)))
+
+        finally:
+            listener.stop()
+
+        lines: list = stream.getvalue().splitlines()
+        progress: list = sorted(line.split('] ')[1] for line in lines if 'Progress' in line)
+
+        self.assertEqual(progress, [f'Progress for hour {START_HOUR + timedelta(hours=i)}' for i in (0, 2, 4)])
+        self.assertEqual(len([line for line in lines if 'Error for hour' in line]), 1)
+        self.assertFalse(any('Debug' in line for line in lines))
+        self.assertTrue(all(line.startswith('[') for line in lines))
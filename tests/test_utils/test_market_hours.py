@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+
+from datetime import datetime, timedelta
+
+from utils.market_hours import FXMarketCalendar, load_empty_hours, record_empty_hour
+
+class TestUtilityMarketHours(unittest.TestCase):
+    '''
+    Test fixture for the DST aware market calendar.
+    '''
+
+    def setUp(self):
+        self.calendar = FXMarketCalendar('EURUSD')
+
+    def test_summer_week(self):
+        '''
+        Validate the weekly open and close under US daylight saving time.
+        '''
+
+        hours: list = list(self.calendar.tradable_hours(datetime(2018, 7, 8), datetime(2018, 7, 15)))
+
+        # Sunday 17:00 EDT is 21:00 UTC, Friday 17:00 EDT is 21:00 UTC.
+        self.assertEqual(hours[0], datetime(2018, 7, 8, 21))
+        self.assertEqual(hours[-1], datetime(2018, 7, 13, 20))
+        self.assertEqual(len(hours), 120)
+
+    def test_winter_week(self):
+        '''
+        Validate the weekly open and close under US standard time.
+        '''
+
+        hours: list = list(self.calendar.tradable_hours(datetime(2018, 1, 14), datetime(2018, 1, 21)))
+
+        # Sunday 17:00 EST is 22:00 UTC, Friday 17:00 EST is 22:00 UTC.
+        self.assertEqual(hours[0], datetime(2018, 1, 14, 22))
+        self.assertEqual(hours[-1], datetime(2018, 1, 19, 21))
+        self.assertEqual(len(hours), 120)
+
+    def test_dst_transition_week(self):
+        '''
+        Validate a week in which the US clocks move forward.
+        '''
+
+        hours: list = list(self.calendar.tradable_hours(datetime(2018, 3, 11), datetime(2018, 3, 18)))
+
+        # Clocks change at 02:00 local on Sunday, before the 17:00 open.
+        self.assertEqual(hours[0], datetime(2018, 3, 11, 21))
+        self.assertEqual(hours[-1], datetime(2018, 3, 16, 20))
+
+    def test_holiday_closure(self):
+        '''
+        Validate that the trading day ending on Christmas is skipped.
+        '''
+
+        hours: set = set(self.calendar.tradable_hours(datetime(2018, 12, 23), datetime(2018, 12, 30)))
+
+        self.assertNotIn(datetime(2018, 12, 24, 22), hours)
+        self.assertNotIn(datetime(2018, 12, 25, 21), hours)
+        self.assertIn(datetime(2018, 12, 24, 21), hours)
+        self.assertIn(datetime(2018, 12, 25, 22), hours)
+        self.assertEqual(len(hours), 120 - 24)
+
+    def test_metals_daily_break(self):
+        '''
+        Validate that metals pause for an hour every trading day.
+        '''
+
+        calendar = FXMarketCalendar('XAUUSD')
+        hours: set = set(calendar.tradable_hours(datetime(2018, 7, 8), datetime(2018, 7, 15)))
+
+        # Metals reopen at 18:00 EDT on Sunday and break at 17:00 EDT daily.
+        self.assertNotIn(datetime(2018, 7, 8, 21), hours)
+        self.assertNotIn(datetime(2018, 7, 10, 21), hours)
+        self.assertIn(datetime(2018, 7, 10, 22), hours)
+        self.assertEqual(len(hours), 120 - 5)
+
+    def test_partial_range(self):
+        '''
+        Validate that ranges starting mid session keep the hourly grid.
+        '''
+
+        hours: list = list(self.calendar.tradable_hours(datetime(2018, 7, 10, 5), datetime(2018, 7, 10, 8)))
+        self.assertEqual(hours, [datetime(2018, 7, 10, hour) for hour in range(5, 8)])
+
+    def test_empty_hours(self):
+        '''
+        Validate that learned empty hours are skipped and only recorded once
+        they are old enough.
+        '''
+
+        empty_hour: datetime = datetime(2018, 7, 10, 5)
+        with tempfile.TemporaryDirectory() as tmp:
+            path: str = os.path.join(tmp, 'empty_hours.tsv')
+            self.assertTrue(record_empty_hour(path, 'EURUSD', empty_hour))
+            self.assertFalse(record_empty_hour(path, 'EURUSD', empty_hour, now=empty_hour + timedelta(hours=1)))
+
+            empty_hours: dict = load_empty_hours(path)
+
+        self.assertEqual(empty_hours, {'EURUSD': {empty_hour}})
+
+        calendar = FXMarketCalendar('EURUSD', empty_hours['EURUSD'])
+        hours: list = list(calendar.tradable_hours(datetime(2018, 7, 10, 5), datetime(2018, 7, 10, 8)))
+        self.assertEqual(hours, [datetime(2018, 7, 10, 6), datetime(2018, 7, 10, 7)])
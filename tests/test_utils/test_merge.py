@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from unittest import mock
+
+import pandas as pd
+
+from datetime import datetime
+
+from processors.ticks import FXTickDataProcessorSQLite, FXTickDataProcessorTabular
+from utils.merge import merge_sqlite, merge_tabular
+from utils.scheduler import interleave_tasks, shard_tasks
+
+class TestUtilityMerge(unittest.TestCase):
+    '''
+    Test fixture for sharded runs and merging their outputs.
+    '''
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pairs: list = ['EURUSD', 'GBPUSD']
+        self.shard_count: int = 3
+        self.tasks: list = list(interleave_tasks(self.pairs, datetime(2018, 10, 1), datetime(2018, 10, 2)))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _ticks(self, pair: str, request_date: datetime) -> pd.DataFrame:
+        '''
+        Build a small frame of processed ticks for an hour.
+        '''
+
+        return pd.DataFrame({
+            'ts'            : [request_date + pd.Timedelta(seconds=i) for i in range(3)],
+            'ask'           : [1.1, 1.2, 1.3],
+            'bid'           : [1.0, 1.1, 1.2],
+            'ask_volume'    : [1.0, 2.0, 3.0],
+            'bid_volume'    : [1.0, 2.0, 3.0]
+        })
+
+    def _write_shards(self) -> tuple:
+        '''
+        Write every shard's slice of the tasks into its own local outputs.
+        '''
+
+        shard_paths: list = []
+        shard_dbs: list = []
+        for shard_index in range(self.shard_count):
+            shard_path: str = os.path.join(self.tmp.name, f'shard{shard_index}')
+            os.mkdir(shard_path)
+            shard_paths.append(shard_path)
+            shard_dbs.append(os.path.join(shard_path, 'ticks.db'))
+
+            for pair, request_date in shard_tasks(self.tasks, shard_index, self.shard_count):
+                FXTickDataProcessorTabular(pair, request_date).write(self._ticks(pair, request_date), shard_path)
+                FXTickDataProcessorSQLite(pair, request_date).write(self._ticks(pair, request_date), shard_dbs[-1], 'raw_ticks')
+
+        return shard_paths, shard_dbs
+
+    def test_shards_are_disjoint(self):
+        '''
+        Validate that shards split the tasks into a disjoint cover.
+        '''
+
+        for shard_count in range(1, 5):
+            shards: list = [list(shard_tasks(self.tasks, i, shard_count)) for i in range(shard_count)]
+
+            self.assertEqual(sorted(task for shard in shards for task in shard), sorted(self.tasks))
+            self.assertTrue(all(len(shard) > len(self.tasks) / shard_count / 2 for shard in shards))
+
+        with self.assertRaises(Exception):
+            list(shard_tasks(self.tasks, 3, 3))
+
+    def test_merge_tabular(self):
+        '''
+        Validate that shard directories merge into one complete directory.
+        '''
+
+        shard_paths, shard_dbs = self._write_shards()
+        opath: str = os.path.join(self.tmp.name, 'merged')
+        os.mkdir(opath)
+
+        self.assertEqual(merge_tabular(shard_paths, opath), len(self.tasks))
+        self.assertEqual(len(os.listdir(opath)), len(self.tasks))
+
+        # Merging again is a no-op.
+        self.assertEqual(merge_tabular(shard_paths, opath), 0)
+
+    def test_merge_sqlite(self):
+        '''
+        Validate that shard databases merge into one sorted table.
+        '''
+
+        shard_paths, shard_dbs = self._write_shards()
+        db: str = os.path.join(self.tmp.name, 'merged.db')
+
+        self.assertEqual(merge_sqlite(shard_dbs, db, 'raw_ticks'), 3 * len(self.tasks))
+
+        with sqlite3.connect(db) as conn:
+            rows: list = conn.execute('SELECT ts, pair FROM raw_ticks').fetchall()
+
+        self.assertEqual(rows, sorted(rows))
+        self.assertEqual(len(set(rows)), 3 * len(self.tasks))
+
+        # Merging again is a no-op.
+        self.assertEqual(merge_sqlite(shard_dbs, db, 'raw_ticks'), 0)
+
+        # Shards attached in several batches are still inserted in one order.
+        batched: str = os.path.join(self.tmp.name, 'batched.db')
+        with mock.patch('utils.merge.MAX_ATTACHED', 1):
+            self.assertEqual(merge_sqlite(shard_dbs, batched, 'raw_ticks'), 3 * len(self.tasks))
+
+        with sqlite3.connect(batched) as conn:
+            self.assertEqual(conn.execute('SELECT ts, pair FROM raw_ticks ORDER BY rowid').fetchall(), rows)
+
+        with sqlite3.connect(db) as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM raw_ticks').fetchone()[0], 3 * len(self.tasks))
+
+    def test_merge_sqlite_with_features(self):
+        '''
+        Validate that shards loaded with and without feature columns merge in
+        either order, within one batch of attached shards or across batches.
+        '''
+
+        hour: datetime = datetime(2018, 10, 1)
+        plain: str = os.path.join(self.tmp.name, 'plain.db')
+        featured: str = os.path.join(self.tmp.name, 'featured.db')
+        FXTickDataProcessorSQLite('EURUSD', hour).write(self._ticks('EURUSD', hour), plain, 'raw_ticks')
+        FXTickDataProcessorSQLite('GBPUSD', hour).write(self._ticks('GBPUSD', hour).assign(mid=1.05, spread=0.1), featured, 'raw_ticks')
+
+        for max_attached in [9, 1]:
+            for shard_dbs in [[plain, featured], [featured, plain]]:
+                db: str = os.path.join(self.tmp.name, f'merged{max_attached}{shard_dbs[0] == plain}.db')
+                with mock.patch('utils.merge.MAX_ATTACHED', max_attached):
+                    self.assertEqual(merge_sqlite(shard_dbs, db, 'raw_ticks'), 6)
+
+                with sqlite3.connect(db) as conn:
+                    merged: pd.DataFrame = pd.read_sql_query('SELECT * FROM raw_ticks ORDER BY pair, ts', conn)
+
+                self.assertEqual(set(merged.columns), {'ts', 'pair', 'ask', 'bid', 'ask_volume', 'bid_volume', 'mid', 'spread'})
+                self.assertTrue(merged.loc[merged['pair'] == 'EURUSD', 'mid'].isna().all())
+                self.assertEqual(list(merged.loc[merged['pair'] == 'GBPUSD', 'mid']), [1.05] * 3)
@@ -0,0 +1,65 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from datetime import datetime
+
+from utils.profiling import FXTickDataProfiledCall, PROFILE_REPORT, prepare_profile_dir, write_profile_report
+from utils.stats import FXTickDataPipelineStats, FXTickDataRunStats, format_summary
+
+def _allocate_hour(hour: int) -> FXTickDataPipelineStats:
+    '''
+    Allocate a block of memory inside a timed stage.
+    '''
+
+    record = FXTickDataPipelineStats('EURUSD', datetime(2018, 10, 1, hour))
+    with record.timer('process'):
+        block: list = [0] * 100000
+        del block
+
+    record.success = True
+    return record
+
+class TestUtilityProfiling(unittest.TestCase):
+    '''
+    Test fixture for profiling pipeline calls in pool workers.
+    '''
+
+    def test_merged_worker_profiles(self):
+        '''
+        Validate that every worker's profile is merged into one report and
+        stage peak allocations are recorded.
+        '''
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Stale profiles from an earlier run are removed.
+            with open(os.path.join(tmp, 'worker-1.prof'), 'w') as outs:
+                outs.write('stale')
+
+            prepare_profile_dir(tmp)
+            with multiprocessing.Pool(2) as pool:
+                records: list = pool.map(FXTickDataProfiledCall(_allocate_hour, tmp, trace_memory=True), range(6))
+
+            report: str = write_profile_report(tmp)
+            self.assertTrue(os.path.exists(os.path.join(tmp, PROFILE_REPORT)))
+            self.assertNotIn('worker-1.prof', report)
+
+        # Calls from both workers are counted in the merged report.
+        line: str = next(line for line in report.splitlines() if '_allocate_hour' in line)
+        self.assertEqual(line.split()[0], '6')
+
+        run_stats = FXTickDataRunStats()
+        for record in records:
+            self.assertGreater(record.memory_peaks['process'], 100000 * 8 // 2)
+            run_stats.add(record)
+
+        self.assertIn('Stage process: peak allocation', format_summary(run_stats.summary(1.0))[-1])
+
+    def test_no_profiles(self):
+        '''
+        Validate that no report is written when no worker was profiled.
+        '''
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(write_profile_report(tmp))
@@ -0,0 +1,170 @@
+import multiprocessing
+import time
+import unittest
+
+from datetime import datetime
+
+from utils import tools
+from utils.instruments import CURRENCY_FACTOR_MAP, MAJOR_CURRENCIES
+from utils.scheduler import FXTickDataReorderBuffer, FXTickDataScheduler, interleave_tasks
+
+def _square(value: int) -> int:
+    '''
+    Square a value, raising for negative values.
+    '''
+
+    if value < 0:
+        raise ValueError(f'Negative value: {value}')
+
+    return value * value
+
+def _delayed(value: int, delay: float) -> int:
+    '''
+    Return a value after a delay.
+    '''
+
+    time.sleep(delay)
+    return value
+
+class _CountingCalls():
+    '''
+    Iterable of calls which records the peak scheduler window while it is read.
+    '''
+
+    def __init__(self, values: list):
+        self.values: list = values
+        self.scheduler = None
+        self.peak_in_flight: int = 0
+
+    def __iter__(self):
+        for value in self.values:
+            self.peak_in_flight = max(self.peak_in_flight, self.scheduler.in_flight)
+            yield value, _square, (value, )
+
+class TestUtilityScheduler(unittest.TestCase):
+    '''
+    Test fixture for scheduling hourly tasks across pairs.
+    '''
+
+    def setUp(self):
+        self.pairs: list = ['EURUSD', 'USDJPY', 'XAUUSD']
+        self.start_date: datetime = datetime(2018, 10, 1)
+        self.end_date: datetime = datetime(2018, 10, 3)
+
+    def test_interleaved_order(self):
+        '''
+        Validate that tasks are ordered by hour and then by pair.
+        '''
+
+        tasks: list = list(interleave_tasks(self.pairs, self.start_date, self.end_date))
+
+        self.assertEqual(tasks[:3], [(pair, self.start_date) for pair in sorted(self.pairs)])
+        self.assertEqual(tasks, sorted(tasks, key=lambda task: (task[1], task[0])))
+
+    def test_interleaved_coverage(self):
+        '''
+        Validate that every pair receives every valid hour exactly once.
+        '''
+
+        tasks: list = list(interleave_tasks(self.pairs, self.start_date, self.end_date))
+
+        self.assertEqual(len(tasks), len(set(tasks)))
+        for pair in self.pairs:
+            hours: list = list(tools.valid_date_range(self.start_date, self.end_date, pair))
+            self.assertEqual([date for task_pair, date in tasks if task_pair == pair], hours)
+
+    def test_instrument_universe(self):
+        '''
+        Validate that all majors and crosses are known with the correct scale.
+        '''
+
+        pairs: list = [pair for pair in CURRENCY_FACTOR_MAP if pair[:3] in MAJOR_CURRENCIES and pair[3:] in MAJOR_CURRENCIES]
+
+        self.assertEqual(len(pairs), 28)
+        for pair in pairs:
+            self.assertEqual(CURRENCY_FACTOR_MAP[pair], 1e3 if 'JPY' in pair else 1e5)
+
+    def test_bounded_scheduler_results(self):
+        '''
+        Validate that every call completes and errors are passed through.
+        '''
+
+        calls = _CountingCalls(list(range(-2, 50)))
+        with multiprocessing.Pool(processes=2) as pool:
+            scheduler = FXTickDataScheduler(pool, 3)
+            calls.scheduler = scheduler
+            results: list = list(scheduler.run(calls))
+
+        self.assertEqual(len(results), 52)
+        self.assertEqual(scheduler.failed, 2)
+        self.assertEqual(scheduler.in_flight, 0)
+        self.assertLessEqual(calls.peak_in_flight, 3)
+        self.assertEqual(sorted(result for task, result, error in results if error is None), [i * i for i in range(50)])
+        self.assertTrue(all(isinstance(error, ValueError) for task, result, error in results if task < 0))
+
+    def test_reorder_buffer(self):
+        '''
+        Validate that results are released in submission order per pair, as
+        soon as every earlier hour of the pair has completed.
+        '''
+
+        hours: list = [datetime(2018, 10, 1, hour) for hour in range(3)]
+        calls: list = [((pair, hour, ('tabular', )), None, ()) for hour in hours for pair in ['EURUSD', 'GBPUSD']]
+
+        buffer = FXTickDataReorderBuffer()
+        self.assertEqual(list(buffer.track(calls)), calls)
+
+        # Completion order: GBPUSD runs ahead, EURUSD's first hour is slow.
+        completions: list = [(calls[index][0], index, None) for index in [3, 1, 5, 2, 4, 0]]
+        released: list = []
+        for completion in completions:
+            released.extend((task[0], task[1]) for task, result, error in buffer.release([completion]))
+            if completion[1] == 1:
+                self.assertEqual(released, [('GBPUSD', hours[0]), ('GBPUSD', hours[1])])
+
+        self.assertEqual([hour for pair, hour in released if pair == 'EURUSD'], hours)
+        self.assertEqual([hour for pair, hour in released if pair == 'GBPUSD'], hours)
+        self.assertEqual(released[-3:], [('EURUSD', hour) for hour in hours])
+        self.assertEqual(buffer.pending, {})
+
+    def test_reorder_buffer_window(self):
+        '''
+        Validate that results held behind a delayed hour count against the
+        scheduler window, so the buffer stays bounded.
+        '''
+
+        hours: list = [datetime(2018, 10, 1, hour) for hour in range(20)]
+        calls: list = [(('EURUSD', hour, ('tabular', )), _delayed, (index, 0.5 if index == 0 else 0.0)) for index, hour in enumerate(hours)]
+
+        buffer = FXTickDataReorderBuffer()
+        peak_held: int = 0
+        with multiprocessing.Pool(processes=2) as pool:
+            scheduler = FXTickDataScheduler(pool, 3, buffer.held)
+            released: list = []
+            for task, result, error in buffer.release(scheduler.run(buffer.track(calls))):
+                peak_held = max(peak_held, buffer.held())
+                self.assertLessEqual(scheduler.in_flight + buffer.held(), 3)
+                released.append(result)
+
+        self.assertEqual(released, list(range(20)))
+        self.assertLessEqual(peak_held, 2)
+        self.assertEqual(buffer.held(), 0)
+
+    def test_drain_after_early_stop(self):
+        '''
+        Validate that results completed but not yielded, when the consumer
+        stops early, are handed back by drain.
+        '''
+
+        with multiprocessing.Pool(processes=2) as pool:
+            scheduler = FXTickDataScheduler(pool, 3)
+            results = scheduler.run((value, _delayed, (value, 0.0)) for value in range(10))
+            first: tuple = next(results)
+
+            # Let the other calls of the window finish without handling them.
+            time.sleep(0.5)
+            drained: list = scheduler.drain()
+
+        self.assertEqual(len(drained), 2)
+        self.assertEqual(sorted(result for task, result, error in drained + [first]), sorted(task for task, result, error in drained + [first]))
+        self.assertEqual(scheduler.drain(), [])
@@ -0,0 +1,142 @@
+import json
+import multiprocessing
+import subprocess
+import sys
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from datetime import datetime
+from multiprocessing import shared_memory
+
+from utils.shared_frames import FXTickDataSharedFrame
+
+REQUEST_DATE: datetime = datetime(2018, 10, 1, 3)
+
+# Shares an hour in a fresh interpreter, with its own resource tracker, and
+# exits without unlinking the blocks.
+EXIT_WITHOUT_UNLINK: str = '''
+import json, sys
+from tests.test_utils.test_shared_frames import _share_hour
+
+shared_frame = _share_hour(10)
+if sys.argv[1] == 'adopt':
+    shared_frame.adopt()
+
+print(json.dumps([name for column, name, dtype in shared_frame.columns]))
+'''
+
+def _share_hour(ticks: int) -> FXTickDataSharedFrame:
+    '''
+    Build a processed hour in a worker and hand it over in shared memory.
+    '''
+
+    data: pd.DataFrame = pd.DataFrame({
+        'ts'    : REQUEST_DATE + pd.to_timedelta(np.arange(ticks) * 100, unit='ms'),
+        'ask'   : 1.16 + np.arange(ticks) * 1e-5,
+        'bid'   : 1.16 + np.arange(ticks) * 1e-5 - 2e-5
+    })
+
+    return FXTickDataSharedFrame.create(data, 'EURUSD', REQUEST_DATE)
+
+class TestUtilitySharedFrames(unittest.TestCase):
+    '''
+    Test fixture for handing frames between processes in shared memory.
+    '''
+
+    def test_handoff_between_processes(self):
+        '''
+        Validate that a frame created in a worker is read by the parent and
+        released once unlinked.
+        '''
+
+        with multiprocessing.Pool(1) as pool:
+            shared_frame: FXTickDataSharedFrame = pool.apply(_share_hour, (1000, ))
+
+        # The worker has exited, and the blocks outlive it.
+        try:
+            with shared_frame.attach() as data:
+                self.assertEqual(list(data.columns), ['ts', 'ask', 'bid'])
+                self.assertEqual(len(data), 1000)
+                self.assertEqual(data['ts'].iloc[-1], pd.Timestamp(REQUEST_DATE) + pd.Timedelta(milliseconds=99900))
+                self.assertAlmostEqual(data['ask'].iloc[10], 1.1601)
+
+        finally:
+            shared_frame.unlink()
+
+        for column, name, dtype in shared_frame.columns:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+
+        # Unlinking twice is harmless.
+        shared_frame.unlink()
+
+    def test_empty_frame(self):
+        '''
+        Validate that empty hours can be shared.
+        '''
+
+        shared_frame: FXTickDataSharedFrame = _share_hour(0)
+        try:
+            with shared_frame.attach() as data:
+                self.assertTrue(data.empty)
+                self.assertEqual(list(data.columns), ['ts', 'ask', 'bid'])
+
+        finally:
+            shared_frame.unlink()
+
+    def test_rejects_object_columns(self):
+        '''
+        Validate that non-numeric columns are rejected without leaking blocks.
+        '''
+
+        data: pd.DataFrame = pd.DataFrame({'ask': [1.0, 2.0], 'pair': ['EURUSD', 'EURUSD']})
+        with self.assertRaises(Exception):
+            FXTickDataSharedFrame.create(data, 'EURUSD', REQUEST_DATE)
+
+    def _exists(self, name: str) -> bool:
+        try:
+            shared_memory.SharedMemory(name=name).close()
+
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'Relies on the POSIX resource tracker')
+    def test_adopted_blocks_removed_on_exit(self):
+        '''
+        Validate that adopted blocks are removed when their owner exits
+        without unlinking them, and that blocks not adopted outlive it.
+        '''
+
+        for mode in ['adopt', 'handoff']:
+            names: list = json.loads(subprocess.run([sys.executable, '-c', EXIT_WITHOUT_UNLINK, mode], check=True, capture_output=True, text=True).stdout)
+            self.assertEqual(len(names), 3)
+
+            # The tracker cleans up shortly after the interpreter exits.
+            deadline: float = time.monotonic() + 10
+            while mode == 'adopt' and any(self._exists(name) for name in names) and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            if mode == 'adopt':
+                self.assertFalse(any(self._exists(name) for name in names))
+
+            else:
+                self.assertTrue(all(self._exists(name) for name in names))
+                FXTickDataSharedFrame('EURUSD', REQUEST_DATE, 10, [(None, name, '<f8') for name in names]).unlink()
+
+    def test_unlink_adopted(self):
+        '''
+        Validate that adopted blocks unlink cleanly, once or twice.
+        '''
+
+        shared_frame: FXTickDataSharedFrame = _share_hour(10)
+        shared_frame.adopt()
+        shared_frame.unlink()
+        shared_frame.unlink()
+
+        self.assertFalse(shared_frame.adopted)
+        self.assertFalse(any(self._exists(name) for column, name, dtype in shared_frame.columns))
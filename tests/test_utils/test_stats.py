@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+
+from datetime import datetime, timedelta
+
+from utils.stats import FXTickDataPipelineStats, FXTickDataRunStats, FXTickDataStatsWriter, STAGES, format_summary, summarize_stats
+
+class TestUtilityStats(unittest.TestCase):
+    '''
+    Test fixture for pipeline run statistics.
+    '''
+
+    def setUp(self):
+        self.currency: str = 'EURUSD'
+        self.start_date: datetime = datetime(2018, 10, 1)
+
+        # Build ten records with increasing volumes and timings.
+        self.records: list = []
+        for i in range(10):
+            record = FXTickDataPipelineStats(self.currency, self.start_date + timedelta(hours=i))
+            record.success = i != 0
+            record.rows = 100 * (i + 1)
+            record.bytes_downloaded = 1000 * (i + 1)
+            record.retries = i % 2
+            record.timings['http'] = 0.1 * (i + 1)
+            self.records.append(record)
+
+    def test_timer_accumulates(self):
+        '''
+        Validate that the stage timer adds elapsed time to the stage.
+        '''
+
+        record = FXTickDataPipelineStats(self.currency, self.start_date)
+        with record.timer('write'):
+            pass
+
+        with record.timer('write'):
+            pass
+
+        self.assertGreater(record.timings['write'], 0.0)
+        self.assertEqual(set(record.timings.keys()), set(STAGES))
+
+    def test_summary_totals(self):
+        '''
+        Validate the totals and throughput of the summary.
+        '''
+
+        summary: dict = summarize_stats(self.records, 2.0)
+
+        self.assertEqual(summary['hours'], 10)
+        self.assertEqual(summary['succeeded'], 9)
+        self.assertEqual(summary['failed'], 1)
+        self.assertEqual(summary['rows'], 5500)
+        self.assertEqual(summary['retries'], 5)
+        self.assertAlmostEqual(summary['ticks_per_second'], 2750.0)
+        self.assertAlmostEqual(summary['mb_per_second'], 0.0275)
+
+    def test_summary_percentiles(self):
+        '''
+        Validate nearest rank percentiles for a stage.
+        '''
+
+        stage: dict = summarize_stats(self.records, 1.0)['stages']['http']
+
+        self.assertAlmostEqual(stage['p50'], 0.5)
+        self.assertAlmostEqual(stage['p90'], 0.9)
+        self.assertAlmostEqual(stage['p99'], 1.0)
+        self.assertAlmostEqual(stage['max'], 1.0)
+        self.assertEqual(len(format_summary(summarize_stats(self.records, 1.0))), 3 + len(STAGES))
+
+    def test_streaming_summary(self):
+        '''
+        Validate that the streaming aggregate matches the list summary.
+        '''
+
+        run_stats = FXTickDataRunStats()
+        for record in self.records:
+            run_stats.add(record)
+
+        self.assertEqual(run_stats.summary(2.0), summarize_stats(self.records, 2.0))
+
+    def test_write_stats(self):
+        '''
+        Validate that records and summary are streamed as JSON.
+        '''
+
+        summary: dict = summarize_stats(self.records, 1.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path: str = os.path.join(tmp, 'stats.json')
+            stats_writer = FXTickDataStatsWriter(path)
+            for record in self.records:
+                stats_writer.write(record)
+
+            stats_writer.close(summary)
+
+            with open(path) as ins:
+                saved: dict = json.load(ins)
+
+        self.assertEqual(saved['summary']['rows'], 5500)
+        self.assertEqual(len(saved['records']), 10)
+        self.assertEqual(saved['records'][0]['request_date'], '2018-10-01T00:00:00')
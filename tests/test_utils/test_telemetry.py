@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import urllib.request
+
+from datetime import datetime
+
+from utils.stats import FXTickDataPipelineStats
+from utils.telemetry import FXTickDataMetricsFile, FXTickDataMetricsServer, FXTickDataTelemetry
+
+class TestUtilityTelemetry(unittest.TestCase):
+    '''
+    Test fixture for live metrics.
+    '''
+
+    def setUp(self):
+        self.telemetry = FXTickDataTelemetry(processes=4)
+
+        for i in range(3):
+            record = FXTickDataPipelineStats('EURUSD', datetime(2018, 10, 1, i))
+            record.success = i != 2
+            record.failed_stage = 'http' if i == 2 else None
+            record.rows = 100
+            record.bytes_downloaded = 1000
+            record.retries = 1
+            record.timings['http'] = 0.5
+            self.telemetry.observe(record)
+
+    def test_render_metrics(self):
+        '''
+        Validate counters in the rendered metrics.
+        '''
+
+        metrics: str = self.telemetry.render()
+
+        self.assertIn('fx_loader_hours_completed_total 3\n', metrics)
+        self.assertIn('fx_loader_hours_failed_total{stage="http"} 1\n', metrics)
+        self.assertIn('fx_loader_ticks_total 300\n', metrics)
+        self.assertIn('fx_loader_retries_total 3\n', metrics)
+        self.assertIn('fx_loader_stage_seconds_total{stage="http"} 1.500000\n', metrics)
+        self.assertIn('fx_loader_in_flight 0\n', metrics)
+
+    def test_metrics_server(self):
+        '''
+        Validate the metrics are served over HTTP.
+        '''
+
+        server = FXTickDataMetricsServer(self.telemetry, 0)
+        server.start()
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/metrics') as resp:
+                body: str = resp.read().decode()
+
+        finally:
+            server.stop()
+
+        self.assertIn('fx_loader_ticks_total 300\n', body)
+
+    def test_metrics_file(self):
+        '''
+        Validate the metrics file is written on stop.
+        '''
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path: str = os.path.join(tmp, 'metrics.prom')
+            metrics_file = FXTickDataMetricsFile(self.telemetry, path, 60.0)
+            metrics_file.start()
+            metrics_file.stop()
+
+            with open(path) as ins:
+                self.assertIn('fx_loader_bytes_total 3000\n', ins.read())
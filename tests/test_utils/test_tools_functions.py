@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 from datetime import datetime
@@ -90,3 +92,36 @@ class TestUtilityToolsFunctions(unittest.TestCase):
         with self.assertRaises(Exception):
             tools.parse_currency_pairs(1234)
             tools.parse_currency_pairs('EURUSDJPY')
+
+    def test_pair_list_parser_output(self):
+        '''
+        Validate the function parses comma separated lists of pairs.
+        '''
+
+        parsed: list = tools.parse_pair_list('EURUSD, usdjpy,EURUSD,XAUUSD')
+        self.assertEqual(parsed, ['EURUSD', 'USDJPY', 'XAUUSD'])
+
+    def test_pair_list_parser_file(self):
+        '''
+        Validate the function reads pairs from a file.
+        '''
+
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as outs:
+            outs.write('# Majors\nEURUSD\nGBPUSD,USDJPY\n\n')
+
+        try:
+            self.assertEqual(tools.parse_pair_list(outs.name), ['EURUSD', 'GBPUSD', 'USDJPY'])
+
+        finally:
+            os.remove(outs.name)
+
+    def test_pair_list_parser_exception_handling(self):
+        '''
+        Validate that the function rejects malformed and empty lists.
+        '''
+
+        with self.assertRaises(Exception):
+            tools.parse_pair_list('EURUSD,EURUSDJPY')
+
+        with self.assertRaises(Exception):
+            tools.parse_pair_list(',')
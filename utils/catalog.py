@@ -0,0 +1,252 @@
+'''
+Catalog of stored hours with per-hour coverage and statistics.
+
+Pipelines summarize each hour as they process it and the loading process
+records the summaries in a SQLite side table, so questions about which hours
+exist, where the gaps are and what the data looks like are answered from the
+catalog instead of by scanning the stored ticks.
+'''
+
+import sqlite3
+import zlib
+
+import pandas as pd
+
+from typing import Optional
+
+from datetime import datetime, timedelta
+
+from utils.market_hours import FXMarketCalendar
+
+CATALOG_TABLE: str = 'hour_catalog'
+
+# Per-hour columns, in table order after the pair and hour.
+CATALOG_COLUMNS: tuple = ('rows', 'first_ts', 'last_ts', 'min_bid', 'max_bid', 'min_ask', 'max_ask', 'raw_bytes', 'checksum')
+
+def summarize_hour(data: pd.DataFrame, raw_ticks: bytes) -> dict:
+    '''
+    Summarize an hour of processed tick data for the catalog.
+
+    :params data: DataFrame containing processed tick data.
+    :params raw_ticks: Raw response the hour was parsed from.
+    :returns summary: Dictionary of the catalog columns.
+    '''
+
+    summary: dict = {
+        'rows'      : len(data),
+        'first_ts'  : None,
+        'last_ts'   : None,
+        'min_bid'   : None,
+        'max_bid'   : None,
+        'min_ask'   : None,
+        'max_ask'   : None,
+        'raw_bytes' : len(raw_ticks),
+        'checksum'  : zlib.crc32(raw_ticks)
+    }
+
+    if len(data):
+        bid, ask = data['bid'].to_numpy(), data['ask'].to_numpy()
+        summary.update({
+            'first_ts'  : pd.Timestamp(data['ts'].iloc[0]).isoformat(),
+            'last_ts'   : pd.Timestamp(data['ts'].iloc[-1]).isoformat(),
+            'min_bid'   : float(bid.min()),
+            'max_bid'   : float(bid.max()),
+            'min_ask'   : float(ask.min()),
+            'max_ask'   : float(ask.max())
+        })
+
+    return summary
+
+class FXTickDataCatalog():
+    '''
+    SQLite catalog of stored hours keyed by pair and hour.
+
+    NOTE: Only the loading process writes to the catalog, so workers never
+          contend for the database lock.
+    '''
+
+    def __init__(self, path: str, commit_every: int = 500):
+        '''
+        :params path: Path to the catalog database. It is created if missing.
+        :params commit_every: Number of recorded hours between commits.
+        '''
+
+        self.path: str = path
+        self.commit_every: int = commit_every
+        self.pending: int = 0
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {CATALOG_TABLE}
+            (
+                pair TEXT NOT NULL,
+                hour TEXT NOT NULL,
+                rows INTEGER NOT NULL,
+                first_ts TEXT,
+                last_ts TEXT,
+                min_bid REAL,
+                max_bid REAL,
+                min_ask REAL,
+                max_ask REAL,
+                raw_bytes INTEGER NOT NULL,
+                checksum INTEGER NOT NULL,
+                PRIMARY KEY (pair, hour)
+            ) WITHOUT ROWID
+        ''')
+        self.conn.commit()
+
+    def record(self, pair: str, hour: datetime, summary: dict) -> None:
+        '''
+        Record or replace the summary of a stored hour.
+
+        :params pair: Currency pair of the hour.
+        :params hour: Datetime of the hour.
+        :params summary: Dictionary produced by summarize_hour.
+        '''
+
+        placeholders: str = ', '.join('?' * (len(CATALOG_COLUMNS) + 2))
+        self.conn.execute(f'INSERT OR REPLACE INTO {CATALOG_TABLE} VALUES ({placeholders})',
+                          (pair, hour.isoformat()) + tuple(summary[column] for column in CATALOG_COLUMNS))
+
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.commit()
+
+    def commit(self) -> None:
+        '''
+        Commit recorded hours.
+        '''
+
+        self.conn.commit()
+        self.pending = 0
+
+    def close(self) -> None:
+        '''
+        Commit recorded hours and close the catalog.
+        '''
+
+        self.commit()
+        self.conn.close()
+
+    def entry(self, pair: str, hour: datetime) -> Optional[dict]:
+        '''
+        Look up the summary of a single hour.
+
+        :params pair: Currency pair of the hour.
+        :params hour: Datetime of the hour.
+        :returns summary: Dictionary of the catalog columns, or None.
+        '''
+
+        row = self.conn.execute(f'SELECT {", ".join(CATALOG_COLUMNS)} FROM {CATALOG_TABLE} WHERE pair = ? AND hour = ?',
+                                (pair, hour.isoformat())).fetchone()
+
+        return dict(zip(CATALOG_COLUMNS, row)) if row is not None else None
+
+    def hours(self, pair: str, start_date: datetime, end_date: datetime) -> list:
+        '''
+        List the stored hours of a pair in a time range.
+
+        :params pair: Currency pair.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :returns hours: Ordered list of datetimes.
+        '''
+
+        rows: list = self.conn.execute(f'SELECT hour FROM {CATALOG_TABLE} WHERE pair = ? AND hour >= ? AND hour < ? ORDER BY hour',
+                                       (pair, start_date.isoformat(), end_date.isoformat())).fetchall()
+
+        return [datetime.fromisoformat(hour) for hour, in rows]
+
+    def missing_hours(self, pair: str, start_date: datetime, end_date: datetime) -> list:
+        '''
+        List the tradable hours of a pair in a time range that are not stored.
+
+        :params pair: Currency pair.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :returns hours: Ordered list of datetimes.
+        '''
+
+        stored: set = set(self.hours(pair, start_date, end_date))
+        return [hour for hour in FXMarketCalendar(pair).tradable_hours(start_date, end_date) if hour not in stored]
+
+    def gaps(self, pair: str, start_date: datetime, end_date: datetime) -> list:
+        '''
+        Group the missing hours of a pair into runs of consecutive hours.
+
+        :params pair: Currency pair.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :returns gaps: Ordered list of (first hour, end) tuples, where the end
+                       is not inclusive.
+        '''
+
+        gaps: list = []
+        for hour in self.missing_hours(pair, start_date, end_date):
+            if gaps and gaps[-1][1] == hour:
+                gaps[-1] = (gaps[-1][0], hour + timedelta(hours=1))
+
+            else:
+                gaps.append((hour, hour + timedelta(hours=1)))
+
+        return gaps
+
+    def coverage(self, pair: str, start_date: datetime, end_date: datetime) -> dict:
+        '''
+        Count the stored and missing tradable hours of a pair in a time range.
+
+        :params pair: Currency pair.
+        :params start_date: Starting time of the range.
+        :params end_date: Ending time of the range, not inclusive.
+        :returns coverage: Dictionary of tradable, stored and missing hours and
+                           the stored fraction of tradable hours.
+        '''
+
+        tradable: list = list(FXMarketCalendar(pair).tradable_hours(start_date, end_date))
+        stored: set = set(self.hours(pair, start_date, end_date))
+        missing: int = sum(1 for hour in tradable if hour not in stored)
+
+        return {
+            'tradable'  : len(tradable),
+            'stored'    : len(stored),
+            'missing'   : missing,
+            'coverage'  : (len(tradable) - missing) / len(tradable) if tradable else 1.0
+        }
+
+    def summary(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                pairs: Optional[list] = None) -> pd.DataFrame:
+        '''
+        Aggregate the stored hours per pair.
+
+        :params start_date: Optional starting time of the range.
+        :params end_date: Optional ending time of the range, not inclusive.
+        :params pairs: Optional list of pairs. Defaults to every pair.
+        :returns summary: DataFrame with one row per pair.
+        '''
+
+        conditions: list = []
+        params: list = []
+        if start_date is not None:
+            conditions.append('hour >= ?')
+            params.append(start_date.isoformat())
+
+        if end_date is not None:
+            conditions.append('hour < ?')
+            params.append(end_date.isoformat())
+
+        if pairs:
+            conditions.append(f'pair IN ({", ".join("?" * len(pairs))})')
+            params.extend(pairs)
+
+        where: str = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        query: str = f'''
+            SELECT pair, COUNT(*) AS hours, SUM(rows = 0) AS empty_hours, SUM(rows) AS rows,
+                   MIN(first_ts) AS first_ts, MAX(last_ts) AS last_ts,
+                   MIN(min_bid) AS min_bid, MAX(max_bid) AS max_bid, MIN(min_ask) AS min_ask, MAX(max_ask) AS max_ask,
+                   SUM(raw_bytes) AS raw_bytes
+            FROM {CATALOG_TABLE} {where}
+            GROUP BY pair
+            ORDER BY pair
+        '''
+
+        return pd.read_sql_query(query, self.conn, params=params)
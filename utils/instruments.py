@@ -0,0 +1,60 @@
+'''
+Instrument reference data for the Dukascopy data feed.
+
+Dukascopy quotes prices as integer points. Dividing by the instrument's price
+factor recovers the decimal price.
+'''
+
+# Major currencies used to build the majors and crosses universe.
+MAJOR_CURRENCIES: tuple = ('EUR', 'GBP', 'AUD', 'NZD', 'USD', 'CAD', 'CHF', 'JPY')
+
+# Price factor per instrument. JPY quoted pairs are quoted to three decimal
+# places, as are metals.
+CURRENCY_FACTOR_MAP: dict = {
+    # Majors.
+    'EURUSD'    : 1e5,
+    'GBPUSD'    : 1e5,
+    'AUDUSD'    : 1e5,
+    'NZDUSD'    : 1e5,
+    'USDCAD'    : 1e5,
+    'USDCHF'    : 1e5,
+    'USDJPY'    : 1e3,
+
+    # EUR crosses.
+    'EURGBP'    : 1e5,
+    'EURAUD'    : 1e5,
+    'EURNZD'    : 1e5,
+    'EURCAD'    : 1e5,
+    'EURCHF'    : 1e5,
+    'EURJPY'    : 1e3,
+
+    # GBP crosses.
+    'GBPAUD'    : 1e5,
+    'GBPNZD'    : 1e5,
+    'GBPCAD'    : 1e5,
+    'GBPCHF'    : 1e5,
+    'GBPJPY'    : 1e3,
+
+    # AUD crosses.
+    'AUDNZD'    : 1e5,
+    'AUDCAD'    : 1e5,
+    'AUDCHF'    : 1e5,
+    'AUDJPY'    : 1e3,
+
+    # NZD crosses.
+    'NZDCAD'    : 1e5,
+    'NZDCHF'    : 1e5,
+    'NZDJPY'    : 1e3,
+
+    # Remaining crosses.
+    'CADCHF'    : 1e5,
+    'CADJPY'    : 1e3,
+    'CHFJPY'    : 1e3,
+
+    # Metals.
+    'XAUUSD'    : 1e3,
+    'XAGUSD'    : 1e3
+}
+
+# Instruments that are not currency pairs.
+METALS: tuple = ('XAUUSD', 'XAGUSD')
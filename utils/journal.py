@@ -0,0 +1,97 @@
+'''
+Append-only journal of completed (pair, hour, sink) entries used to resume
+interrupted runs.
+'''
+
+import os
+
+from typing import Generator, Iterable
+
+from datetime import datetime
+
+class FXTickDataJournal():
+    '''
+    Journal of completed hours stored as tab separated lines.
+
+    Each entry is appended with a single write on a file opened in append mode,
+    so entries from concurrent workers never interleave. If a killed process
+    left a torn entry at the end of the file, the next entry closes it off with
+    an empty field first, so the torn entry is never read as valid and never
+    swallows the new one.
+    '''
+
+    def __init__(self, path: str):
+        '''
+        :params path: Path to the journal file. It is created on first write.
+        '''
+
+        self.path: str = path
+
+    def record(self, pair: str, request_date: datetime, sink: str) -> None:
+        '''
+        Append a completed entry to the journal.
+
+        :params pair: Currency pair that was loaded.
+        :params request_date: Datetime of the loaded hour.
+        :params sink: Name of the sink the hour was written to.
+        '''
+
+        line: bytes = f'{pair}\t{request_date.isoformat()}\t{sink}\n'.encode()
+
+        fd: int = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size > 0:
+                os.lseek(fd, -1, os.SEEK_END)
+                if os.read(fd, 1) != b'\n':
+                    line = b'\t\n' + line
+
+            os.write(fd, line)
+            os.fsync(fd)
+
+        finally:
+            os.close(fd)
+
+    def completed(self) -> set:
+        '''
+        Load all completed entries from the journal.
+
+        NOTE: A partially written line from a killed process is ignored.
+
+        :returns entries: Set of (pair, hour, sink) tuples.
+        '''
+
+        entries: set = set()
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path) as ins:
+            for line in ins:
+                if not line.endswith('\n'):
+                    continue
+
+                try:
+                    pair, request_date, sink = line.rstrip('\n').split('\t')
+                    if not pair or not sink:
+                        continue
+
+                    entries.add((pair, datetime.fromisoformat(request_date), sink))
+
+                except ValueError:
+                    continue
+
+        return entries
+
+    def filter_tasks(self, tasks: Iterable) -> Generator[tuple, None, None]:
+        '''
+        Lazily remove sinks which have already been completed from each task,
+        dropping tasks with no sinks left.
+
+        :params tasks: Iterable of (pair, hour, sinks) tuples.
+        :returns tasks: Generator of (pair, hour, sinks) tuples missing from the journal.
+        '''
+
+        entries: set = self.completed()
+        for pair, request_date, sinks in tasks:
+            sinks = tuple(sink for sink in sinks if (pair, request_date, sink) not in entries)
+            if sinks:
+                yield pair, request_date, sinks
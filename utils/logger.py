@@ -1,8 +1,19 @@
 '''
 Logging package configuration.
+
+Worker processes do not write log output themselves. Each process sends its
+records through a queue to a single listener in the parent, so lines from
+many processes never interleave and workers only pay for enqueuing records
+that pass the level and sampling checks.
 '''
 
 import logging
+import logging.handlers
+import multiprocessing
+import sys
+
+LOG_FORMAT: str = '[%(asctime)s:%(levelname)s:%(module)s:%(lineno)d] %(message)s'
+LOG_DATE_FORMAT: str = '%Y-%m-%d %H:%M:%S'
 
 
 def logger(fname=None, level=0):
@@ -27,9 +38,127 @@ def logger(fname=None, level=0):
 
     logging.basicConfig(
         level=level,
-        datefmt='%Y-%m-%d %H:%M:%S',
-        format='[%(asctime)s:%(levelname)s:%(module)s:%(lineno)d] %(message)s',
+        datefmt=LOG_DATE_FORMAT,
+        format=LOG_FORMAT,
         filename=fname
     )
 
     return logging.getLogger()
+
+
+class FXTickDataLogSampler(logging.Filter):
+    '''
+    Keep the per-hour log records of one in every N hours.
+
+    Records logged with an `hour` extra below WARNING are sampled on the hour,
+    so every line for a sampled hour is kept together. All other records pass.
+    '''
+
+    def __init__(self, every=1):
+        '''
+        Arguments
+        ---------
+
+        every: int
+            Keep the records of one in every `every` hours.
+        '''
+
+        super().__init__()
+        self.every = max(1, every)
+
+    def filter(self, record):
+        hour = getattr(record, 'hour', None)
+        if self.every == 1 or hour is None or record.levelno >= logging.WARNING:
+            return True
+
+        return int(hour.timestamp() // 3600) % self.every == 0
+
+
+def _install_queue_handler(queue, level, every):
+    '''
+    Replace the root handlers of this process with a queue handler.
+
+    Arguments
+    ---------
+
+    queue: multiprocessing.Queue
+        Queue read by the parent's listener.
+
+    level: int or logging.*
+        Minimum log level.
+
+    every: int
+        Keep the per-hour records of one in every `every` hours.
+    '''
+
+    handler = logging.handlers.QueueHandler(queue)
+    handler.addFilter(FXTickDataLogSampler(every))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+def start_log_listener(level=logging.INFO, every=1, fname=None, stream=None):
+    '''
+    Route every record of this process through a queue to a listener thread
+    writing to a single stream or file.
+
+    Arguments
+    ---------
+
+    level: int or logging.*
+        Minimum log level.
+
+    every: int
+        Keep the per-hour records of one in every `every` hours.
+
+    fname: str
+        Optional path to logging file. Defaults to standard error.
+
+    stream: file
+        Optional stream to write to when no file is given.
+
+    Returns
+    -------
+
+    queue: multiprocessing.Queue
+        Queue to pass to worker processes through `init_worker_logging`.
+
+    listener: logging.handlers.QueueListener
+        Started listener. It must be stopped to flush the queued records.
+    '''
+
+    handler = logging.FileHandler(fname) if fname else logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+
+    queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(queue, handler)
+    listener.start()
+
+    _install_queue_handler(queue, level, every)
+
+    return queue, listener
+
+
+def init_worker_logging(queue, level=logging.INFO, every=1):
+    '''
+    Pool initializer sending the records of a worker process to the parent.
+
+    Arguments
+    ---------
+
+    queue: multiprocessing.Queue
+        Queue returned by `start_log_listener`.
+
+    level: int or logging.*
+        Minimum log level.
+
+    every: int
+        Keep the per-hour records of one in every `every` hours.
+    '''
+
+    _install_queue_handler(queue, level, every)
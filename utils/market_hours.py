@@ -0,0 +1,220 @@
+'''
+DST aware trading calendar for the FX and metals markets.
+
+The FX week opens on Sunday at 17:00 New York time and closes on Friday at
+17:00 New York time, so in UTC the open and close move by an hour with US
+daylight saving time. Metals additionally pause for an hour every day. The
+calendar builds the open sessions directly and only steps through hours that
+fall inside them.
+'''
+
+import os
+
+from typing import Generator, Optional
+
+from datetime import datetime, timedelta, timezone
+from dateutil import tz
+
+from utils.instruments import METALS
+
+# Market hours are defined in New York local time.
+MARKET_TZ = tz.gettz('America/New_York')
+
+# Weekly open (Sunday) and close (Friday) hour in New York local time.
+WEEKLY_OPEN_HOUR: int = 17
+WEEKLY_CLOSE_HOUR: int = 17
+
+# Daily maintenance break in New York local time as (start hour, end hour).
+METALS_DAILY_BREAK: tuple = (17, 18)
+
+# Holidays as (month, day). The trading day ending at 17:00 New York time on
+# the holiday is closed.
+HOLIDAYS: tuple = ((12, 25), (1, 1))
+
+# Hours that came back empty are only learned once they are this old, so hours
+# that the feed has not published yet are not skipped forever.
+EMPTY_HOUR_MIN_AGE: timedelta = timedelta(days=2)
+
+def _to_utc(year: int, month: int, day: int, hour: int) -> datetime:
+    '''
+    Convert a New York local time into a naive UTC datetime.
+
+    :params year: Local year.
+    :params month: Local month.
+    :params day: Local day.
+    :params hour: Local hour.
+    :returns utc: Naive datetime in UTC, matching the feed's timestamps.
+    '''
+
+    local = datetime(year, month, day, hour, tzinfo=MARKET_TZ)
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+class FXMarketCalendar():
+    '''
+    Trading calendar generating the tradable hours for an instrument.
+    '''
+
+    def __init__(self, pair: Optional[str] = None, empty_hours: Optional[set] = None):
+        '''
+        :params pair: Instrument the session rules apply to. Metals pause daily.
+        :params empty_hours: Optional set of hours previously seen to be empty
+                             for the instrument. These are skipped.
+        '''
+
+        self.pair: Optional[str] = pair
+        self.daily_break: Optional[tuple] = METALS_DAILY_BREAK if pair in METALS else None
+        self.empty_hours: set = empty_hours or set()
+
+    def _week_sessions(self, sunday: datetime) -> list:
+        '''
+        Build the open sessions of the trading week starting on a Sunday.
+
+        :params sunday: Local date of the Sunday that opens the week.
+        :returns sessions: List of (open, close) naive UTC datetimes.
+        '''
+
+        friday: datetime = sunday + timedelta(days=5)
+
+        if self.daily_break is None:
+            return [(
+                _to_utc(sunday.year, sunday.month, sunday.day, WEEKLY_OPEN_HOUR),
+                _to_utc(friday.year, friday.month, friday.day, WEEKLY_CLOSE_HOUR)
+            )]
+
+        # One session per trading day, from the end of the previous day's
+        # break until the start of this day's break.
+        sessions: list = []
+        for offset in range(5):
+            day: datetime = sunday + timedelta(days=offset)
+            next_day: datetime = day + timedelta(days=1)
+            sessions.append((
+                _to_utc(day.year, day.month, day.day, self.daily_break[1]),
+                _to_utc(next_day.year, next_day.month, next_day.day, self.daily_break[0])
+            ))
+
+        return sessions
+
+    def _holiday_closures(self, year: int) -> list:
+        '''
+        Build the holiday closures around a year.
+
+        :params year: Year of the closures.
+        :returns closures: List of (start, end) naive UTC datetimes.
+        '''
+
+        closures: list = []
+        for month, day in HOLIDAYS:
+            holiday: datetime = datetime(year, month, day)
+            eve: datetime = holiday - timedelta(days=1)
+            closures.append((
+                _to_utc(eve.year, eve.month, eve.day, WEEKLY_CLOSE_HOUR),
+                _to_utc(holiday.year, holiday.month, holiday.day, WEEKLY_OPEN_HOUR)
+            ))
+
+        return closures
+
+    def sessions(self, start_date: datetime, end_date: datetime) -> Generator[tuple, None, None]:
+        '''
+        Generate the open sessions overlapping a date range, with holiday
+        closures removed.
+
+        :params start_date: Starting time of date range.
+        :params end_date: Ending time of the date range.
+        :returns sessions: Generator of (open, close) naive UTC datetimes.
+        '''
+
+        # Start from the Sunday opening the week that contains start_date.
+        # Sessions can open up to a day before their local date in UTC, so
+        # start one week early to be safe.
+        sunday: datetime = datetime(start_date.year, start_date.month, start_date.day) - timedelta(days=(start_date.weekday() + 1) % 7 + 7)
+
+        while True:
+            for session_open, session_close in self._week_sessions(sunday):
+                if session_open >= end_date:
+                    return
+
+                if session_close <= start_date:
+                    continue
+
+                # Split the session around any holiday closures inside it.
+                closures: list = sorted(
+                    closure for year in {session_open.year, session_close.year} for closure in self._holiday_closures(year)
+                    if closure[0] < session_close and closure[1] > session_open
+                )
+                for closure_start, closure_end in closures:
+                    if closure_start > session_open:
+                        yield max(session_open, start_date), min(closure_start, end_date)
+
+                    session_open = max(session_open, closure_end)
+
+                if session_open < session_close:
+                    yield max(session_open, start_date), min(session_close, end_date)
+
+            sunday += timedelta(days=7)
+
+    def tradable_hours(self, start_date: datetime, end_date: datetime) -> Generator[datetime, None, None]:
+        '''
+        Generate every tradable hour in a date range.
+
+        NOTE: This range is not inclusive of the final date.
+
+        :params start_date: Starting time of date range.
+        :params end_date: Ending time of the date range.
+        :returns hours: Generator of hourly naive UTC datetimes.
+        '''
+
+        for session_open, session_close in self.sessions(start_date, end_date):
+            # Align the first hour with the hourly grid of the range start.
+            date: datetime = session_open
+            if date != start_date:
+                date = start_date + timedelta(hours=-(-(session_open - start_date) // timedelta(hours=1)))
+
+            while date < session_close:
+                if date not in self.empty_hours:
+                    yield date
+
+                date += timedelta(hours=1)
+
+def load_empty_hours(path: str) -> dict:
+    '''
+    Load hours previously seen to be empty.
+
+    :params path: Path to the file of empty hours.
+    :returns empty_hours: Map of pair to a set of empty hours.
+    '''
+
+    empty_hours: dict = {}
+    if not os.path.exists(path):
+        return empty_hours
+
+    with open(path) as ins:
+        for line in ins:
+            try:
+                pair, request_date = line.rstrip('\n').split('\t')
+                empty_hours.setdefault(pair, set()).add(datetime.fromisoformat(request_date))
+
+            except ValueError:
+                continue
+
+    return empty_hours
+
+def record_empty_hour(path: str, pair: str, request_date: datetime, now: Optional[datetime] = None) -> bool:
+    '''
+    Record an hour that came back empty, if it is old enough that the feed has
+    certainly published it.
+
+    :params path: Path to the file of empty hours.
+    :params pair: Currency pair of the hour.
+    :params request_date: Datetime of the empty hour.
+    :params now: Current UTC time. Defaults to the system clock.
+    :returns recorded: Boolean flag indicating whether the hour was recorded.
+    '''
+
+    now = now or datetime.utcnow()
+    if now - request_date < EMPTY_HOUR_MIN_AGE:
+        return False
+
+    with open(path, 'a') as outs:
+        outs.write(f'{pair}\t{request_date.isoformat()}\n')
+
+    return True
@@ -0,0 +1,182 @@
+'''
+Merge the outputs of sharded runs into a single dataset.
+'''
+
+import filecmp
+import os
+import re
+import shutil
+import sqlite3
+
+from typing import Generator
+
+# Hourly tabular output files, e.g. EURUSD20190102T030000.tsv.
+TABULAR_FILE_PATTERN = re.compile(r'^[A-Z]{6}\d{8}T\d{6}\.tsv$')
+
+# SQLite's default limit on attached databases is ten, one of which is kept
+# free for the target.
+MAX_ATTACHED: int = 9
+
+def merge_tabular(shard_paths: list, opath: str) -> int:
+    '''
+    Merge hourly tabular files from several shard directories into one output
+    directory. Each file is copied under a temporary name and renamed, so
+    readers never see partial files.
+
+    :params shard_paths: List of shard output directories.
+    :params opath: Output directory for the merged files.
+    :returns copied: Number of files copied into the output directory.
+    '''
+
+    # Collect every hourly file, in order, and reject conflicting duplicates.
+    sources: dict = {}
+    for shard_path in shard_paths:
+        for name in os.listdir(shard_path):
+            if not TABULAR_FILE_PATTERN.match(name):
+                continue
+
+            source: str = os.path.join(shard_path, name)
+            if name in sources and not filecmp.cmp(sources[name], source, shallow=False):
+                raise Exception(f'Conflicting shard outputs for {name}: {sources[name]} and {source}')
+
+            sources.setdefault(name, source)
+
+    copied: int = 0
+    for name in sorted(sources):
+        outs: str = os.path.join(opath, name)
+        if os.path.exists(outs) and filecmp.cmp(sources[name], outs, shallow=False):
+            continue
+
+        shutil.copyfile(sources[name], outs + '.tmp')
+        os.replace(outs + '.tmp', outs)
+        copied += 1
+
+    return copied
+
+def _table_columns(conn: sqlite3.Connection, schema: str, table: str) -> list:
+    '''
+    List the columns of a table with their declared types.
+
+    :params conn: Open connection to the DB.
+    :params schema: Name of the main or an attached database.
+    :params table: Table to inspect.
+    :returns columns: Ordered list of (name, type) tuples, empty if the table
+                      does not exist.
+    '''
+
+    return [(row[1], row[2]) for row in conn.execute(f'PRAGMA {schema}.table_info({table})')]
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: list) -> None:
+    '''
+    Add columns that the merged table lacks, such as the feature columns of
+    shards loaded with --features.
+
+    :params conn: Open connection to the DB.
+    :params table: Merged table.
+    :params columns: List of (name, type) tuples the table must hold.
+    '''
+
+    existing: set = {name for name, _ in _table_columns(conn, 'main', table)}
+    for name, column_type in columns:
+        if name not in existing:
+            conn.execute(f'ALTER TABLE main.{table} ADD COLUMN {name} {column_type or "REAL"}')
+
+def _attached_batches(conn: sqlite3.Connection, shard_dbs: list) -> Generator[list, None, None]:
+    '''
+    Attach the shard databases in batches that fit under SQLite's limit on
+    attached databases, detaching each batch once it is done.
+
+    :params conn: Open connection to the merged DB.
+    :params shard_dbs: List of shard SQLite database paths.
+    :returns aliases: Generator of the aliases of each attached batch.
+    '''
+
+    for batch_start in range(0, len(shard_dbs), MAX_ATTACHED):
+        batch: list = shard_dbs[batch_start:(batch_start + MAX_ATTACHED)]
+        aliases: list = [f'shard{i}' for i in range(len(batch))]
+        for alias, shard_db in zip(aliases, batch):
+            conn.execute('ATTACH DATABASE ? AS ' + alias, (shard_db, ))
+
+        try:
+            yield aliases
+
+        finally:
+            # Detaching requires that no transaction is open.
+            conn.rollback()
+            for alias in aliases:
+                conn.execute('DETACH DATABASE ' + alias)
+
+def merge_sqlite(shard_dbs: list, db: str, table: str) -> int:
+    '''
+    Merge a table from several shard databases into one database, inserting
+    the rows sorted by timestamp and pair across every shard. The table is
+    created from the first shard's schema if it does not exist, and is given
+    the union of the shards' columns. Rows from shards without a column get
+    NULL.
+
+    NOTE: A unique index on (ts, pair) is created if missing, since tables
+          written by to_sql have no primary key. Rows that collide with an
+          existing row are ignored, so the merge can be rerun safely.
+
+    :params shard_dbs: List of shard SQLite database paths.
+    :params db: Path to the merged SQLite database.
+    :params table: Table to merge.
+    :returns inserted: Number of rows inserted into the merged table.
+    '''
+
+    conn = sqlite3.connect(db)
+    try:
+        exists: bool = len(_table_columns(conn, 'main', table)) > 0
+        before: int = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] if exists else 0
+
+        # Shards loaded with and without optional columns, such as features,
+        # are merged into a table holding every column.
+        columns: dict = {}
+        for aliases in _attached_batches(conn, shard_dbs):
+            if not exists:
+                schema, = conn.execute(f"SELECT sql FROM {aliases[0]}.sqlite_master WHERE type = 'table' AND name = ?", (table, )).fetchone()
+                conn.execute(schema)
+                conn.commit()
+                exists = True
+
+            for alias in aliases:
+                for name, column_type in _table_columns(conn, alias, table):
+                    columns.setdefault(name, column_type)
+
+        _add_missing_columns(conn, table, list(columns.items()))
+        conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS main.{table}_ts_pair ON {table} (ts, pair)')
+        conn.commit()
+
+        # A single batch of attached shards is inserted directly in one sorted
+        # insert. Several batches are first staged in a temporary table, so
+        # the final insert is sorted across every shard.
+        target: list = [name for name, _ in _table_columns(conn, 'main', table)]
+        staged: bool = len(shard_dbs) > MAX_ATTACHED
+        if staged:
+            conn.execute(f'CREATE TEMP TABLE merge_rows AS SELECT * FROM main.{table} WHERE 0')
+
+        for aliases in _attached_batches(conn, shard_dbs):
+            selects: list = []
+            for alias in aliases:
+                present: set = {name for name, _ in _table_columns(conn, alias, table)}
+                selected: str = ', '.join(name if name in present else f'NULL AS {name}' for name in target)
+                selects.append(f'SELECT {selected} FROM {alias}.{table}')
+
+            union: str = ' UNION ALL '.join(selects)
+            if staged:
+                conn.execute(f'INSERT INTO temp.merge_rows ({", ".join(target)}) {union}')
+
+            else:
+                conn.execute(f'INSERT OR IGNORE INTO main.{table} ({", ".join(target)}) SELECT * FROM ({union}) ORDER BY ts, pair')
+
+            conn.commit()
+
+        if staged:
+            conn.execute(f'INSERT OR IGNORE INTO main.{table} ({", ".join(target)}) SELECT {", ".join(target)} FROM temp.merge_rows ORDER BY ts, pair')
+            conn.execute('DROP TABLE temp.merge_rows')
+            conn.commit()
+
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] - before
+
+    finally:
+        conn.close()
@@ -0,0 +1,123 @@
+'''
+Profiling of pipeline runs inside pool workers.
+
+Each worker keeps a single cProfile profiler, enabled only around the
+pipeline calls it runs, and writes its statistics to its own file. The parent
+merges the worker files into one sorted report once the run is over.
+'''
+
+import cProfile
+import glob
+import io
+import os
+import pstats
+import tracemalloc
+
+from typing import Callable, Optional
+
+# Per-worker statistics files written into the profile directory.
+WORKER_PROFILE_PATTERN: str = 'worker-*.prof'
+
+# Merged statistics and report written by the parent.
+MERGED_PROFILE: str = 'profile.prof'
+PROFILE_REPORT: str = 'profile.txt'
+
+# Profiler of this process, created by the first profiled call.
+_PROFILER: Optional[cProfile.Profile] = None
+
+class FXTickDataProfiledCall():
+    '''
+    Picklable wrapper profiling a pipeline call in whichever worker runs it.
+    '''
+
+    def __init__(self, func: Callable, profile_dir: str, trace_memory: bool = False):
+        '''
+        :params func: Pipeline object or function to profile.
+        :params profile_dir: Directory the worker statistics are written to.
+        :params trace_memory: Trace allocations so pipeline stages record their
+                              peak allocation.
+        '''
+
+        self.func: Callable = func
+        self.profile_dir: str = profile_dir
+        self.trace_memory: bool = trace_memory
+
+    def __call__(self, *args, **kwargs):
+        '''
+        Run the wrapped call under the worker's profiler, then rewrite the
+        worker's statistics file.
+
+        NOTE: Statistics are written after every call, because pool workers
+              are terminated without running exit handlers.
+        '''
+
+        global _PROFILER
+        if _PROFILER is None:
+            _PROFILER = cProfile.Profile()
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        _PROFILER.enable()
+        try:
+            return self.func(*args, **kwargs)
+
+        finally:
+            _PROFILER.disable()
+            _PROFILER.dump_stats(os.path.join(self.profile_dir, f'worker-{os.getpid()}.prof'))
+
+def prepare_profile_dir(profile_dir: str) -> None:
+    '''
+    Create the profile directory and remove worker statistics left over from
+    a previous run.
+
+    :params profile_dir: Directory the worker statistics are written to.
+    '''
+
+    os.makedirs(profile_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(profile_dir, WORKER_PROFILE_PATTERN)):
+        os.remove(path)
+
+def merge_profiles(profile_dir: str) -> Optional[pstats.Stats]:
+    '''
+    Merge the statistics of every worker.
+
+    :params profile_dir: Directory the worker statistics were written to.
+    :returns stats: Merged statistics, or None if no worker wrote any.
+    '''
+
+    paths: list = sorted(glob.glob(os.path.join(profile_dir, WORKER_PROFILE_PATTERN)))
+    if not paths:
+        return None
+
+    stats = pstats.Stats(paths[0], stream=io.StringIO())
+    for path in paths[1:]:
+        stats.add(path)
+
+    return stats
+
+def write_profile_report(profile_dir: str, sort: str = 'cumulative', limit: int = 40) -> Optional[str]:
+    '''
+    Merge the worker statistics, and write the merged statistics and a sorted
+    text report into the profile directory.
+
+    :params profile_dir: Directory the worker statistics were written to.
+    :params sort: pstats sort key of the report.
+    :params limit: Number of functions listed in the report.
+    :returns report: Text of the report, or None if no worker wrote any.
+    '''
+
+    stats: Optional[pstats.Stats] = merge_profiles(profile_dir)
+    if stats is None:
+        return None
+
+    stats.dump_stats(os.path.join(profile_dir, MERGED_PROFILE))
+
+    stats.stream = io.StringIO()
+    stats.sort_stats(sort).print_stats(limit)
+    report: str = stats.stream.getvalue()
+
+    with open(os.path.join(profile_dir, PROFILE_REPORT), 'w') as outs:
+        outs.write(report)
+
+    return report
@@ -0,0 +1,244 @@
+'''
+Scheduling of hourly work across one or more currency pairs.
+'''
+
+import hashlib
+import heapq
+import queue
+
+from collections import deque
+
+from typing import Callable, Generator, Iterable, Optional
+
+from datetime import datetime
+
+from utils import tools
+
+def _pair_range(pair: str, start_date: datetime, end_date: datetime,
+                empty_hours: Optional[set] = None) -> Generator[tuple, None, None]:
+    '''
+    Generate (hour, pair) tuples for a single pair.
+
+    :params pair: Currency pair.
+    :params start_date: Starting time of date range.
+    :params end_date: Ending time of the date range.
+    :params empty_hours: Optional set of hours known to be empty for the pair.
+    :returns range: Generator of (hour, pair) tuples.
+    '''
+
+    for date in tools.valid_date_range(start_date, end_date, pair, empty_hours):
+        yield date, pair
+
+def interleave_tasks(pairs: list, start_date: datetime, end_date: datetime,
+                     start_dates: Optional[dict] = None, empty_hours: Optional[dict] = None) -> Generator[tuple, None, None]:
+    '''
+    Lazily generate (pair, hour) tasks for all pairs, interleaved by hour so
+    that every pair progresses together through the date range.
+
+    :params pairs: List of currency pairs.
+    :params start_date: Starting time of date range.
+    :params end_date: Ending time of the date range.
+    :params start_dates: Optional map of pair to a pair specific starting time.
+    :params empty_hours: Optional map of pair to a set of hours known to be empty.
+    :returns tasks: Generator of (pair, hour) tuples ordered by hour, then pair.
+    '''
+
+    start_dates = start_dates or {}
+    empty_hours = empty_hours or {}
+    ranges: list = [_pair_range(pair, start_dates.get(pair, start_date), end_date, empty_hours.get(pair)) for pair in pairs]
+    for date, pair in heapq.merge(*ranges):
+        yield pair, date
+
+def shard_tasks(tasks: Iterable, shard_index: int, shard_count: int) -> Generator[tuple, None, None]:
+    '''
+    Lazily keep the tasks belonging to one shard of the work list.
+
+    The shard of a task only depends on its pair and hour, so independent
+    machines given the same arguments split the work into disjoint slices.
+
+    :params tasks: Iterable of tuples starting with (pair, hour).
+    :params shard_index: Index of this shard in [0, shard_count).
+    :params shard_count: Total number of shards.
+    :returns tasks: Generator of the tasks assigned to this shard.
+    '''
+
+    if not 0 <= shard_index < shard_count:
+        raise Exception(f'Shard index must be in [0, {shard_count}): {shard_index}')
+
+    for task in tasks:
+        pair, request_date = task[:2]
+        digest: bytes = hashlib.blake2b(f'{pair}{request_date:%Y%m%dT%H%M%S}'.encode(), digest_size=8).digest()
+        if int.from_bytes(digest, 'big') % shard_count == shard_index:
+            yield task
+
+def filter_stored_tasks(tasks: Iterable, latest_hours: dict) -> Generator[tuple, None, None]:
+    '''
+    Lazily remove sinks from each task when the sink already stores the hour,
+    dropping tasks with no sinks left.
+
+    :params tasks: Iterable of (pair, hour, sinks) tuples.
+    :params latest_hours: Map of (pair, sink) to the newest stored hour.
+    :returns tasks: Generator of (pair, hour, sinks) tuples with unstored sinks.
+    '''
+
+    for pair, request_date, sinks in tasks:
+        sinks = tuple(sink for sink in sinks if latest_hours.get((pair, sink)) is None or request_date > latest_hours[(pair, sink)])
+        if sinks:
+            yield pair, request_date, sinks
+
+class FXTickDataScheduler():
+    '''
+    Completion driven scheduler that keeps a bounded number of calls in flight
+    on a process pool.
+
+    Calls are pulled lazily from an iterable, so neither the task list nor the
+    pending results grow with the size of the date range.
+    '''
+
+    def __init__(self, pool, max_in_flight: int, held: Optional[Callable[[], int]] = None):
+        '''
+        :params pool: multiprocessing.Pool used to run the calls.
+        :params max_in_flight: Maximum number of calls submitted but not finished.
+        :params held: Optional callable counting completed results that the
+                      consumer still holds, e.g. in a reorder buffer. They
+                      count against max_in_flight.
+        '''
+
+        if max_in_flight < 1:
+            raise Exception(f'At least one call must be allowed in flight: {max_in_flight}')
+
+        self.pool = pool
+        self.max_in_flight: int = max_in_flight
+        self.held: Callable[[], int] = held or (lambda: 0)
+
+        self.submitted: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+
+        # Results of finished calls waiting to be yielded.
+        self.completions: queue.Queue = queue.Queue()
+
+    @property
+    def in_flight(self) -> int:
+        '''
+        Number of calls submitted to the pool which have not been handled.
+        '''
+
+        return self.submitted - self.completed
+
+    def run(self, calls: Iterable) -> Generator[tuple, None, None]:
+        '''
+        Run calls on the pool and yield their results as they complete.
+
+        :params calls: Iterable of (task, func, args) tuples. The task is
+                       passed through to identify the result.
+        :returns results: Generator of (task, result, error) tuples in
+                          completion order. Exactly one of result and error is
+                          set, the latter when the call raised.
+        '''
+
+        completions: queue.Queue = self.completions
+        calls = iter(calls)
+        exhausted: bool = False
+
+        while True:
+            # Top up the window before blocking on the next completion. Held
+            # results only wait for an earlier call that is still in flight,
+            # so a full window always drains.
+            while not exhausted and self.in_flight + self.held() < self.max_in_flight:
+                try:
+                    task, func, args = next(calls)
+
+                except StopIteration:
+                    exhausted = True
+                    break
+
+                self.pool.apply_async(
+                    func,
+                    args=args,
+                    callback=lambda result, task=task: completions.put((task, result, None)),
+                    error_callback=lambda error, task=task: completions.put((task, None, error))
+                )
+                self.submitted += 1
+
+            if not self.in_flight:
+                return
+
+            task, result, error = completions.get()
+            self.completed += 1
+            self.failed += error is not None
+            yield task, result, error
+
+    def drain(self) -> list:
+        '''
+        Take the results of calls which finished but were never yielded, e.g.
+        because the consumer stopped early. Calls still running on the pool
+        are not waited for.
+
+        :returns results: List of (task, result, error) tuples.
+        '''
+
+        results: list = []
+        while True:
+            try:
+                results.append(self.completions.get_nowait())
+
+            except queue.Empty:
+                return results
+
+class FXTickDataReorderBuffer():
+    '''
+    Release the results of each pair in the order the pair's hours were
+    submitted, for stages that carry state from one hour to the next.
+
+    Results of a pair wait in the buffer while an earlier hour of the same
+    pair is still in flight. Pass held to FXTickDataScheduler so the waiting
+    results count against its window, otherwise a slow hour lets the buffer
+    grow without limit.
+    '''
+
+    def __init__(self):
+        # Submitted hours per pair not released yet, in submission order.
+        self.order: dict = {}
+
+        # Completed results waiting for an earlier hour, keyed by pair and hour.
+        self.pending: dict = {}
+
+    def held(self) -> int:
+        '''
+        Number of completed results waiting for an earlier hour.
+        '''
+
+        return len(self.pending)
+
+    def track(self, calls: Iterable) -> Generator[tuple, None, None]:
+        '''
+        Record the order calls are pulled in, passing them through unchanged.
+
+        :params calls: Iterable of (task, func, args) tuples whose tasks start
+                       with the pair and hour.
+        :returns calls: Generator of the same calls.
+        '''
+
+        for call in calls:
+            pair, request_date = call[0][:2]
+            self.order.setdefault(pair, deque()).append(request_date)
+            yield call
+
+    def release(self, results: Iterable) -> Generator[tuple, None, None]:
+        '''
+        Reorder results from completion order into submission order per pair.
+
+        :params results: Iterable of (task, result, error) tuples of tracked
+                         calls, in completion order.
+        :returns results: Generator of the same tuples, ordered by hour within
+                          each pair.
+        '''
+
+        for completion in results:
+            pair, request_date = completion[0][:2]
+            self.pending[(pair, request_date)] = completion
+
+            order: deque = self.order[pair]
+            while order and (pair, order[0]) in self.pending:
+                yield self.pending.pop((pair, order.popleft()))
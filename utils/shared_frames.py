@@ -0,0 +1,173 @@
+'''
+Zero-copy handoff of processed tick columns between processes.
+
+The producer copies each numeric column of a frame into its own shared memory
+block and sends only a small descriptor (block names, dtypes, length and hour)
+to the consumer, which maps the blocks instead of unpickling the data.
+
+Ownership of the blocks moves with the descriptor. The producer stops
+tracking the blocks once they are filled, and the consumer adopts them when
+the descriptor arrives, so they are removed if it exits without calling
+unlink. The consumer must call unlink once it is done with them, whether or
+not it read them.
+'''
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Generator
+
+from datetime import datetime
+
+# Python 3.13 can create blocks that the resource tracker never registers.
+_UNTRACKED: dict = {'track': False} if sys.version_info >= (3, 13) else {}
+
+def _tracked_name(name: str) -> str:
+    '''
+    Name a block is registered under with the resource tracker.
+
+    :params name: Block name without the leading '/'.
+    :returns name: Name given to shm_open.
+    '''
+
+    return '/' + name
+
+def _release_tracking(block: shared_memory.SharedMemory) -> None:
+    '''
+    Hand a block created by this process over to another process.
+
+    The resource tracker unlinks every block its process created when that
+    process exits, which would remove blocks the consumer has not read yet.
+    Before Python 3.13 blocks are always registered on POSIX, under the name
+    shm_open was given, which has a leading '/' that block.name strips.
+
+    :params block: Block created by this process.
+    '''
+
+    if not _UNTRACKED and os.name == 'posix':
+        resource_tracker.unregister(_tracked_name(block.name), 'shared_memory')
+
+class FXTickDataSharedFrame():
+    '''
+    Picklable descriptor of a frame whose columns live in shared memory.
+    '''
+
+    def __init__(self, currency: str, request_date: datetime, length: int, columns: list):
+        '''
+        :params currency: String identifying currency pair.
+        :params request_date: Datetime of the hour the frame holds.
+        :params length: Number of rows.
+        :params columns: List of (column, block name, dtype string) tuples.
+        '''
+
+        self.currency: str = currency
+        self.request_date: datetime = request_date
+        self.length: int = length
+        self.columns: list = columns
+
+        # Set once the blocks are registered with this process's tracker.
+        self.adopted: bool = False
+
+    @classmethod
+    def create(cls, data: pd.DataFrame, currency: str, request_date: datetime) -> 'FXTickDataSharedFrame':
+        '''
+        Copy the columns of a frame into new shared memory blocks.
+
+        :params data: DataFrame of numeric or datetime columns.
+        :params currency: String identifying currency pair.
+        :params request_date: Datetime of the hour the frame holds.
+        :returns shared: Descriptor owning the new blocks.
+        '''
+
+        columns: list = []
+        try:
+            for column in data.columns:
+                values: np.ndarray = data[column].to_numpy()
+                if values.dtype == object:
+                    raise Exception(f'Only numeric and datetime columns can be shared: {column}')
+
+                # Blocks cannot be empty, so empty frames still take one byte.
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1), **_UNTRACKED)
+                columns.append((column, block.name, values.dtype.str))
+                np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+
+                # The consumer owns the block from here on, so this process
+                # must not remove it when it exits.
+                block.close()
+                _release_tracking(block)
+
+        except Exception:
+            cls(currency, request_date, len(data), columns).unlink()
+            raise
+
+        return cls(currency, request_date, len(data), columns)
+
+    def adopt(self) -> None:
+        '''
+        Register the blocks with the resource tracker of this process, so
+        they are removed if it exits before calling unlink, e.g. on an
+        exception, Ctrl-C or a terminated pool.
+        '''
+
+        if self.adopted or os.name != 'posix':
+            return
+
+        for column, name, dtype in self.columns:
+            resource_tracker.register(_tracked_name(name), 'shared_memory')
+
+        self.adopted = True
+
+    @contextmanager
+    def attach(self) -> Generator[pd.DataFrame, None, None]:
+        '''
+        Map the blocks and expose them as a DataFrame for the enclosed block.
+
+        NOTE: The frame is only valid inside the block. The blocks are not
+              removed, call unlink once they are no longer needed.
+
+        :returns data: DataFrame backed by the shared blocks.
+        '''
+
+        blocks: list = []
+        try:
+            arrays: dict = {}
+            for column, name, dtype in self.columns:
+                block = shared_memory.SharedMemory(name=name)
+                blocks.append(block)
+                arrays[column] = np.ndarray((self.length, ), dtype=np.dtype(dtype), buffer=block.buf)
+
+            yield pd.DataFrame(arrays, copy=False)
+
+        finally:
+            arrays = None
+            for block in blocks:
+                try:
+                    block.close()
+
+                # Views still held by the consumer keep the mapping alive, it
+                # is released when they are garbage collected.
+                except BufferError:
+                    pass
+
+    def unlink(self) -> None:
+        '''
+        Remove the blocks. The memory is freed once every mapping is closed.
+        '''
+
+        for column, name, dtype in self.columns:
+            try:
+                block = shared_memory.SharedMemory(name=name)
+
+            except FileNotFoundError:
+                continue
+
+            # Unlinking also unregisters the block from the tracker.
+            block.close()
+            block.unlink()
+
+        self.adopted = False
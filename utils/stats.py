@@ -0,0 +1,253 @@
+'''
+Structured timing and volume statistics emitted by each pipeline run.
+'''
+
+import json
+import math
+import time
+import tracemalloc
+
+from array import array
+
+from contextlib import contextmanager
+from typing import Optional
+from datetime import datetime
+
+# Ordered stages of a single pipeline run.
+STAGES: tuple = ('http', 'decompress', 'parse', 'process', 'write')
+
+# Percentiles reported for each stage in the end of run summary.
+PERCENTILES: tuple = (50, 90, 99)
+
+class FXTickDataPipelineStats():
+    '''
+    Record describing a single pipeline run over one hour of tick data.
+    '''
+
+    def __init__(self, currency: str, request_date: datetime):
+        '''
+        Initialize an empty record for the given pair and hour.
+
+        :params currency: String identifying currency pair.
+        :params request_date: Datetime of the requested hour.
+        '''
+
+        self.currency: str = currency
+        self.request_date: datetime = request_date
+
+        self.success: bool = False
+        self.failed_stage: Optional[str] = None
+        self.bytes_downloaded: int = 0
+        self.rows: int = 0
+        self.retries: int = 0
+        self.timings: dict = {stage: 0.0 for stage in STAGES}
+
+        # Peak bytes allocated per stage, only filled while tracemalloc traces.
+        self.memory_peaks: dict = {}
+
+        # Processed data handed to the parent through shared memory, set by
+        # pipelines that leave the write to the parent.
+        self.shared_frame = None
+
+        # Coverage and statistics of the hour for the catalog, only set when a
+        # catalog is kept.
+        self.hour_summary: Optional[dict] = None
+
+    @contextmanager
+    def timer(self, stage: str):
+        '''
+        Time the enclosed block and add the elapsed seconds to a stage. While
+        tracemalloc is tracing, the peak allocation of the block is recorded on
+        Python 3.9 and later.
+
+        :params stage: Name of the stage being timed.
+        '''
+
+        # Resetting the peak needs Python 3.9, earlier versions only record
+        # timings.
+        tracing: bool = tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak')
+        if tracing:
+            tracemalloc.reset_peak()
+            allocated: int = tracemalloc.get_traced_memory()[0]
+
+        start: float = time.perf_counter()
+        try:
+            yield
+
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+            if tracing:
+                peak: int = tracemalloc.get_traced_memory()[1] - allocated
+                self.memory_peaks[stage] = max(self.memory_peaks.get(stage, 0), peak)
+
+    def to_dict(self) -> dict:
+        '''
+        Convert the record into a JSON serializable dictionary.
+
+        :returns record: Dictionary representation of the record.
+        '''
+
+        return {
+            'currency'          : self.currency,
+            'request_date'      : self.request_date.isoformat(),
+            'success'           : self.success,
+            'failed_stage'      : self.failed_stage,
+            'bytes_downloaded'  : self.bytes_downloaded,
+            'rows'              : self.rows,
+            'retries'           : self.retries,
+            'timings'           : dict(self.timings),
+            'memory_peaks'      : dict(self.memory_peaks)
+        }
+
+def _percentile(values: list, percentile: float) -> float:
+    '''
+    Nearest rank percentile of a list of values.
+
+    :params values: Sorted list of values.
+    :params percentile: Percentile in the range [0, 100].
+    :returns value: Value at the requested percentile.
+    '''
+
+    if not values:
+        return 0.0
+
+    rank: int = max(math.ceil(percentile / 100 * len(values)), 1)
+    return values[rank - 1]
+
+class FXTickDataRunStats():
+    '''
+    Streaming aggregate of pipeline records for a full run.
+
+    Only counters and per-stage timings are kept, so memory grows by a few
+    bytes per hour rather than by a full record.
+    '''
+
+    def __init__(self):
+        self.hours: int = 0
+        self.succeeded: int = 0
+        self.rows: int = 0
+        self.bytes_downloaded: int = 0
+        self.retries: int = 0
+        self.timings: dict = {stage: array('d') for stage in STAGES}
+        self.memory_peaks: dict = {}
+
+    def add(self, record: FXTickDataPipelineStats) -> None:
+        '''
+        Add a single pipeline record to the aggregate.
+
+        :params record: Record emitted by a pipeline run.
+        '''
+
+        self.hours += 1
+        self.succeeded += bool(record.success)
+        self.rows += record.rows
+        self.bytes_downloaded += record.bytes_downloaded
+        self.retries += record.retries
+        for stage in STAGES:
+            self.timings[stage].append(record.timings.get(stage, 0.0))
+
+        for stage, peak in record.memory_peaks.items():
+            self.memory_peaks[stage] = max(self.memory_peaks.get(stage, 0), peak)
+
+    def summary(self, wall_time: float) -> dict:
+        '''
+        Summarize the run into totals, percentiles and throughput.
+
+        :params wall_time: Elapsed wall clock seconds for the full run.
+        :returns summary: Dictionary summarizing the run.
+        '''
+
+        stages: dict = {}
+        for stage in STAGES:
+            values: list = sorted(self.timings[stage])
+            stages[stage] = {'total': sum(values), 'max': values[-1] if values else 0.0}
+            for percentile in PERCENTILES:
+                stages[stage][f'p{percentile}'] = _percentile(values, percentile)
+
+        return {
+            'hours'             : self.hours,
+            'succeeded'         : self.succeeded,
+            'failed'            : self.hours - self.succeeded,
+            'rows'              : self.rows,
+            'bytes_downloaded'  : self.bytes_downloaded,
+            'retries'           : self.retries,
+            'wall_time'         : wall_time,
+            'ticks_per_second'  : self.rows / wall_time if wall_time > 0 else 0.0,
+            'mb_per_second'     : self.bytes_downloaded / 1e6 / wall_time if wall_time > 0 else 0.0,
+            'stages'            : stages,
+            'memory_peaks'      : dict(self.memory_peaks)
+        }
+
+def summarize_stats(records: list, wall_time: float) -> dict:
+    '''
+    Aggregate pipeline records into totals, percentiles and throughput.
+
+    :params records: List of FXTickDataPipelineStats records.
+    :params wall_time: Elapsed wall clock seconds for the full run.
+    :returns summary: Dictionary summarizing the run.
+    '''
+
+    run_stats = FXTickDataRunStats()
+    for record in records:
+        run_stats.add(record)
+
+    return run_stats.summary(wall_time)
+
+def format_summary(summary: dict) -> list:
+    '''
+    Format a run summary into log friendly lines.
+
+    :params summary: Dictionary produced by summarize_stats.
+    :returns lines: List of strings describing the run.
+    '''
+
+    lines: list = [
+        f'Hours: {summary["hours"]} ({summary["succeeded"]} succeeded, {summary["failed"]} failed, {summary["retries"]} retries)',
+        f'Volume: {summary["rows"]} ticks, {summary["bytes_downloaded"] / 1e6:.2f} MB in {summary["wall_time"]:.2f}s',
+        f'Throughput: {summary["ticks_per_second"]:.1f} ticks/s, {summary["mb_per_second"]:.3f} MB/s'
+    ]
+
+    for stage, values in summary['stages'].items():
+        percentiles: str = ' '.join(f'p{p}={values[f"p{p}"]:.4f}s' for p in PERCENTILES)
+        lines.append(f'Stage {stage}: total={values["total"]:.2f}s {percentiles} max={values["max"]:.4f}s')
+
+    # Peak allocations are only recorded when memory is traced.
+    for stage, peak in summary.get('memory_peaks', {}).items():
+        lines.append(f'Stage {stage}: peak allocation={peak / 1e6:.2f} MB')
+
+    return lines
+
+class FXTickDataStatsWriter():
+    '''
+    Stream per-hour records to a JSON document as they complete, followed by
+    the run summary once the run has finished.
+    '''
+
+    def __init__(self, path: str):
+        '''
+        :params path: Output path for the JSON document.
+        '''
+
+        self.outs = open(path, 'w')
+        self.outs.write('{"records": [')
+        self.count: int = 0
+
+    def write(self, record: FXTickDataPipelineStats) -> None:
+        '''
+        Append a single record to the document.
+
+        :params record: Record emitted by a pipeline run.
+        '''
+
+        self.outs.write((',\n' if self.count else '\n') + json.dumps(record.to_dict()))
+        self.count += 1
+
+    def close(self, summary: dict) -> None:
+        '''
+        Write the run summary and close the document.
+
+        :params summary: Dictionary produced by FXTickDataRunStats.summary.
+        '''
+
+        self.outs.write('\n], "summary": ' + json.dumps(summary, indent=2) + '}\n')
+        self.outs.close()
@@ -0,0 +1,233 @@
+'''
+Live counters and gauges for a running load, exported in the Prometheus text
+format over HTTP or through a periodically rewritten file.
+'''
+
+import os
+import threading
+import time
+
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.stats import STAGES, FXTickDataPipelineStats
+
+# Window in seconds over which live rates are computed.
+RATE_WINDOW: float = 60.0
+
+class FXTickDataTelemetry():
+    '''
+    Thread safe live metrics updated from pipeline records as hours complete.
+    '''
+
+    def __init__(self, processes: int, rate_window: float = RATE_WINDOW):
+        '''
+        :params processes: Number of pool processes, used to split in flight
+                           hours into running and queued.
+        :params rate_window: Window in seconds over which rates are computed.
+        '''
+
+        self.processes: int = processes
+        self.rate_window: float = rate_window
+        self.scheduler = None
+
+        self.start_time: float = time.time()
+        self.hours_completed: int = 0
+        self.hours_failed: dict = {}
+        self.ticks: int = 0
+        self.bytes_downloaded: int = 0
+        self.retries: int = 0
+        self.stage_seconds: dict = {stage: 0.0 for stage in STAGES}
+
+        # Recent (time, ticks, bytes) completions for the live rates.
+        self._recent: deque = deque()
+        self._lock = threading.Lock()
+
+    def track(self, scheduler) -> None:
+        '''
+        Read the in flight gauges from a scheduler while it runs.
+
+        :params scheduler: FXTickDataScheduler running the load.
+        '''
+
+        self.scheduler = scheduler
+
+    def observe(self, record: FXTickDataPipelineStats) -> None:
+        '''
+        Update the metrics from a completed pipeline record.
+
+        :params record: Record emitted by a pipeline run.
+        '''
+
+        now: float = time.time()
+        with self._lock:
+            self.hours_completed += 1
+            if not record.success:
+                stage: str = record.failed_stage or 'unknown'
+                self.hours_failed[stage] = self.hours_failed.get(stage, 0) + 1
+
+            self.ticks += record.rows
+            self.bytes_downloaded += record.bytes_downloaded
+            self.retries += record.retries
+            for stage in STAGES:
+                self.stage_seconds[stage] += record.timings.get(stage, 0.0)
+
+            self._recent.append((now, record.rows, record.bytes_downloaded))
+            while self._recent and self._recent[0][0] < now - self.rate_window:
+                self._recent.popleft()
+
+    def _rates(self, now: float) -> tuple:
+        '''
+        Compute ticks and bytes per second over the recent window.
+
+        :params now: Current time in seconds since the epoch.
+        :returns rates: Tuple of ticks per second and bytes per second.
+        '''
+
+        recent: list = [entry for entry in self._recent if entry[0] >= now - self.rate_window]
+        window: float = min(self.rate_window, max(now - self.start_time, 1e-9))
+
+        return sum(entry[1] for entry in recent) / window, sum(entry[2] for entry in recent) / window
+
+    def render(self) -> str:
+        '''
+        Render all metrics in the Prometheus text exposition format.
+
+        :returns text: Metrics text.
+        '''
+
+        now: float = time.time()
+        in_flight: int = self.scheduler.in_flight if self.scheduler is not None else 0
+        running: int = min(in_flight, self.processes)
+
+        with self._lock:
+            ticks_per_second, bytes_per_second = self._rates(now)
+            lines: list = [
+                '# TYPE fx_loader_hours_completed_total counter',
+                f'fx_loader_hours_completed_total {self.hours_completed}',
+                '# TYPE fx_loader_hours_failed_total counter'
+            ]
+            lines += [f'fx_loader_hours_failed_total{{stage="{stage}"}} {count}' for stage, count in sorted(self.hours_failed.items())]
+            lines += [
+                '# TYPE fx_loader_ticks_total counter',
+                f'fx_loader_ticks_total {self.ticks}',
+                '# TYPE fx_loader_bytes_total counter',
+                f'fx_loader_bytes_total {self.bytes_downloaded}',
+                '# TYPE fx_loader_retries_total counter',
+                f'fx_loader_retries_total {self.retries}',
+                '# TYPE fx_loader_stage_seconds_total counter'
+            ]
+            lines += [f'fx_loader_stage_seconds_total{{stage="{stage}"}} {seconds:.6f}' for stage, seconds in self.stage_seconds.items()]
+            lines += [
+                '# TYPE fx_loader_ticks_per_second gauge',
+                f'fx_loader_ticks_per_second {ticks_per_second:.3f}',
+                '# TYPE fx_loader_bytes_per_second gauge',
+                f'fx_loader_bytes_per_second {bytes_per_second:.3f}',
+                '# TYPE fx_loader_in_flight gauge',
+                f'fx_loader_in_flight {in_flight}',
+                '# TYPE fx_loader_pool_running gauge',
+                f'fx_loader_pool_running {running}',
+                '# TYPE fx_loader_pool_queued gauge',
+                f'fx_loader_pool_queued {in_flight - running}',
+                '# TYPE fx_loader_uptime_seconds gauge',
+                f'fx_loader_uptime_seconds {now - self.start_time:.3f}'
+            ]
+
+        return '\n'.join(lines) + '\n'
+
+class FXTickDataMetricsServer():
+    '''
+    Serve the metrics over HTTP from a background thread.
+    '''
+
+    def __init__(self, telemetry: FXTickDataTelemetry, port: int, host: str = '127.0.0.1'):
+        '''
+        :params telemetry: Metrics to serve.
+        :params port: Local port to listen on. Zero picks a free port.
+        :params host: Interface to bind to.
+        '''
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body: bytes = telemetry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                # Scrapes are not worth a log line each.
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.port: int = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> None:
+        '''
+        Start serving in the background.
+        '''
+
+        self.thread.start()
+
+    def stop(self) -> None:
+        '''
+        Stop serving and release the port.
+        '''
+
+        self.server.shutdown()
+        self.server.server_close()
+
+class FXTickDataMetricsFile():
+    '''
+    Periodically rewrite the metrics to a file from a background thread. Each
+    rewrite replaces the file atomically.
+    '''
+
+    def __init__(self, telemetry: FXTickDataTelemetry, path: str, interval: float):
+        '''
+        :params telemetry: Metrics to write.
+        :params path: Path to the metrics file.
+        :params interval: Seconds between rewrites.
+        '''
+
+        self.telemetry: FXTickDataTelemetry = telemetry
+        self.path: str = path
+        self.interval: float = interval
+        self._stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def write(self) -> None:
+        '''
+        Rewrite the metrics file once.
+        '''
+
+        with open(self.path + '.tmp', 'w') as outs:
+            outs.write(self.telemetry.render())
+
+        os.replace(self.path + '.tmp', self.path)
+
+    def _run(self) -> None:
+        '''
+        Rewrite the metrics file every interval until stopped.
+        '''
+
+        while not self._stopped.wait(self.interval):
+            self.write()
+
+    def start(self) -> None:
+        '''
+        Start rewriting in the background.
+        '''
+
+        self.thread.start()
+
+    def stop(self) -> None:
+        '''
+        Stop the background thread and write the final metrics.
+        '''
+
+        self._stopped.set()
+        self.thread.join()
+        self.write()
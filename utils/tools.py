@@ -2,11 +2,14 @@
 Basic toolbox of helper functions.
 '''
 
+import os
+
 from typing import Generator, Optional
 
 from datetime import datetime
 from dateutil import parser, utils
-from dateutil.rrule import HOURLY, rrule, MO, TU, WE, TH, FR, SU
+
+from utils.market_hours import FXMarketCalendar
 
 def parse_arg_dates(start_date: str, end_date: Optional[str] = None) -> tuple:
     '''
@@ -23,32 +26,33 @@ def parse_arg_dates(start_date: str, end_date: Optional[str] = None) -> tuple:
 
     return start_date, end_date
 
-def valid_date_range(start_date: datetime, end_date: datetime) -> Generator[datetime, None, None]:
+def current_hour() -> datetime:
+    '''
+    Get the start of the current UTC hour, matching the feed's timestamps.
+
+    :returns hour: Naive datetime truncated to the hour.
+    '''
+
+    return datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+
+def valid_date_range(start_date: datetime, end_date: datetime, pair: Optional[str] = None,
+                     empty_hours: Optional[set] = None) -> Generator[datetime, None, None]:
     '''
     Generate a range of valid business dates based on start and end time.
 
+    Hours outside the market's trading sessions are skipped. Sessions follow
+    New York time, so the weekly open and close shift with DST.
+
     NOTE: This range is not inclusive of the final date.
 
     :params start_date: Starting time of date range.
     :params end_date: Ending time of the date range.
+    :params pair: Optional currency pair whose session rules apply.
+    :params empty_hours: Optional set of hours known to be empty for the pair.
     :returns date_range: List of datetimes across the specified range.
     '''
 
-    for date in rrule(HOURLY, dtstart=start_date, until=end_date, byweekday=(MO,TU,WE,TH,FR,SU)):
-        if date == end_date:
-            break
-
-        # Try to avoid making requests when the markets close on Friday.
-        # On account of DST, the market close and open may shift slightly on
-        # Saturday and Sunday, respectively. We'll try to minimize unnecessary
-        # requests during that time.
-        if date.weekday() == 4 and date.hour > 21:
-            continue
-
-        if date.weekday() == 6 and date.hour < 21:
-            continue
-
-        yield date
+    yield from FXMarketCalendar(pair, empty_hours).tradable_hours(start_date, end_date)
 
 def parse_currency_pairs(pair: str) -> str:
     '''
@@ -67,3 +71,34 @@ def parse_currency_pairs(pair: str) -> str:
         raise Exception(f'This is not a valid length currency pair: {pair}')
 
     return pair[:3] + '/' + pair[3:]
+
+def parse_pair_list(pairs: str) -> list:
+    '''
+    Parse a comma separated list of pairs, or a file listing one or more pairs
+    per line, into a list of pairs.
+
+    :params pairs: Comma separated pairs or a path to a file of pairs. Blank
+                   lines and lines starting with '#' are ignored in files.
+    :returns parsed_pairs: Ordered list of unique pairs.
+    '''
+
+    # Validate that a valid data type is passed.
+    if not isinstance(pairs, str):
+        raise Exception(f'Currency pairs must be expressed as type str, not {type(pairs)}: {pairs}')
+
+    # Read the pairs from file if one is given.
+    if os.path.isfile(pairs):
+        with open(pairs) as ins:
+            pairs = ','.join(line for line in ins if not line.strip().startswith('#'))
+
+    parsed_pairs: list = []
+    for pair in pairs.split(','):
+        pair = pair.strip().upper()
+        if pair and pair not in parsed_pairs:
+            parse_currency_pairs(pair)
+            parsed_pairs.append(pair)
+
+    if not parsed_pairs:
+        raise Exception(f'No currency pairs specified: {pairs}')
+
+    return parsed_pairs